@@ -1,7 +1,8 @@
 # app/__init__.py - WITH TEMPORARY DATA STORAGE
 from flask import Flask, jsonify, request
-from .config import Config
-from .extensions import db, migrate, jwt , mail
+from .config import Config, db_profile, engine_options, sqlite_pragmas
+from .extensions import apply_sqlite_pragmas, cache, db, migrate, jwt , mail
+from .json_provider import OrjsonProvider
 from flask_cors import CORS
 from dotenv import load_dotenv
 import os
@@ -12,9 +13,15 @@ load_dotenv()
 # temporary_services = []
 # next_service_id = 1
 
-def create_app():
+def create_app(overrides=None):
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
     app.config.from_object(Config)
+    if overrides:
+        app.config.update(overrides)
+
+    from .logging_setup import configure_logging
+    configure_logging(app)
 
     # Ensure upload directory exists
     if not os.path.exists(app.config['UPLOAD_FOLDER']):
@@ -25,22 +32,37 @@ def create_app():
     def uploaded_file(filename):
         return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
 
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(app.config)
     db.init_app(app)
+    if db_profile(app.config) != "none":
+        with app.app_context():
+            for engine in db.engines.values():
+                if engine.dialect.name == "sqlite":
+                    apply_sqlite_pragmas(engine, sqlite_pragmas(app.config))
     migrate.init_app(app, db)
     jwt.init_app(app)
     mail.init_app(app)
+    cache.init_app(app)
+
+    from .schema_patches import run_schema_patches
+    run_schema_patches(app)
+
+    from .sql_instrumentation import init_sql_instrumentation
+    from .metrics import init_metrics
+    init_sql_instrumentation(app)
+
+    from .db_routing import init_read_routing
+    init_read_routing(app)
+
+    from .providers import init_providers
+    init_providers(app)
+    init_metrics(app)
 
-    from .schema_patches import (
-        ensure_budget_plan_table,
-        ensure_user_organizer_columns,
-        ensure_vendor_events_partnership_columns,
-        ensure_event_timestamps,
-    )
+    from .compression import init_compression
+    init_compression(app)
 
-    ensure_user_organizer_columns(app)
-    ensure_budget_plan_table(app)
-    ensure_vendor_events_partnership_columns(app)
-    ensure_event_timestamps(app)
+    from .fragment_cache import init_fragment_cache
+    init_fragment_cache(app)
 
     # ✅ Smart CORS configuration
     def dynamic_origin(origin):
@@ -176,6 +198,8 @@ def create_app():
     from .api.services import services_bp
     from .api.admin import admin_bp
     from .api.reviews import reviews_bp
+    from .api.badges import badges_bp
+    from .api.dashboard import dashboard_bp
 
     app.register_blueprint(auth_bp)
     app.register_blueprint(events_bp)
@@ -185,6 +209,8 @@ def create_app():
     app.register_blueprint(services_bp)
     app.register_blueprint(admin_bp)
     app.register_blueprint(reviews_bp)
+    app.register_blueprint(badges_bp)
+    app.register_blueprint(dashboard_bp)
 
     @app.route("/")
     def index():
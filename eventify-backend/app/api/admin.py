@@ -1,5 +1,5 @@
-from flask import Blueprint, jsonify, request, Response
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, jsonify, request, Response, stream_with_context
+from flask_jwt_extended import jwt_required
 from app.models import (
     User,
     Event,
@@ -13,6 +13,9 @@ from app.models import (
 )
 from app.models.models import vendor_events
 from app.extensions import db
+from app.current_user import current_identity, invalidate_identity
+from app.sql_instrumentation import sql_report
+from app.utils.projection import parse_projection
 from sqlalchemy import or_, func
 from datetime import datetime, timedelta
 import csv
@@ -23,14 +26,13 @@ admin_bp = Blueprint("admin", __name__, url_prefix="/api/admin")
 
 
 def require_admin():
-    """Ensure the current JWT identity is an admin user."""
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user or user.role != "admin":
+    """Ensure the current JWT identity is an admin user. Returns (Identity, None) or (None, error)."""
+    identity = current_identity()
+    if not identity or identity.role != "admin":
         return None, (jsonify({"error": "Admin access required"}), 403)
-    if not getattr(user, "is_active", True):
+    if not identity.is_active:
         return None, (jsonify({"error": "Admin account is disabled"}), 403)
-    return user, None
+    return identity, None
 
 
 # ---------------------------------------------------------------------------
@@ -123,11 +125,22 @@ def admin_users():
         elif is_active.lower() in ("false", "0", "no"):
             query = query.filter(User.is_active == False)
 
+    try:
+        fields, include = parse_projection(request.args, User, User.SUMMARY_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     total = query.count()
-    users = query.order_by(User.created_at.desc()).offset((page - 1) * per_page).limit(per_page).all()
+    users = (
+        query.options(*User.dict_load_options(fields, include))
+        .order_by(User.created_at.desc())
+        .offset((page - 1) * per_page)
+        .limit(per_page)
+        .all()
+    )
 
     return jsonify({
-        "users": [u.to_dict() for u in users],
+        "users": [u.to_dict(fields, include) for u in users],
         "total": total,
         "page": page,
         "per_page": per_page,
@@ -224,6 +237,7 @@ def admin_patch_user(user_id):
         user.is_active = bool(data["is_active"])
 
     db.session.commit()
+    invalidate_identity(user.id)
     return jsonify(user.to_dict()), 200
 
 
@@ -245,6 +259,7 @@ def admin_bulk_user_status():
         {User.is_active: bool(is_active)}, synchronize_session="fetch"
     )
     db.session.commit()
+    invalidate_identity(*user_ids)
     return jsonify({"updated": updated}), 200
 
 
@@ -273,33 +288,38 @@ def admin_users_export():
         elif is_active.lower() in ("false", "0", "no"):
             query = query.filter(User.is_active == False)
 
-    users = query.order_by(User.created_at.desc()).all()
-
     if format_type != "csv":
         return jsonify({"error": "Only format=csv is supported"}), 400
 
-    buffer = io.StringIO()
-    writer = csv.writer(buffer)
-    writer.writerow(["id", "name", "email", "role", "city", "phone", "category", "is_verified", "is_active", "created_at"])
-    for u in users:
-        writer.writerow([
-            u.id,
-            u.name or "",
-            u.email or "",
-            u.role or "",
-            u.city or "",
-            u.phone or "",
-            u.category or "",
-            u.is_verified,
-            getattr(u, "is_active", True),
-            u.created_at.isoformat() if u.created_at else "",
-        ])
-    buffer.seek(0)
+    def rows():
+        # streamed in batches so a large export never sits in memory as one string
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(["id", "name", "email", "role", "city", "phone", "category", "is_verified", "is_active", "created_at"])
+        for i, u in enumerate(query.order_by(User.created_at.desc()).yield_per(1000), 1):
+            writer.writerow([
+                u.id,
+                u.name or "",
+                u.email or "",
+                u.role or "",
+                u.city or "",
+                u.phone or "",
+                u.category or "",
+                u.is_verified,
+                getattr(u, "is_active", True),
+                u.created_at.isoformat() if u.created_at else "",
+            ])
+            if i % 1000 == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
     headers = {
         "Content-Type": "text/csv",
         "Content-Disposition": "attachment; filename=users_export.csv",
     }
-    return Response(buffer.getvalue(), headers=headers, mimetype="text/csv")
+    return Response(stream_with_context(rows()), headers=headers, mimetype="text/csv")
 
 
 # ---------------------------------------------------------------------------
@@ -309,7 +329,7 @@ def admin_users_export():
 @admin_bp.route("/events", methods=["GET"])
 @jwt_required()
 def admin_events():
-    """List events with pagination, search (name/venue), filter by organizer_status."""
+    """List events with pagination, search (name/venue), filter by organizer_status. Optional ?fields=."""
     _, err = require_admin()
     if err:
         return err
@@ -328,12 +348,22 @@ def admin_events():
         query = query.filter_by(organizer_status=organizer_status)
     if organizer_id is not None:
         query = query.filter_by(organizer_id=organizer_id)
+    try:
+        fields, _ = parse_projection(request.args, Event)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
     total = query.count()
-    events = query.order_by(Event.date.desc()).offset((page - 1) * per_page).limit(per_page).all()
+    events = (
+        query.options(*Event.dict_load_options(fields))
+        .order_by(Event.date.desc())
+        .offset((page - 1) * per_page)
+        .limit(per_page)
+        .all()
+    )
 
     return jsonify({
-        "events": [e.to_dict() for e in events],
+        "events": Event.to_dicts(events, fields),
         "total": total,
         "page": page,
         "per_page": per_page,
@@ -609,16 +639,26 @@ def admin_organizers():
     if q:
         like = f"%{q}%"
         query = query.filter(or_(User.name.ilike(like), User.email.ilike(like)))
+    try:
+        fields, include = parse_projection(request.args, User, User.SUMMARY_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
     total = query.count()
-    organizers = query.order_by(User.created_at.desc()).offset((page - 1) * per_page).limit(per_page).all()
+    organizers = (
+        query.options(*User.dict_load_options(fields, include))
+        .order_by(User.created_at.desc())
+        .offset((page - 1) * per_page)
+        .limit(per_page)
+        .all()
+    )
 
     # Add event counts per organizer
     result = []
     for u in organizers:
         events_total = Event.query.filter_by(organizer_id=u.id).count()
         events_pending = Event.query.filter_by(organizer_id=u.id, organizer_status="pending").count()
-        d = u.to_dict()
+        d = u.to_dict(fields, include)
         d["events_total"] = events_total
         d["events_pending"] = events_pending
         result.append(d)
@@ -794,12 +834,46 @@ def admin_analytics():
     revenue_by_date = [{"date": str(d), "total": float(t)} for d, t in revenue_raw]
 
     # Recent activity: last N users, last N payments (for dashboard feed)
-    recent_users = User.query.order_by(User.created_at.desc()).limit(10).all()
+    recent_users = (
+        User.query.options(*User.dict_load_options(User.SUMMARY_FIELDS))
+        .order_by(User.created_at.desc())
+        .limit(10)
+        .all()
+    )
     recent_payments = Payment.query.order_by(Payment.created_at.desc()).limit(10).all()
 
     return jsonify({
         "signups_by_date": signups_by_date,
         "revenue_by_date": revenue_by_date,
-        "recent_users": [u.to_dict() for u in recent_users],
+        "recent_users": [u.to_dict(User.SUMMARY_FIELDS) for u in recent_users],
         "recent_payments": [_payment_admin_dict(p) for p in recent_payments],
     }), 200
+
+
+# ---------------------------------------------------------------------------
+# SQL instrumentation report
+# ---------------------------------------------------------------------------
+
+SQL_REPORT_SORTS = ("db_ms", "avg_db_ms", "queries", "avg_queries", "max_queries", "n_plus_one")
+
+
+@admin_bp.route("/sql-report", methods=["GET"])
+@jwt_required()
+def admin_sql_report():
+    """Top endpoints by DB time (or ?sort=), from SQL_INSTRUMENTATION. ?reset=1 clears after reading."""
+    _, err = require_admin()
+    if err:
+        return err
+
+    report = sql_report()
+    if report is None:
+        return jsonify({"error": "SQL instrumentation is disabled (set SQL_INSTRUMENTATION=1)"}), 404
+    sort = request.args.get("sort", "db_ms")
+    if sort not in SQL_REPORT_SORTS:
+        return jsonify({"error": f"sort must be one of {', '.join(SQL_REPORT_SORTS)}"}), 400
+    limit = min(max(request.args.get("limit", 20, type=int) or 20, 1), 200)
+
+    endpoints = report.top(limit, sort)
+    if request.args.get("reset") in ("1", "true"):
+        report.reset()
+    return jsonify({"endpoints": endpoints, "sort": sort}), 200
@@ -1,11 +1,17 @@
+import logging
 from flask import Blueprint, request, jsonify, redirect
 from sqlalchemy import func
 
 from app.models import User, Review
 from app.extensions import db, jwt , mail
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from app.conditional import conditional
+from app.current_user import invalidate_identity, load_current_user
+from app.db_routing import use_primary
+from app.metrics import track_outbound
+from app.providers import http
+from app.utils.projection import parse_projection
+from flask_jwt_extended import create_access_token, jwt_required
 from datetime import timedelta
-import requests
 import os
 from urllib.parse import urlencode
 from flask_mail import Message
@@ -14,6 +20,7 @@ import re
 
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/api/auth")
+logger = logging.getLogger(__name__)
 
 # Google OAuth Configuration
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
@@ -64,6 +71,7 @@ def google_login():
     return redirect(auth_url)
 
 @auth_bp.route("/google/callback", methods=["GET"])
+@use_primary
 def google_callback():
     """Handle Google OAuth callback"""
     try:
@@ -82,7 +90,8 @@ def google_callback():
             "redirect_uri": GOOGLE_REDIRECT_URI
         }
         
-        token_response = requests.post(token_url, data=token_data)
+        with track_outbound("google_oauth"):
+            token_response = http().post(token_url, data=token_data)
         token_json = token_response.json()
         
         if "access_token" not in token_json:
@@ -93,7 +102,8 @@ def google_callback():
         # Get user info from Google
         userinfo_url = "https://www.googleapis.com/oauth2/v2/userinfo"
         headers = {"Authorization": f"Bearer {access_token}"}
-        userinfo_response = requests.get(userinfo_url, headers=headers)
+        with track_outbound("google_oauth"):
+            userinfo_response = http().get(userinfo_url, headers=headers)
         userinfo = userinfo_response.json()
 
         if "email" not in userinfo:
@@ -145,7 +155,7 @@ def google_callback():
         return redirect(frontend_url)
 
     except Exception as e:
-        print(f"❌ Google OAuth error: {e}")
+        logger.exception("Google OAuth error: %s", e)
         return jsonify({"error": "Google authentication failed"}), 500
 
 # -------------------------------
@@ -189,7 +199,8 @@ def signup():
     # ✅ Send email
     msg = Message("Verify your Eventify account", recipients=[email])
     msg.body = f"Hi {name},\n\nPlease verify your email by clicking the link below:\n{verify_url}\n\nThis link expires in 1 hour."
-    mail.send(msg)
+    with track_outbound("smtp"):
+        mail.send(msg)
 
     return jsonify({
         "message": "Signup successful! Please check your email for verification.",
@@ -213,7 +224,8 @@ def forgot_password():
             f"Use the link below to reset your password:\n{reset_url}\n\n"
             "This link expires in 1 hour."
         )
-        mail.send(msg)
+        with track_outbound("smtp"):
+            mail.send(msg)
 
     # Always return success to avoid exposing registered emails.
     return jsonify({"message": "If this email exists, a password reset link has been sent."}), 200
@@ -247,6 +259,7 @@ def reset_password():
     return jsonify({"message": "Password reset successful. Please log in."}), 200
 
 @auth_bp.route("/verify-email/<token>", methods=["GET"])
+@use_primary
 def verify_email(token):
     email = User.verify_token(token)
     if not email:
@@ -267,12 +280,15 @@ def verify_email(token):
 @auth_bp.route("/me", methods=["GET"])
 @jwt_required()
 def get_me():
-    """Current user (flat object) for dashboard/layout. JWT required."""
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    """Current user (flat object) for dashboard/layout. JWT required. Optional ?fields= / ?include=."""
+    try:
+        fields, include = parse_projection(request.args, User)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    user = load_current_user()
     if not user:
         return jsonify({"error": "User not found"}), 404
-    return jsonify(user.to_dict()), 200
+    return jsonify(user.to_dict(fields, include)), 200
 
 
 # Add this to auth.py or create profile_routes.py
@@ -282,16 +298,19 @@ def get_me():
 @auth_bp.route("/profile", methods=["GET"])
 @jwt_required()  # ✅ This will now work
 def get_profile():
-    """Get current user profile data"""
+    """Get current user profile data. Optional ?fields= / ?include=."""
     try:
-        current_user_id = get_jwt_identity()  # ✅ This gets the user ID from JWT token
-        user = User.query.get(current_user_id)
+        fields, include = parse_projection(request.args, User)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        user = load_current_user()  # ✅ User for the JWT identity, loaded once per request
         
         if not user:
             return jsonify({"error": "User not found"}), 404
             
         return jsonify({
-            "user": user.to_dict()
+            "user": user.to_dict(fields, include)
         }), 200
         
     except Exception as e:
@@ -304,8 +323,7 @@ def get_profile():
 def update_profile():
     """Update user profile"""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = load_current_user()
         
         if not user:
             return jsonify({"error": "User not found"}), 404
@@ -335,6 +353,7 @@ def update_profile():
                     user.organizer_package_summary = s[:2000] if s else None
             
         db.session.commit()
+        invalidate_identity(user.id)
         
         return jsonify({
             "message": "Profile updated successfully",
@@ -349,10 +368,13 @@ def update_profile():
 @auth_bp.route("/profile/upload-image", methods=["POST"])
 @jwt_required()
 def upload_profile_image():
-    """Upload profile image"""
+    """Upload profile image. Optional ?fields= / ?include= shape the returned user."""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        fields, include = parse_projection(request.args, User)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        user = load_current_user()
         
         if not user:
             return jsonify({"error": "User not found"}), 404
@@ -374,10 +396,13 @@ def upload_profile_image():
         # Update user profile image
         user.profile_image = image_data
         db.session.commit()
-        
+
+        # Only the vendor profile page renders assigned_events from this response
+        if fields is None and include is None and user.role != "vendor":
+            include = ()
         return jsonify({
             "message": "Profile image updated successfully",
-            "user": user.to_dict()
+            "user": user.to_dict(fields, include)
         }), 200
         
     except Exception as e:
@@ -390,8 +415,7 @@ def upload_profile_image():
 def get_current_user():
     """Get current logged-in user data"""
     try:
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = load_current_user()
         
         if not user:
             return jsonify({"error": "User not found"}), 404
@@ -444,7 +468,7 @@ def login():
 
         return jsonify({
             "message": "Login successful",
-            "user": user.to_dict(),
+            "user": user.to_dict(include=()),
             "token": token
         }), 200
 
@@ -472,11 +496,12 @@ def login():
 
     return jsonify({
         "message": "Login successful",
-        "user": user.to_dict(),
+        "user": user.to_dict(include=()),
         "token": token
     }), 200
 @auth_bp.route("/organizers", methods=["GET"])
 @jwt_required()
+@conditional("user", "review")
 def get_organizers():
     """Get all active users with the 'organizer' role"""
     try:
@@ -507,5 +532,5 @@ def get_organizers():
             result.append(d)
         return jsonify(result), 200
     except Exception as e:
-        print(f"❌ Error fetching organizers: {e}")
+        logger.exception("Error fetching organizers: %s", e)
         return jsonify({"error": str(e)}), 500
@@ -0,0 +1,36 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+
+from app.badge_counters import chat_unread_by_event, chat_unread_total
+from app.current_user import current_identity
+from app.open_events_feed import open_events_count
+
+badges_bp = Blueprint("badges", __name__, url_prefix="/api/badges")
+
+
+@badges_bp.route("", methods=["GET"])
+@jwt_required()
+def get_badges():
+    """
+    All sidebar / bell badge counts in one poll, read from maintained counters.
+    Organizers also get the (cached) open-events count. ?by_event=1 adds chat_by_event.
+    """
+    identity = current_identity()
+    if identity is None:
+        return jsonify({"error": "User not found"}), 404
+    return jsonify(badge_counts(identity, by_event=request.args.get("by_event") in ("1", "true"))), 200
+
+
+def badge_counts(identity, by_event=False):
+    """Badge payload for an Identity (shared with the dashboard bootstrap)."""
+    from app.api.payments import notification_unread_count
+
+    badges = {
+        "chat_unread": chat_unread_total(identity.id),
+        "notifications_unread": notification_unread_count(identity.id),
+    }
+    if identity.role == "organizer":
+        badges["open_events"] = open_events_count(identity.id)
+    if by_event:
+        badges["chat_by_event"] = {str(k): v for k, v in chat_unread_by_event(identity.id).items()}
+    return badges
@@ -1,27 +1,18 @@
+import logging
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import ChatMessage, User, Event, db, vendor_events
+from app.badge_counters import chat_unread_by_event, chat_unread_total, record_chat_message, record_chat_read
+from app.current_user import current_identity, load_current_user
+from app.metrics import track_outbound
+from app.providers import chat_ai
+from app.utils.bulk import bulk_update
 from app.utils.datetime_serialize import isoformat_utc_z
 from datetime import datetime
 from sqlalchemy import or_, and_
-import os
-from openai import OpenAI
 
 chat_bp = Blueprint("chat", __name__, url_prefix="/api/chat")
-
-# Prefer Groq (free tier) if available; fallback to OpenAI
-_groq_key = os.getenv("GROQ_API_KEY")
-_openai_key = os.getenv("OPENAI_API_KEY")
-if _groq_key:
-    _chat_client = OpenAI(api_key=_groq_key, base_url="https://api.groq.com/openai/v1")
-    _chat_model = "llama-3.1-8b-instant"
-elif _openai_key:
-    _chat_client = OpenAI(api_key=_openai_key)
-    _chat_model = "gpt-3.5-turbo"
-else:
-    _chat_client = None
-    _chat_model = None
-
+logger = logging.getLogger(__name__)
 
 @chat_bp.route("/ask", methods=["POST"])
 @jwt_required()
@@ -33,23 +24,27 @@ def ask():
         if not message:
             return jsonify({"error": "Message is required"}), 400
 
-        if not _chat_client or not _chat_model:
+        # Prefer Groq (free tier) if available; fallback to OpenAI
+        provider = chat_ai()
+        if not provider:
             return jsonify({
                 "reply": "AI is not configured. Set GROQ_API_KEY or OPENAI_API_KEY on the server to enable the assistant."
             }), 200
 
-        response = _chat_client.chat.completions.create(
-            model=_chat_model,
-            messages=[
-                {"role": "system", "content": "You are a friendly event planning assistant for Eventify. Help users with ideas for events, venues, budgets, and planning. Keep replies concise and helpful."},
-                {"role": "user", "content": message}
-            ],
-            max_tokens=300,
-        )
+        chat_client, chat_model, service = provider
+        with track_outbound(service):
+            response = chat_client.chat.completions.create(
+                model=chat_model,
+                messages=[
+                    {"role": "system", "content": "You are a friendly event planning assistant for Eventify. Help users with ideas for events, venues, budgets, and planning. Keep replies concise and helpful."},
+                    {"role": "user", "content": message}
+                ],
+                max_tokens=300,
+            )
         reply = (response.choices[0].message.content or "").strip()
         return jsonify({"reply": reply or "I didn't get a response. Try rephrasing."}), 200
     except Exception as e:
-        print(f"Chat ask error: {e}")
+        logger.exception("Chat ask error: %s", e)
         return jsonify({"reply": "Something went wrong. Please try again later."}), 200
 
 
@@ -82,12 +77,13 @@ def send_message():
         )
         
         db.session.add(chat_message)
+        record_chat_message(receiver_id, event_id)
         db.session.commit()
         
         # Trigger Notification
         try:
             from app.api.payments import create_notification
-            sender = User.query.get(current_user_id)
+            sender = current_identity()
             create_notification(
                 receiver_id,
                 "New Message 💬",
@@ -96,7 +92,7 @@ def send_message():
                 {"sender_id": current_user_id, "event_id": event_id}
             )
         except Exception as notify_err:
-            print(f"Notification trigger failed: {str(notify_err)}")
+            logger.warning("Notification trigger failed: %s", notify_err)
 
         return jsonify({
             "message": "Message sent successfully",
@@ -105,7 +101,7 @@ def send_message():
         
     except Exception as e:
         db.session.rollback()
-        print(f"Error sending message: {str(e)}")
+        logger.exception("Error sending message: %s", e)
         return jsonify({"error": "Failed to send message"}), 500
 # ✅ Get chat messages for an event
 # ✅ Get chat messages for an event - FIXED ACCESS CONTROL
@@ -131,7 +127,7 @@ def get_event_messages(event_id):
         }), 200
         
     except Exception as e:
-        print(f"Error fetching messages: {str(e)}")
+        logger.exception("Error fetching messages: %s", e)
         return jsonify({"error": "Failed to fetch messages"}), 500
         messages = ChatMessage.query.filter_by(event_id=event_id)\
             .order_by(ChatMessage.created_at.asc())\
@@ -143,7 +139,7 @@ def get_event_messages(event_id):
         }), 200
         
     except Exception as e:
-        print(f"Error fetching messages: {str(e)}")
+        logger.exception("Error fetching messages: %s", e)
         return jsonify({"error": "Failed to fetch messages"}), 500
 
 # ✅ Get vendor's chat conversations
@@ -153,11 +149,12 @@ def get_vendor_conversations():
     try:
         current_user_id = get_jwt_identity()
         
-        vendor = User.query.get(current_user_id)
+        vendor = load_current_user()
         if not vendor or vendor.role != 'vendor':
             return jsonify({"error": "Vendor not found"}), 404
         
         assigned_events = vendor.assigned_events
+        unread_by_event = chat_unread_by_event(current_user_id)
         
         conversations = []
         for event in assigned_events:
@@ -172,12 +169,8 @@ def get_vendor_conversations():
                 .order_by(ChatMessage.created_at.desc())\
                 .first()
             
-            # Count unread messages FOR THIS SPECIFIC EVENT
-            unread_count = ChatMessage.query.filter_by(
-                event_id=event.id,
-                receiver_id=current_user_id,
-                is_read=False
-            ).count()
+            # Unread messages FOR THIS SPECIFIC EVENT (maintained counter)
+            unread_count = unread_by_event.get(event.id, 0)
             
             conversations.append({
                 "event_id": event.id,
@@ -193,7 +186,7 @@ def get_vendor_conversations():
         return jsonify({"conversations": conversations}), 200
         
     except Exception as e:
-        print(f"Error fetching vendor conversations: {str(e)}")
+        logger.exception("Error fetching vendor conversations: %s", e)
         return jsonify({"error": "Failed to fetch conversations"}), 500
 
 
@@ -284,7 +277,7 @@ def get_organizer_all_conversations():
         return jsonify({"conversations": conversations}), 200
         
     except Exception as e:
-        print(f"Error fetching consolidated organizer conversations: {str(e)}")
+        logger.exception("Error fetching consolidated organizer conversations: %s", e)
         return jsonify({"error": "Failed to fetch conversations"}), 500
 
 
@@ -300,6 +293,7 @@ def get_user_conversations():
             Event.organizer_id != None,
             Event.organizer_status == 'accepted'
         ).all()
+        unread_by_event = chat_unread_by_event(current_user_id, [e.id for e in user_events])
         
         conversations = []
         for event in user_events:
@@ -312,11 +306,7 @@ def get_user_conversations():
                 .order_by(ChatMessage.created_at.desc())\
                 .first()
             
-            unread_count = ChatMessage.query.filter_by(
-                event_id=event.id,
-                receiver_id=current_user_id,
-                is_read=False
-            ).count()
+            unread_count = unread_by_event.get(event.id, 0)
             
             conversations.append({
                 "event_id": event.id,
@@ -333,7 +323,7 @@ def get_user_conversations():
         return jsonify({"conversations": conversations}), 200
         
     except Exception as e:
-        print(f"Error fetching user conversations: {str(e)}")
+        logger.exception("Error fetching user conversations: %s", e)
         return jsonify({"error": "Failed to fetch conversations"}), 500
 
 
@@ -349,26 +339,25 @@ def mark_messages_read():
         if not event_id:
             return jsonify({"error": "Event ID is required"}), 400
         
-        # Mark all messages in this event as read for current user
-        unread_messages = ChatMessage.query.filter_by(
-            event_id=event_id,
-            receiver_id=current_user_id,
-            is_read=False
-        ).all()
-        
-        for msg in unread_messages:
-            msg.is_read = True
-        
+        # One UPDATE instead of loading every unread message
+        marked_count = bulk_update(
+            ChatMessage,
+            {ChatMessage.is_read: True},
+            ChatMessage.event_id == event_id,
+            ChatMessage.receiver_id == int(current_user_id),
+            ChatMessage.is_read.is_(False),
+        )
+        record_chat_read(current_user_id, event_id, marked_count)
         db.session.commit()
         
         return jsonify({
-            "message": f"Marked {len(unread_messages)} messages as read",
-            "marked_count": len(unread_messages)
+            "message": f"Marked {marked_count} messages as read",
+            "marked_count": marked_count
         }), 200
         
     except Exception as e:
         db.session.rollback()
-        print(f"Error marking messages as read: {str(e)}")
+        logger.exception("Error marking messages as read: %s", e)
         return jsonify({"error": "Failed to mark messages as read"}), 500
 
 # ✅ Get full conversation between two users across ALL their events
@@ -400,7 +389,7 @@ def get_full_conversation(other_user_id):
         }), 200
         
     except Exception as e:
-        print(f"Error fetching full conversation: {str(e)}")
+        logger.exception("Error fetching full conversation: %s", e)
         return jsonify({"error": "Failed to fetch conversation"}), 500
 
 # ✅ Get unread messages count for current user
@@ -409,14 +398,8 @@ def get_full_conversation(other_user_id):
 def get_unread_count():
     try:
         current_user_id = get_jwt_identity()
-        
-        count = ChatMessage.query.filter_by(
-            receiver_id=current_user_id,
-            is_read=False
-        ).count()
-        
-        return jsonify({"unread_count": count}), 200
+        return jsonify({"unread_count": chat_unread_total(current_user_id)}), 200
         
     except Exception as e:
-        print(f"Error fetching unread count: {str(e)}")
+        logger.exception("Error fetching unread count: %s", e)
         return jsonify({"error": "Failed to fetch unread count"}), 500
\ No newline at end of file
@@ -0,0 +1,106 @@
+import hashlib
+
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+
+from app.api.badges import badge_counts
+from app.api.events import build_event_lists
+from app.api.reviews import REVIEW_STATUS_BATCH_MAX, rating_summaries, review_statuses
+from app.current_user import current_identity
+from app.extensions import db
+from app.models import Event
+from app.utils import jsonfast
+
+dashboard_bp = Blueprint("dashboard", __name__, url_prefix="/api/dashboard")
+
+
+def _events_section(identity):
+    return build_event_lists(identity, request.args)
+
+
+def _notifications_section(identity):
+    from app.api.payments import notifications_for_user
+
+    return notifications_for_user(identity.id)
+
+
+def _badges_section(identity):
+    return badge_counts(identity, by_event=True)
+
+
+def _rating_summaries_section(identity):
+    """Own summary, plus the organizers of events this user created."""
+    ids = {identity.id}
+    ids.update(
+        organizer_id
+        for (organizer_id,) in db.session.query(Event.organizer_id)
+        .filter(Event.user_id == identity.id, Event.organizer_id.isnot(None))
+        .distinct()
+    )
+    return {str(uid): summary for uid, summary in rating_summaries(ids).items()}
+
+
+def _review_status_section(identity):
+    """Review status for the caller's most recent events (owned, or organized for organizers)."""
+    column = Event.organizer_id if identity.role == "organizer" else Event.user_id
+    events = Event.query.filter(column == identity.id).order_by(Event.id.desc()).limit(REVIEW_STATUS_BATCH_MAX).all()
+    return {str(eid): status for eid, status in review_statuses(identity, events).items()}
+
+
+SECTIONS = {
+    "events": _events_section,
+    "notifications": _notifications_section,
+    "badges": _badges_section,
+    "rating_summaries": _rating_summaries_section,
+    "review_status": _review_status_section,
+}
+
+
+def _digest(payload) -> str:
+    return hashlib.blake2b(jsonfast.dumps(payload).encode("utf-8"), digest_size=6).hexdigest()
+
+
+def _parse_since(token):
+    """``name-digest.name-digest`` -> {name: digest}; junk is ignored (full response)."""
+    out = {}
+    for part in (token or "").split("."):
+        name, _, digest = part.partition("-")
+        if name in SECTIONS and digest:
+            out[name] = digest
+    return out
+
+
+@dashboard_bp.route("/bootstrap", methods=["GET"])
+@jwt_required()
+def bootstrap():
+    """
+    Everything the dashboard shell polls for, in one round trip: events, notifications,
+    badges, rating summaries and review status. ?sections=a,b limits what is built.
+    Pass the returned ``since`` token back as ?since= to receive only the sections
+    whose content changed.
+    """
+    identity = current_identity()
+    if identity is None:
+        return jsonify({"error": "User not found"}), 404
+
+    wanted = [s.strip() for s in (request.args.get("sections") or "").split(",") if s.strip()]
+    unknown = [s for s in wanted if s not in SECTIONS]
+    if unknown:
+        return jsonify({"error": f"Unknown sections: {', '.join(unknown)}"}), 400
+    wanted = wanted or list(SECTIONS)
+    previous = _parse_since(request.args.get("since"))
+
+    out, digests, changed = {}, {}, []
+    try:
+        for name in wanted:
+            payload = SECTIONS[name](identity)
+            digests[name] = _digest(payload)
+            if previous.get(name) != digests[name]:
+                out[name] = payload
+                changed.append(name)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    out["changed"] = changed
+    out["since"] = ".".join(f"{name}-{digest}" for name, digest in digests.items())
+    return jsonify(out), 200
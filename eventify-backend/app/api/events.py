@@ -1,3 +1,4 @@
+import logging
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from sqlalchemy import func
@@ -13,15 +14,31 @@ from app.models import (
     Review,
     vendor_events,
     get_reserving_vendor_id_for_event,
+    get_reserving_vendor_ids_for_events,
+    event_recency_expr,
+    event_recency_order,
 )
+from app.conditional import conditional
+from app.current_user import current_identity
+from app.metrics import track_outbound
+from app.providers import http, openai_client
+from app.open_events_feed import (
+    apply_feed_filters,
+    feed_page,
+    invalidate_open_events,
+    open_events_count as count_open_events,
+    open_events_query,
+)
+from app.payment_ledger import budget_payments_query, build_event_ledger, load_agreements, split_amounts
+from app.utils.bulk import bulk_delete, bulk_delete_returning, bulk_update
+from app.utils.pagination import decode_cursor, encode_cursor, parse_limit
 import os
 import uuid
 from collections import defaultdict
 from datetime import datetime, date, timezone, timedelta
-import requests
-from openai import OpenAI
 
 events_bp = Blueprint("events", __name__, url_prefix="/api/events")
+logger = logging.getLogger(__name__)
 
 
 def _min_allowed_event_date_utc():
@@ -42,24 +59,9 @@ def _parse_event_date_value(value):
         return None
 
 
-def _event_recency_sort_key(event):
-    """Newest activity first: updated_at, else created_at, else id (for legacy rows)."""
-    t = event.updated_at or event.created_at
-    if t is not None:
-        return (t.timestamp() if hasattr(t, "timestamp") else 0, event.id)
-    return (0.0, event.id)
-
-
-def _sort_events_by_recency_desc(events):
-    return sorted(events, key=_event_recency_sort_key, reverse=True)
-
-
-# ✅ Initialize OpenAI client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY")) if os.getenv("OPENAI_API_KEY") else None
-
-
 def generate_ai_suggestions(category: str, budget: float) -> list:
     """Generate AI suggestions for vendors/checklist based on category and budget."""
+    client = openai_client()
     if not client:
         return [
             f"Recommended vendor for {category}: Local Caterers (~Rs {budget * 0.3}).",
@@ -68,20 +70,21 @@ def generate_ai_suggestions(category: str, budget: float) -> list:
         ]
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are an event planning assistant. Provide 3 concise suggestions for vendors or tips based on the event category and budget."},
-                {"role": "user", "content": f"Suggest 3 vendors or planning tips for a {category} event with budget Rs {budget}."}
-            ],
-            max_tokens=150
-        )
+        with track_outbound("openai"):
+            response = client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=[
+                    {"role": "system", "content": "You are an event planning assistant. Provide 3 concise suggestions for vendors or tips based on the event category and budget."},
+                    {"role": "user", "content": f"Suggest 3 vendors or planning tips for a {category} event with budget Rs {budget}."}
+                ],
+                max_tokens=150
+            )
 
         suggestions = response.choices[0].message.content.strip().split("\n")
         return [s.strip("-• ").strip() for s in suggestions if s.strip()]
 
     except Exception as e:
-        print(f"⚠️ OpenAI error: {e}")
+        logger.warning("OpenAI error: %s", e)
         return ["AI suggestions unavailable — check your API key."]
 
 
@@ -90,7 +93,7 @@ def generate_ai_suggestions(category: str, budget: float) -> list:
 @jwt_required()
 def debug_token():
     current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = current_identity()
 
     return jsonify({
         "user_id": current_user_id,
@@ -101,43 +104,115 @@ def debug_token():
     }), 200
 
 
+def _decode_event_cursor(token):
+    """(recency datetime or None, id) from a list_events cursor, or None; ValueError if malformed."""
+    values = decode_cursor(token, 2)
+    if values is None:
+        return None
+    return (datetime.fromisoformat(values[0]) if values[0] else None), int(values[1])
+
+
+def ordered_events(query, cursor=None):
+    """
+    ``query`` ordered by last activity (SQL, indexed), after the keyset ``cursor`` if given.
+    Rows with no timestamps (pre-migration legacy) sort last on every engine, matching the
+    recency indexes (``event_recency_order``); the cursor predicate relies on that.
+    """
+    recency = event_recency_expr()
+    if cursor:
+        last_ts, last_id = cursor
+        if last_ts is None:
+            query = query.filter(recency.is_(None), Event.id < last_id)
+        else:
+            query = query.filter(
+                db.or_(
+                    recency < last_ts,
+                    db.and_(recency == last_ts, Event.id < last_id),
+                    recency.is_(None),
+                )
+            )
+    return query.order_by(event_recency_order(), Event.id.desc())
+
+
+def _events_page(query, cursor, limit):
+    """(events, next_cursor) for one ``ordered_events`` page; without a limit every row is returned."""
+    query = ordered_events(query, cursor)
+    if limit is None:
+        return query.all(), None
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    t = last.updated_at or last.created_at
+    return rows, encode_cursor([t.isoformat() if t else None, last.id])
+
+
+def _filter_event_list(query, args):
+    """status (comma-separated) and date_from / date_to (YYYY-MM-DD, on the event date)."""
+    statuses = [x.strip() for x in (args.get("status") or "").split(",") if x.strip()]
+    if statuses:
+        query = query.filter(Event.status.in_(statuses))
+    date_from = args.get("date_from")
+    if date_from:
+        d = _parse_event_date_value(date_from)
+        if d is None:
+            raise ValueError("date_from must be YYYY-MM-DD")
+        query = query.filter(Event.date >= d.isoformat())
+    date_to = args.get("date_to")
+    if date_to:
+        d = _parse_event_date_value(date_to)
+        if d is None:
+            raise ValueError("date_to must be YYYY-MM-DD")
+        query = query.filter(Event.date <= d.isoformat())
+    return query
+
+
 # ✅ Get all events (per user)
 @events_bp.route("", methods=["GET"])
 @jwt_required()
+@conditional("event", "payment", "event_application", "user", "vendor_events", "vendor_completed_events")
 def list_events():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    """
+    Events the user created and (organizers) was assigned, newest activity first.
+    Optional query: status, date_from, date_to, and limit (enables keyset pagination
+    with created_cursor / assigned_cursor; response then carries next_cursors).
+    """
+    user = current_identity()
     if not user:
         return jsonify({"error": "User not found"}), 404
+    try:
+        return jsonify(build_event_lists(user, request.args)), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+
+def build_event_lists(user, args):
+    """GET /api/events payload for ``user`` (an Identity); also used by the dashboard bootstrap. ValueError on bad args."""
+    limit = parse_limit(args.get("limit")) if args.get("limit") else None
+    try:
+        created_cursor = _decode_event_cursor(args.get("created_cursor"))
+        assigned_cursor = _decode_event_cursor(args.get("assigned_cursor"))
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
 
     # Personal + assigned lists: order by last update (or creation), most recent first
-    created_events = _sort_events_by_recency_desc(
-        Event.query.filter_by(user_id=user_id).all()
+    created_events, next_created = _events_page(
+        _filter_event_list(Event.query.filter(Event.user_id == user.id), args), created_cursor, limit
     )
-
-    assigned_events = []
+    assigned_events, next_assigned = [], None
     if user.role == "organizer":
-        assigned_events = _sort_events_by_recency_desc(
-            Event.query.filter_by(organizer_id=user_id).all()
+        assigned_events, next_assigned = _events_page(
+            _filter_event_list(Event.query.filter(Event.organizer_id == user.id), args),
+            assigned_cursor,
+            limit,
         )
 
     # Compute total_spent from Payment table (same rules as get_budget_summary)
     event_ids = list({e.id for e in created_events} | {e.id for e in assigned_events})
     totals = defaultdict(float)
     if event_ids:
-        payments = (
-            Payment.query.filter(
-                Payment.event_id.in_(event_ids),
-                Payment.status == "completed",
-            )
-            .filter(
-                Payment.payment_type.in_(
-                    ["advance", "final", "organizer_advance", "organizer_final"]
-                )
-            )
-            .all()
-        )
-        for p in payments:
+        for p in budget_payments_query(event_ids).all():
             totals[p.event_id] += float(p.amount or 0)
 
     open_event_ids = [e.id for e in created_events if e.organizer_id is None and e.status == "created"]
@@ -150,20 +225,27 @@ def list_events():
         for eid, c in counts:
             app_counts[eid] = c
 
-    def event_to_dict_with_spent(e):
-        d = e.to_dict()
+    reserving = get_reserving_vendor_ids_for_events(event_ids)
+    rendered = Event.to_dicts(created_events + assigned_events)
+
+    def event_to_dict_with_spent(e, d):
         spent = totals.get(e.id, 0.0)
         d["total_spent"] = spent
         d["remaining_budget"] = float(e.budget or 0) - spent
         if e.organizer_id is None and e.status == "created":
             d["application_count"] = app_counts.get(e.id, 0)
-        d["reserving_vendor_id"] = get_reserving_vendor_id_for_event(e.id)
+        d["reserving_vendor_id"] = reserving.get(e.id)
         return d
 
-    return jsonify({
-        "created": [event_to_dict_with_spent(e) for e in created_events],
-        "assigned": [event_to_dict_with_spent(e) for e in assigned_events],
-    }), 200
+    out = {
+        "created": [event_to_dict_with_spent(e, d) for e, d in zip(created_events, rendered)],
+        "assigned": [
+            event_to_dict_with_spent(e, d) for e, d in zip(assigned_events, rendered[len(created_events):])
+        ],
+    }
+    if limit is not None:
+        out["next_cursors"] = {"created": next_created, "assigned": next_assigned}
+    return out
 
 
 # ✅ Create a new event
@@ -172,7 +254,7 @@ def list_events():
 def create_event():
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_identity()
         if not user:
             return jsonify({"error": "User not found"}), 404
 
@@ -273,6 +355,8 @@ def create_event():
 
         db.session.add(event)
         db.session.commit()
+        if status == "created":
+            invalidate_open_events()
 
         # Notify Organizer (if one was selected)
         if organizer_id:
@@ -286,7 +370,7 @@ def create_event():
                     {"event_id": event.id, "action": "assignment_review"}
                 )
             except Exception as e:
-                print(f"Organizer notification failed: {e}")
+                logger.warning("Organizer notification failed: %s", e)
         else:
             # Event posted for applications: notify all active organizers
             try:
@@ -301,7 +385,7 @@ def create_event():
                         {"event_id": event.id, "action": "open_events"}
                     )
             except Exception as e:
-                print(f"Notify organizers of new open event failed: {e}")
+                logger.warning("Notify organizers of new open event failed: %s", e)
 
         suggestions = generate_ai_suggestions(event.vendor_category, event.budget)
 
@@ -312,7 +396,7 @@ def create_event():
         }), 201
 
     except Exception as e:
-        print(f"❌ Error in create_event: {str(e)}")
+        logger.exception("Error in create_event: %s", e)
         db.session.rollback()
         return jsonify({"error": "Internal server error"}), 500
 
@@ -322,72 +406,60 @@ def create_event():
 @events_bp.route("/open/count", methods=["GET"])
 @jwt_required()
 def open_events_count():
-    """Return count of open events for organizers (for sidebar badge)."""
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    """Return count of open events for organizers (for sidebar badge). Cached per organizer."""
+    user = current_identity()
     if not user or user.role != "organizer":
         return jsonify({"count": 0}), 200
-    try:
-        uid = int(user_id)
-    except (TypeError, ValueError):
-        return jsonify({"count": 0}), 200
-    applied_event_ids = [
-        a.event_id
-        for a in EventApplication.query.filter_by(organizer_id=uid, status="pending").all()
-    ]
-    query = Event.query.filter(
-        Event.organizer_id.is_(None),
-        Event.status == "created"
-    )
-    if applied_event_ids:
-        query = query.filter(~Event.id.in_(applied_event_ids))
-    count = query.count()
-    return jsonify({"count": count}), 200
+    return jsonify({"count": count_open_events(user.id)}), 200
 
 
 @events_bp.route("/open", methods=["GET"])
 @jwt_required()
 def list_open_events():
-    """List events with no organizer (status=created). Organizers only. Excludes events where the user has a *pending* application (declined may re-apply and see the event again)."""
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    """
+    List events with no organizer (status=created). Organizers only. Excludes events where the user has a *pending* application (declined may re-apply and see the event again).
+    Optional query: category, city, min_budget, max_budget. With ``limit`` the response is
+    { events, next_cursor } (pass next_cursor back as ``cursor``); without it, a plain list.
+    """
+    user = current_identity()
     if not user:
         return jsonify({"error": "User not found"}), 404
     if user.role != "organizer":
         return jsonify({"error": "Only organizers can view open events"}), 403
+    uid = user.id
 
+    args = request.args
+    limit = parse_limit(args.get("limit")) if args.get("limit") else None
     try:
-        uid = int(user_id)
+        cursor = decode_cursor(args.get("cursor"), 1)
+        after_id = int(cursor[0]) if cursor else None
     except (TypeError, ValueError):
-        return jsonify({"error": "Invalid user"}), 401
-
-    pending_event_ids = [
-        a.event_id
-        for a in EventApplication.query.filter_by(organizer_id=uid, status="pending").all()
-    ]
-    query = Event.query.filter(
-        Event.organizer_id.is_(None),
-        Event.status == "created",
-    )
-    if pending_event_ids:
-        query = query.filter(~Event.id.in_(pending_event_ids))
-    open_events = query.all()
+        return jsonify({"error": "Invalid cursor"}), 400
+    try:
+        query = apply_feed_filters(open_events_query(uid), args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    open_events, next_after_id = feed_page(query, after_id, limit)
 
     event_ids = [e.id for e in open_events]
     my_apps = {}
     if event_ids:
-        for a in EventApplication.query.filter(
+        for event_id, status in db.session.query(EventApplication.event_id, EventApplication.status).filter(
             EventApplication.event_id.in_(event_ids),
             EventApplication.organizer_id == uid,
-        ).all():
-            my_apps[a.event_id] = a.status
+        ):
+            my_apps[event_id] = status
 
     out = []
-    for e in open_events:
-        d = e.to_dict()
+    for e, d in zip(open_events, Event.to_dicts(open_events)):
         d["my_application_status"] = my_apps.get(e.id)  # e.g. "declined" or None if no row
         out.append(d)
-    return jsonify(out), 200
+    if limit is None:
+        return jsonify(out), 200
+    return jsonify({
+        "events": out,
+        "next_cursor": encode_cursor([next_after_id]) if next_after_id is not None else None,
+    }), 200
 
 
 @events_bp.route("/<int:event_id>/apply", methods=["POST"])
@@ -395,7 +467,7 @@ def list_open_events():
 def apply_to_event(event_id):
     """Organizer applies to an open event. Optional body: { \"message\": \"...\" }."""
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = current_identity()
     if not user:
         return jsonify({"error": "User not found"}), 404
     if user.role != "organizer":
@@ -420,6 +492,7 @@ def apply_to_event(event_id):
             existing.message = message
             existing.status = "pending"
             db.session.commit()
+            invalidate_open_events(user.id)
             try:
                 from app.api.payments import create_notification
                 create_notification(
@@ -430,7 +503,7 @@ def apply_to_event(event_id):
                     {"event_id": event.id, "action": "view_applications"},
                 )
             except Exception as e:
-                print(f"Re-apply notification failed: {e}")
+                logger.warning("Re-apply notification failed: %s", e)
             return (
                 jsonify(
                     {
@@ -447,6 +520,7 @@ def apply_to_event(event_id):
     )
     db.session.add(app)
     db.session.commit()
+    invalidate_open_events(user.id)
 
     try:
         from app.api.payments import create_notification
@@ -458,7 +532,7 @@ def apply_to_event(event_id):
             {"event_id": event.id, "action": "view_applications"}
         )
     except Exception as e:
-        print(f"Application notification failed: {e}")
+        logger.warning("Application notification failed: %s", e)
 
     return jsonify({"message": "Application submitted", "application": app.to_dict()}), 201
 
@@ -567,6 +641,7 @@ def decline_organizer_application(event_id):
 
     application.status = "declined"
     db.session.commit()
+    invalidate_open_events(organizer_id)
 
     try:
         from app.api.payments import create_notification
@@ -578,7 +653,7 @@ def decline_organizer_application(event_id):
             {"event_id": event.id, "action": "open_events", "application_status": "declined"},
         )
     except Exception as e:
-        print(f"Decline application notification failed: {e}")
+        logger.warning("Decline application notification failed: %s", e)
 
     return jsonify(
         {
@@ -630,10 +705,15 @@ def assign_organizer_to_event(event_id):
     event.status = "awaiting_organizer_confirmation"
     event.organizer_status = "pending"
     application.status = "accepted"
-    for other in EventApplication.query.filter_by(event_id=event_id).filter(EventApplication.id != application.id).all():
-        other.status = "rejected"
+    bulk_update(
+        EventApplication,
+        {EventApplication.status: "rejected"},
+        EventApplication.event_id == event_id,
+        EventApplication.id != application.id,
+    )
     event.updated_at = datetime.utcnow()
     db.session.commit()
+    invalidate_open_events()
 
     try:
         from app.api.payments import create_notification
@@ -645,7 +725,7 @@ def assign_organizer_to_event(event_id):
             {"event_id": event.id, "action": "assignment_review"}
         )
     except Exception as e:
-        print(f"Assign organizer notification failed: {e}")
+        logger.warning("Assign organizer notification failed: %s", e)
 
     return jsonify({"message": "Organizer assigned successfully", "event": event.to_dict()}), 200
 
@@ -717,12 +797,12 @@ def update_event(event_id):
                     {"event_id": event.id}
                 )
         except Exception as e:
-            print(f"Update event notification failed: {e}")
+            logger.warning("Update event notification failed: %s", e)
             
         return jsonify({"message": "Event updated successfully", "event": event.to_dict()}), 200
 
     except Exception as e:
-        print(f"❌ Error in update_event: {str(e)}")
+        logger.exception("Error in update_event: %s", e)
         db.session.rollback()
         return jsonify({"error": "Internal server error"}), 500
     
@@ -732,7 +812,7 @@ def update_event(event_id):
 def assign_vendor(event_id):
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = current_identity()
         if not user:
             return jsonify({"error": "User not found"}), 404
 
@@ -771,7 +851,7 @@ def assign_vendor(event_id):
 
     except Exception as e:
         db.session.rollback()
-        print(f"❌ Error assigning vendor: {e}")
+        logger.exception("Error assigning vendor: %s", e)
         return jsonify({"error": "Internal server error"}), 500
 
 @events_bp.route("/<int:event_id>", methods=["DELETE"])
@@ -783,19 +863,19 @@ def delete_event(event_id):
         if not event:
             return jsonify({"error": "Event not found"}), 404
 
-        assigned_vendors_ids = [v.id for v in event.assigned_vendors.all()]
         event_name = event.name
-
-        for vendor in event.assigned_vendors.all():
-            event.assigned_vendors.remove(vendor)
+        # Drop every vendor link in one statement; the returned ids drive the notifications
+        assigned_vendors_ids = [
+            row.vendor_id
+            for row in bulk_delete_returning(vendor_events, [vendor_events.c.vendor_id], vendor_events.c.event_id == event.id)
+        ]
 
         # Canceled (already soft-canceled): permanent removal.
-        if event.status == "canceled":
-            db.session.delete(event)
-            message = "Event removed permanently"
-        elif event.status == "completed":
+        if event.status in ("canceled", "completed"):
+            # event_application.event_id is NOT NULL, so clear applications before the row goes
+            bulk_delete(EventApplication, EventApplication.event_id == event.id)
             db.session.delete(event)
-            message = "Event removed successfully"
+            message = "Event removed permanently" if event.status == "canceled" else "Event removed successfully"
         else:
             # In-progress / draft: soft-cancel so it appears under Canceled on the client dashboard.
             event.status = "canceled"
@@ -804,6 +884,7 @@ def delete_event(event_id):
             message = "Event canceled successfully"
 
         db.session.commit()
+        invalidate_open_events()
 
         try:
             from app.api.payments import create_notification
@@ -815,13 +896,13 @@ def delete_event(event_id):
                     "warning"
                 )
         except Exception as e:
-            print(f"Delete event notification failed: {e}")
+            logger.warning("Delete event notification failed: %s", e)
 
         return jsonify({"message": message}), 200
 
     except Exception as e:
         db.session.rollback()
-        print(f"❌ Error deleting event: {e}")
+        logger.exception("Error deleting event: %s", e)
         return jsonify({"error": "Internal server error"}), 500
 
 def _nominatim_venue_search(query: str, limit: int = 10) -> list:
@@ -831,21 +912,22 @@ def _nominatim_venue_search(query: str, limit: int = 10) -> list:
             "NOMINATIM_USER_AGENT",
             "Eventify/1.0 (venue search)",
         )
-        r = requests.get(
-            "https://nominatim.openstreetmap.org/search",
-            params={
-                "q": query,
-                "format": "json",
-                "limit": limit,
-                "addressdetails": 0,
-            },
-            headers={
-                "User-Agent": ua,
-                "Accept-Language": "en",
-            },
-            timeout=12,
-        )
-        r.raise_for_status()
+        with track_outbound("nominatim"):
+            r = http().get(
+                "https://nominatim.openstreetmap.org/search",
+                params={
+                    "q": query,
+                    "format": "json",
+                    "limit": limit,
+                    "addressdetails": 0,
+                },
+                headers={
+                    "User-Agent": ua,
+                    "Accept-Language": "en",
+                },
+                timeout=12,
+            )
+            r.raise_for_status()
         data = r.json()
         rows = data if isinstance(data, list) else []
         out = []
@@ -855,7 +937,7 @@ def _nominatim_venue_search(query: str, limit: int = 10) -> list:
                 out.append(name)
         return out
     except Exception as e:
-        print(f"Nominatim venue search: {e}")
+        logger.warning("Nominatim venue search: %s", e)
         return []
 
 
@@ -895,7 +977,7 @@ def get_venue_suggestions():
             for (venue,) in rows:
                 add_label(venue)
         except Exception as e:
-            print(f"venue DB suggestions: {e}")
+            logger.exception("venue DB suggestions: %s", e)
 
         # 2) Live place & address autocomplete (OpenStreetMap)
         for label in _nominatim_venue_search(q, limit=10):
@@ -939,7 +1021,7 @@ def get_venue_suggestions():
         return jsonify({"suggestions": suggestions[:15]})
 
     except Exception as e:
-        print(f"Error in venue suggestions: {e}")
+        logger.exception("Error in venue suggestions: %s", e)
         return jsonify({"suggestions": []})
 
 # ✅ Respond to an organizer assignment (Accept/Reject)
@@ -972,6 +1054,8 @@ def respond_assignment(event_id):
 
         event.updated_at = datetime.utcnow()
         db.session.commit()
+        if status == "rejected":
+            invalidate_open_events()
 
         # Notify the Event Creator
         try:
@@ -986,7 +1070,7 @@ def respond_assignment(event_id):
                 {"event_id": event.id}
             )
         except Exception as e:
-            print(f"Creator notification failed: {e}")
+            logger.warning("Creator notification failed: %s", e)
 
         return jsonify({
             "message": f"Assignment {status} successfully",
@@ -994,7 +1078,7 @@ def respond_assignment(event_id):
         }), 200
 
     except Exception as e:
-        print(f"❌ Error in respond_assignment: {str(e)}")
+        logger.exception("Error in respond_assignment: %s", e)
         db.session.rollback()
         return jsonify({"error": "Internal server error"}), 500
 
@@ -1037,6 +1121,7 @@ def reassign_organizer(event_id):
         event.status = "awaiting_organizer_confirmation"
         event.updated_at = datetime.utcnow()
         db.session.commit()
+        invalidate_open_events()
 
         try:
             from app.api.payments import create_notification
@@ -1048,14 +1133,14 @@ def reassign_organizer(event_id):
                 {"event_id": event.id, "action": "assignment_review"},
             )
         except Exception as e:
-            print(f"Reassign organizer notification failed: {e}")
+            logger.warning("Reassign organizer notification failed: %s", e)
 
         return jsonify(
             {"message": "Organizer assigned successfully", "event": event.to_dict()}
         ), 200
 
     except Exception as e:
-        print(f"❌ Error in reassign_organizer: {str(e)}")
+        logger.exception("Error in reassign_organizer: %s", e)
         db.session.rollback()
         return jsonify({"error": "Internal server error"}), 500
 
@@ -1075,7 +1160,7 @@ def create_advance_request(event_id):
         from app.api.payments import create_notification
 
         user_id = get_jwt_identity()
-        organizer = User.query.get(user_id)
+        organizer = current_identity()
         if not organizer or organizer.role != "organizer":
             return jsonify({"error": "Only organizers can create advance requests"}), 403
 
@@ -1112,7 +1197,7 @@ def create_advance_request(event_id):
                 }
             ), 200
 
-        amount = float(event.budget) * 0.25
+        amount, _ = split_amounts(event.budget)
         opr = OrganizerPaymentRequest(
             event_id=event.id,
             organizer_id=user_id,
@@ -1133,7 +1218,7 @@ def create_advance_request(event_id):
                 {"organizer_request_id": opr.id, "event_id": event.id},
             )
         except Exception as e:
-            print(f"Advance request notification failed: {e}")
+            logger.warning("Advance request notification failed: %s", e)
 
         return jsonify(
             {
@@ -1143,7 +1228,7 @@ def create_advance_request(event_id):
         ), 201
 
     except Exception as e:
-        print(f"❌ Error in create_advance_request: {str(e)}")
+        logger.exception("Error in create_advance_request: %s", e)
         db.session.rollback()
         return jsonify({"error": "Internal server error"}), 500
 
@@ -1164,7 +1249,7 @@ def create_final_request(event_id):
         from app.api.payments import create_notification
 
         user_id = get_jwt_identity()
-        organizer = User.query.get(user_id)
+        organizer = current_identity()
         if not organizer or organizer.role != "organizer":
             return jsonify({"error": "Only organizers can create final payment requests"}), 403
 
@@ -1183,7 +1268,7 @@ def create_final_request(event_id):
         if not event.budget or event.budget <= 0:
             return jsonify({"error": "Event budget must be set before creating a final payment request"}), 400
 
-        final_amount = round(float(event.budget) * 0.75, 2)
+        _, final_amount = split_amounts(event.budget)
 
         # Block duplicate paid final requests
         existing_final_paid = (
@@ -1240,7 +1325,7 @@ def create_final_request(event_id):
                 {"organizer_request_id": opr.id, "event_id": event.id},
             )
         except Exception as e:
-            print(f"Final payment request notification failed: {e}")
+            logger.warning("Final payment request notification failed: %s", e)
 
         return jsonify(
             {
@@ -1250,7 +1335,7 @@ def create_final_request(event_id):
         ), 201
 
     except Exception as e:
-        print(f"❌ Error in create_final_request: {str(e)}")
+        logger.exception("Error in create_final_request: %s", e)
         db.session.rollback()
         return jsonify({"error": "Internal server error"}), 500
 
@@ -1297,12 +1382,12 @@ def complete_event(event_id):
                     },
                 )
         except Exception as notify_err:
-            print(f"Complete event follow-up notification failed: {notify_err}")
+            logger.warning("Complete event follow-up notification failed: %s", notify_err)
 
         return jsonify({"message": "Event marked as completed", "event": event.to_dict()}), 200
 
     except Exception as e:
-        print(f"❌ Error in complete_event: {str(e)}")
+        logger.exception("Error in complete_event: %s", e)
         db.session.rollback()
         return jsonify({"error": "Internal server error"}), 500
 
@@ -1343,47 +1428,16 @@ def get_budget_summary(event_id):
     total_budget = float(event.budget or 0)
 
     # Recompute total_spent and remaining_budget from completed payments
-    completed_payments = (
-        Payment.query.filter_by(
-            event_id=event_id,
-            status="completed",
-        )
-        .filter(
-            Payment.payment_type.in_(
-                ["advance", "final", "organizer_advance", "organizer_final"]
-            )
-        )
-        .all()
-    )
+    completed_payments = budget_payments_query([event_id]).all()
 
     total_spent = float(sum(p.amount or 0 for p in completed_payments))
     remaining_budget = total_budget - total_spent
 
-    agreements = EventVendorAgreement.query.filter_by(event_id=event_id).all()
-    vendor_agreements = []
-    for a in agreements:
-        advance_amt = round(a.agreed_price * 0.25, 2)
-        final_amt = round(a.agreed_price * 0.75, 2)
-        advance_paid = Payment.query.filter_by(
-            event_id=event_id, vendor_id=a.vendor_id, payment_type="advance", status="completed"
-        ).first()
-        final_paid = Payment.query.filter_by(
-            event_id=event_id, vendor_id=a.vendor_id, payment_type="final", status="completed"
-        ).first()
-        vendor_agreements.append({
-            "id": a.id,
-            "vendor_id": a.vendor_id,
-            "vendor_name": a.vendor.name if a.vendor else "Unknown",
-            "service_type": a.service_type or "General",
-            "agreed_price": a.agreed_price,
-            "advance_amount": advance_amt,
-            "final_amount": final_amt,
-            "advance_status": "paid" if advance_paid else "pending",
-            "final_status": "paid" if final_paid else "pending",
-            "payment_status": a.payment_status,
-        })
-
-    agreement_vendor_ids = {a.vendor_id for a in agreements}
+    # Advance/final status comes from the agreement state machine (see payment_ledger).
+    agreements = load_agreements(event_id)
+    vendor_agreements = build_event_ledger(event, agreements)["vendor_agreements"]
+
+    agreement_vendor_ids = set(agreements)
     accepted_vendors = (
         User.query.join(vendor_events, User.id == vendor_events.c.vendor_id)
         .filter(
@@ -1456,7 +1510,7 @@ def put_budget_plan(event_id):
         db.session.commit()
     except Exception as e:
         db.session.rollback()
-        print(f"put_budget_plan: {e}")
+        logger.exception("put_budget_plan: %s", e)
         return jsonify({"error": "Could not save budget plan"}), 500
 
     total_budget = float(event.budget or 0)
@@ -1,3 +1,4 @@
+import logging
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import (
@@ -8,20 +9,31 @@ from app.models import (
     Payment,
     OrganizerPaymentRequest,
     VendorEventVerification,
-    EventVendorAgreement,
     Review,
     get_vendor_event_partnership_status,
 )
+from app.conditional import conditional
+from app.current_user import load_current_user
+from app.metrics import track_outbound
+from app.providers import stripe_sdk
+from app.payment_ledger import (
+    ADVANCE_SHARE,
+    PaymentTransitionError,
+    build_event_ledger,
+    classify_organizer_amount,
+    load_agreements,
+    settle_vendor_payments,
+)
 from sqlalchemy import or_, and_, func
+from collections import defaultdict
 from datetime import datetime
-import stripe
+import os
+import threading
+import uuid
 from app.config import Config
 
 payments_bp = Blueprint("payments", __name__, url_prefix="/api/payments")
-
-# Initialize Stripe
-stripe.api_key = Config.STRIPE_SECRET_KEY
-
+logger = logging.getLogger(__name__)
 
 def _prompt_vendor_review_after_final(event, organizer_user_id, vendor_id):
     """
@@ -56,11 +68,7 @@ def _prompt_user_review_organizer_after_final_organizer_payment(opr):
     event = opr.event
     if not event or not event.organizer_id:
         return None
-    total_budget = float(event.budget or 0)
-    paid_amount = float(opr.amount or 0)
-    final_amount = round(total_budget * 0.75, 2) if total_budget > 0 else 0
-    is_final = total_budget > 0 and abs(paid_amount - final_amount) < 0.01
-    if not is_final:
+    if classify_organizer_amount(event.budget, opr.amount) != "final":
         return None
     client = User.query.get(event.user_id)
     if not client or client.role != "user":
@@ -89,22 +97,73 @@ def _prompt_user_review_organizer_after_final_organizer_payment(opr):
 # Notification storage (Simulated)
 demo_notifications = []
 notification_counter = 1
+# Request threads and the notification fan-out worker both append here
+_notifications_lock = threading.Lock()
+# user_id -> unread notifications, kept in step with demo_notifications under the lock
+_unread_notifications = defaultdict(int)
+# user_id -> change counter for that user's notifications (conditional GET)
+_notification_versions = defaultdict(int)
+_notifications_boot = uuid.uuid4().hex[:8]
+
+
+def notification_unread_count(user_id):
+    return _unread_notifications.get(int(user_id), 0)
+
+
+def pending_unread_notifications():
+    return sum(_unread_notifications.values())
+
+
+def notifications_for_user(user_id):
+    user_id = int(user_id)
+    return [n for n in demo_notifications if int(n['user_id']) == user_id]
+
+
+def notifications_version(user_id):
+    """ETag token for a user's notifications; the list is per process, so the token is too."""
+    return f"{os.getpid()}.{_notifications_boot}.{_notification_versions.get(int(user_id), 0)}"
+
+
+def _mark_notifications_read(predicate):
+    """Flip unread notifications matching predicate to read; returns how many changed."""
+    count = 0
+    with _notifications_lock:
+        for n in demo_notifications:
+            if not n['is_read'] and predicate(n):
+                n['is_read'] = True
+                _unread_notifications[int(n['user_id'])] -= 1
+                _notification_versions[int(n['user_id'])] += 1
+                count += 1
+    return count
 
 def create_notification(user_id, title, message, notification_type="info", extra_data=None):
+    return create_notifications([
+        {"user_id": user_id, "title": title, "message": message, "type": notification_type, "extra_data": extra_data}
+    ])[0]
+
+def create_notifications(items):
+    """Append many notifications under one lock. items: dicts with user_id, title, message, type?, extra_data?"""
     global notification_counter
-    notification = {
-        "id": notification_counter,
-        "user_id": int(user_id),
-        "title": title,
-        "message": message,
-        "type": notification_type,
-        "is_read": False,
-        "created_at": datetime.now().isoformat(),
-        "extra_data": extra_data
-    }
-    demo_notifications.append(notification)
-    notification_counter += 1
-    return notification
+    created_at = datetime.now().isoformat()
+    out = []
+    with _notifications_lock:
+        for item in items:
+            notification = {
+                "id": notification_counter,
+                "user_id": int(item["user_id"]),
+                "title": item["title"],
+                "message": item["message"],
+                "type": item.get("type") or "info",
+                "is_read": False,
+                "created_at": created_at,
+                "extra_data": item.get("extra_data")
+            }
+            demo_notifications.append(notification)
+            _unread_notifications[notification["user_id"]] += 1
+            _notification_versions[notification["user_id"]] += 1
+            notification_counter += 1
+            out.append(notification)
+    return out
 
 # --- STRIPE CORE LOGIC ---
 
@@ -113,6 +172,7 @@ def stripe_webhook():
     payload = request.get_data()
     sig_header = request.headers.get("Stripe-Signature")
     endpoint_secret = Config.STRIPE_WEBHOOK_SECRET
+    stripe = stripe_sdk()
 
     try:
         event = stripe.Webhook.construct_event(payload, sig_header, endpoint_secret)
@@ -137,7 +197,7 @@ def handle_payment_success(payment_intent):
     request_id = metadata.get("request_id")
     organizer_request_id = metadata.get("organizer_request_id")
 
-    print(f"💰 Processing successful payment context: payment_id={payment_id}, request_id={request_id}, organizer_request_id={organizer_request_id}")
+    logger.info("Processing successful payment context: payment_id=%s, request_id=%s, organizer_request_id=%s", payment_id, request_id, organizer_request_id)
 
     prompt_user_review_organizer = None
     prompt_vendor_review = None
@@ -154,7 +214,7 @@ def handle_payment_success(payment_intent):
                     pr = PaymentRequest.query.get(int(request_id))
                     if pr:
                         pr.status = 'paid'
-                        print(f"✅ Vendor settlement (Request {request_id}) marked as PAID")
+                        logger.info("Vendor settlement (Request %s) marked as PAID", request_id)
                         payment.vendor_id = pr.vendor_id
                         payment.payment_type = "vendor_settlement"
                         settle_event = pr.event
@@ -181,22 +241,16 @@ def handle_payment_success(payment_intent):
                         # or the 75% final amount based on the agreed event budget.
                         event = opr.event
                         if event:
-                            total_budget = float(event.budget or 0)
-                            paid_amount = float(opr.amount or 0)
-                            advance_amount = round(total_budget * 0.25, 2) if total_budget > 0 else 0
-                            final_amount = round(total_budget * 0.75, 2) if total_budget > 0 else 0
-
-                            is_advance = total_budget > 0 and abs(paid_amount - advance_amount) < 0.01
-                            is_final = total_budget > 0 and abs(paid_amount - final_amount) < 0.01
+                            share = classify_organizer_amount(event.budget, opr.amount)
 
-                            if is_advance:
+                            if share == "advance":
                                 # Mark advance (25%) paid and keep existing lifecycle behaviour.
                                 event.organizer_advance_paid = True
                                 if event.status == "pending_advance_payment":
                                     event.status = "advance_payment_completed"
                                 if payment.payment_type is None:
                                     payment.payment_type = "organizer_advance"
-                            elif is_final:
+                            elif share == "final":
                                 # Mark final (75%) paid. Event should already be completed;
                                 # we just toggle the organizer flags and payment_type.
                                 event.organizer_final_paid = True
@@ -211,7 +265,7 @@ def handle_payment_success(payment_intent):
 
                                 prompt_user_review_organizer = _prompt_user_review_organizer_after_final_organizer_payment(opr)
 
-                        print(f"✅ Organizer request {organizer_request_id} marked as PAID")
+                        logger.info("Organizer request %s marked as PAID", organizer_request_id)
                         create_notification(
                             opr.organizer_id,
                             "💰 Payment Received",
@@ -221,7 +275,7 @@ def handle_payment_success(payment_intent):
                         )
 
                 db.session.commit()
-                print(f"✨ Payment {payment_id} marked as COMPLETED in database")
+                logger.info("Payment %s marked as COMPLETED in database", payment_id)
                 evt = payment.event
                 if prompt_user_review_organizer and evt:
                     create_notification(
@@ -253,9 +307,9 @@ def handle_payment_success(payment_intent):
                     "prompt_vendor_review": prompt_vendor_review,
                 }
             else:
-                print(f"❌ Payment ID {payment_id} not found in database")
+                logger.warning("Payment ID %s not found in database", payment_id)
         except Exception as e:
-            print(f"❌ Error updating payment: {str(e)}")
+            logger.exception("Error updating payment: %s", e)
             db.session.rollback()
     return {"success": False, "prompt_user_review_organizer": None, "prompt_vendor_review": None}
 
@@ -271,7 +325,7 @@ def handle_payment_failure(payment_intent):
         if payment:
             payment.status = "failed"
             db.session.commit()
-            print(f"⚠️ Payment {payment_id} marked as FAILED")
+            logger.warning("Payment %s marked as FAILED", payment_id)
 
 @payments_bp.route("/create-payment-intent", methods=["POST"])
 @jwt_required()
@@ -284,7 +338,7 @@ def create_payment_intent():
         request_id = data.get('request_id')  # Optional: for vendor settlement
         organizer_request_id = data.get('organizer_request_id')  # Optional: owner paying organizer
 
-        print(f"🔄 Creating intent for Event {event_id}, Amount {amount}, request_id={request_id}, organizer_request_id={organizer_request_id}")
+        logger.debug("Creating intent for Event %s, Amount %s, request_id=%s, organizer_request_id=%s", event_id, amount, request_id, organizer_request_id)
 
         event = Event.query.get(event_id)
         if not event:
@@ -312,6 +366,7 @@ def create_payment_intent():
                 return jsonify({"error": "Event not found"}), 404
 
         stripe_currency = "pkr"
+        stripe = stripe_sdk()
         payment = Payment(
             event_id=event_id,
             amount=float(amount),
@@ -334,26 +389,28 @@ def create_payment_intent():
             meta["organizer_request_id"] = str(organizer_request_id)
 
         try:
-            intent = stripe.PaymentIntent.create(
-                amount=int(float(amount) * 100),
-                currency=stripe_currency,
-                metadata=meta
-            )
+            with track_outbound("stripe"):
+                intent = stripe.PaymentIntent.create(
+                    amount=int(float(amount) * 100),
+                    currency=stripe_currency,
+                    metadata=meta
+                )
         except Exception as stripe_err:
             # Fallback for Stripe accounts that are not enabled for PKR
-            print(f"⚠️ PKR payment intent failed, retrying with USD: {stripe_err}")
+            logger.warning("PKR payment intent failed, retrying with USD: %s", stripe_err)
             stripe_currency = "usd"
             payment.currency = stripe_currency.upper()
             db.session.commit()
-            intent = stripe.PaymentIntent.create(
-                amount=int(float(amount) * 100),
-                currency=stripe_currency,
-                metadata=meta
-            )
-        print(f"🔌 Stripe Intent Created: {intent.id}")
+            with track_outbound("stripe"):
+                intent = stripe.PaymentIntent.create(
+                    amount=int(float(amount) * 100),
+                    currency=stripe_currency,
+                    metadata=meta
+                )
+        logger.info("Stripe Intent Created: %s", intent.id)
         return jsonify({"clientSecret": intent.client_secret, "payment_id": payment.id}), 201
     except Exception as e:
-        print(f"❌ Intent Creation Error: {str(e)}")
+        logger.exception("Intent Creation Error: %s", e)
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
@@ -388,11 +445,12 @@ def verify_payment_manual(payment_id):
     try:
         data = request.get_json()
         pi_id = data.get("payment_intent")
-        print(f"🔍 Manual Verification Request for Payment {payment_id} (Intent: {pi_id})")
+        logger.info("Manual Verification Request for Payment %s (Intent: %s)", payment_id, pi_id)
         
         if not pi_id: return jsonify({"error": "Payment Intent ID required"}), 400
         
-        intent = stripe.PaymentIntent.retrieve(pi_id)
+        with track_outbound("stripe"):
+            intent = stripe_sdk().PaymentIntent.retrieve(pi_id)
         if intent.status == "succeeded":
             result = handle_payment_success(intent)
             if result.get("success"):
@@ -409,10 +467,10 @@ def verify_payment_manual(payment_id):
             else:
                 return jsonify({"status": "error", "message": "Database update failed"}), 500
         else:
-            print(f"⏳ Intent status still: {intent.status}")
+            logger.debug("Intent status still: %s", intent.status)
             return jsonify({"status": intent.status, "message": f"Payment status is {intent.status}"}), 200
     except Exception as e:
-        print(f"❌ Verification Error: {str(e)}")
+        logger.exception("Verification Error: %s", e)
         return jsonify({"error": str(e)}), 500
 
 @payments_bp.route("/requests", methods=["GET"])
@@ -451,12 +509,13 @@ def get_organizer_earnings():
             }
         ), 200
     except Exception as e:
-        print(f"organizer-earnings: {e}")
+        logger.exception("organizer-earnings: %s", e)
         return jsonify({"total_earnings": 0.0, "currency": "PKR"}), 200
 
 
 @payments_bp.route("/events-with-payment-status", methods=["GET"])
 @jwt_required()
+@conditional("event", "payment", "user", "vendor_events", "vendor_completed_events")
 def get_events_with_payment_status():
     user_id = get_jwt_identity()
     uid = int(user_id)
@@ -475,11 +534,11 @@ def get_events_with_payment_status():
         )
     ).all()
     results = []
-    for event in events:
+    for event, event_dict in zip(events, Event.to_dicts(events)):
         cp = Payment.query.filter_by(event_id=event.id, status='completed').all()
         total_p = sum(p.amount for p in cp)
         
-        deposit_thresh = event.budget * 0.25
+        deposit_thresh = event.budget * ADVANCE_SHARE
         
         if total_p >= event.budget:
             status = "fully_paid"
@@ -491,7 +550,7 @@ def get_events_with_payment_status():
             status = "unpaid"
 
         results.append({
-            **event.to_dict(),
+            **event_dict,
             "deposit_amount": deposit_thresh,
             "vendor_payments_total": max(0, total_p - deposit_thresh),
             "payment_status": status,
@@ -512,7 +571,7 @@ def request_payment():
     event = Event.query.get(event_id)
     if not event:
         return jsonify({"error": "Event not found"}), 404
-    vendor = User.query.get(user_id)
+    vendor = load_current_user()
     if not vendor or vendor.role != "vendor":
         return jsonify({"error": "Only vendors can submit payment requests"}), 403
     if event not in vendor.assigned_events:
@@ -630,67 +689,19 @@ def register_vendor_payment():
     if event.user_id != current_user_id and event.organizer_id != current_user_id:
         return jsonify({"error": "Only event owner or organizer can register vendor payments"}), 403
 
-    agreement = EventVendorAgreement.query.filter_by(event_id=event_id, vendor_id=vendor_id).first()
-    if not agreement:
-        return jsonify({"error": "No vendor agreement found for this event-vendor. Set agreed price first."}), 404
-
-    advance_amt = round(agreement.agreed_price * 0.25, 2)
-    final_amt = round(agreement.agreed_price * 0.75, 2)
-
     try:
-        amount = float(amount)
-    except (TypeError, ValueError):
-        return jsonify({"error": "amount must be a number"}), 400
-
-    if payment_type == "advance":
-        if abs(amount - advance_amt) > 0.01:
-            return jsonify({"error": f"Advance must be exactly 25% (Rs. {advance_amt:,.2f})"}), 400
-        existing = Payment.query.filter_by(
-            event_id=event_id, vendor_id=vendor_id, payment_type="advance", status="completed"
-        ).first()
-        if existing:
-            return jsonify({"error": "Advance already paid for this vendor"}), 400
-    else:
-        if abs(amount - final_amt) > 0.01:
-            return jsonify({"error": f"Final must be exactly 75% (Rs. {final_amt:,.2f})"}), 400
-        advance_paid = Payment.query.filter_by(
-            event_id=event_id, vendor_id=vendor_id, payment_type="advance", status="completed"
-        ).first()
-        if not advance_paid:
-            return jsonify({"error": "Must pay advance (25%) before final payment"}), 400
-        existing_final = Payment.query.filter_by(
-            event_id=event_id, vendor_id=vendor_id, payment_type="final", status="completed"
-        ).first()
-        if existing_final:
-            return jsonify({"error": "Final payment already made for this vendor"}), 400
-
-    total_budget = float(event.budget)
-    current_spent = float(event.total_spent or 0)
-    if current_spent + amount > total_budget:
-        return jsonify({"error": "Payment would exceed event budget"}), 400
-
-    payment = Payment(
-        event_id=event_id,
-        vendor_id=vendor_id,
-        payment_type=payment_type,
-        amount=amount,
-        currency="PKR",
-        status="completed",
-        payment_method=payment_method,
-        payment_date=datetime.now(),
-        notes=notes or None,
-    )
-    db.session.add(payment)
-    db.session.flush()
-
-    if payment_type == "advance":
-        agreement.payment_status = "advance_paid"
-    else:
-        agreement.payment_status = "completed"
-
-    event.total_spent = current_spent + amount
-    event.remaining_budget = total_budget - event.total_spent
+        payments = settle_vendor_payments(
+            event,
+            [{"vendor_id": vendor_id, "payment_type": payment_type, "amount": amount}],
+            payment_method=payment_method,
+            notes=notes,
+        )
+    except PaymentTransitionError as e:
+        db.session.rollback()
+        return jsonify({"error": e.message}), e.status_code
     db.session.commit()
+    payment = payments[0]
+    amount = float(payment.amount)
 
     create_notification(
         vendor_id,
@@ -713,6 +724,68 @@ def register_vendor_payment():
     return jsonify(out), 201
 
 
+@payments_bp.route("/register/bulk", methods=["POST"])
+@jwt_required()
+def register_vendor_payments_bulk():
+    """
+    Settle many vendors for one event in a single transaction.
+    Body: { event_id, payment_method?, notes?, payments: [{ vendor_id, payment_type, amount, payment_method?, notes? }] }
+    All payments are rejected if any one of them is invalid. Returns the updated ledger.
+    """
+    current_user_id = int(get_jwt_identity())
+    data = request.get_json() or {}
+    event_id = data.get("event_id")
+    items = data.get("payments")
+    if not event_id or not isinstance(items, list) or not items:
+        return jsonify({"error": "event_id and a non-empty payments array required"}), 400
+    if not all(isinstance(i, dict) for i in items):
+        return jsonify({"error": "payments must be objects"}), 400
+
+    event = Event.query.get(event_id)
+    if not event:
+        return jsonify({"error": "Event not found"}), 404
+    if event.user_id != current_user_id and event.organizer_id != current_user_id:
+        return jsonify({"error": "Only event owner or organizer can register vendor payments"}), 403
+
+    agreements = load_agreements(event.id)
+    try:
+        payments = settle_vendor_payments(
+            event,
+            items,
+            payment_method=data.get("payment_method") or "bank_transfer",
+            notes=data.get("notes"),
+            agreements=agreements,
+        )
+    except PaymentTransitionError as e:
+        db.session.rollback()
+        return jsonify(e.to_dict()), e.status_code
+    db.session.commit()
+
+    for p in payments:
+        create_notification(
+            p.vendor_id,
+            "Payment Received",
+            f"Organizer registered {p.payment_type} payment of Rs. {float(p.amount):,.2f} for '{event.name}'.",
+            "payment",
+            {"event_id": event.id, "payment_id": p.id},
+        )
+
+    prompts = []
+    for p in payments:
+        if p.payment_type != "final":
+            continue
+        prompt = _prompt_vendor_review_after_final(event, current_user_id, int(p.vendor_id))
+        if prompt:
+            prompts.append(prompt)
+
+    return jsonify({
+        "message": f"Registered {len(payments)} payments",
+        "payments": [p.to_dict() for p in payments],
+        "ledger": build_event_ledger(event, agreements),
+        "prompt_vendor_reviews": prompts,
+    }), 201
+
+
 # --- ORGANIZER PAYMENT REQUESTS (Phase 3) ---
 
 @payments_bp.route("/organizer-request", methods=["POST"])
@@ -792,20 +865,20 @@ def reject_organizer_request(oid):
 
 @payments_bp.route("/notifications", methods=["GET"])
 @jwt_required()
+@conditional(extra=lambda: notifications_version(get_jwt_identity()))
 def get_notifications():
-    user_id = get_jwt_identity()
-    user_notifs = [n for n in demo_notifications if int(n['user_id']) == int(user_id)]
-    return jsonify({"notifications": user_notifs}), 200
+    return jsonify({"notifications": notifications_for_user(get_jwt_identity())}), 200
 
 @payments_bp.route("/notifications/<int:nid>/read", methods=["PUT"])
 @jwt_required()
 def mark_notification_read(nid):
-    user_id = get_jwt_identity()
-    for n in demo_notifications:
-        if int(n['id']) == int(nid) and int(n['user_id']) == int(user_id):
-            n['is_read'] = True
-            return jsonify({"message": "Marked as read"}), 200
-    return jsonify({"error": "Notification not found"}), 404
+    user_id = int(get_jwt_identity())
+    nid = int(nid)
+    found = any(int(n['id']) == nid and int(n['user_id']) == user_id for n in demo_notifications)
+    if not found:
+        return jsonify({"error": "Notification not found"}), 404
+    _mark_notifications_read(lambda n: int(n['id']) == nid and int(n['user_id']) == user_id)
+    return jsonify({"message": "Marked as read"}), 200
 
 @payments_bp.route("/notifications/clear-chat", methods=["PUT"])
 @jwt_required()
@@ -818,28 +891,20 @@ def clear_chat_notifications():
     if not sender_id:
         return jsonify({"error": "sender_id required"}), 400
         
-    count = 0
-    for n in demo_notifications:
-        # Match user_id as receiver, type 'chat', and extra_data.sender_id matches the param
-        if (int(n['user_id']) == user_id and 
-            n['type'] == 'chat' and 
-            n.get('extra_data') and 
-            int(n['extra_data'].get('sender_id')) == int(sender_id)):
-            if not n['is_read']:
-                n['is_read'] = True
-                count += 1
-                
+    # Match user_id as receiver, type 'chat', and extra_data.sender_id matches the param
+    count = _mark_notifications_read(
+        lambda n: int(n['user_id']) == user_id
+        and n['type'] == 'chat'
+        and n.get('extra_data')
+        and int(n['extra_data'].get('sender_id')) == int(sender_id)
+    )
     return jsonify({"message": f"Cleared {count} chat notifications"}), 200
 
 @payments_bp.route("/notifications/clear-all", methods=["PUT"])
 @jwt_required()
 def clear_all_notifications():
     user_id = int(get_jwt_identity())
-    count = 0
-    for n in demo_notifications:
-        if int(n['user_id']) == user_id and not n['is_read']:
-            n['is_read'] = True
-            count += 1
+    count = _mark_notifications_read(lambda n: int(n['user_id']) == user_id)
     return jsonify({"message": f"Cleared {count} notifications"}), 200
 
 
@@ -859,18 +924,18 @@ def mark_read_by_action():
             event_id_filter = int(event_id_filter)
         except (TypeError, ValueError):
             return jsonify({"error": "Invalid event_id"}), 400
-    count = 0
-    for n in demo_notifications:
+
+    def matches(n):
         if int(n['user_id']) != user_id:
-            continue
+            return False
         if not n.get('extra_data') or n['extra_data'].get('action') != action:
-            continue
+            return False
         if event_id_filter is not None:
             ed = n['extra_data'] or {}
             eid = ed.get("event_id")
             if eid is None or int(eid) != int(event_id_filter):
-                continue
-        if not n['is_read']:
-            n['is_read'] = True
-            count += 1
+                return False
+        return True
+
+    count = _mark_notifications_read(matches)
     return jsonify({"message": f"Marked {count} notifications as read"}), 200
\ No newline at end of file
@@ -1,8 +1,11 @@
+from collections import defaultdict
+
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from sqlalchemy import func, or_
 from sqlalchemy.exc import IntegrityError
 
+from app.current_user import current_identity
 from app.extensions import db
 from app.models import Event, User, Review, Payment, vendor_completed_events
 
@@ -10,44 +13,49 @@ reviews_bp = Blueprint("reviews", __name__, url_prefix="/api")
 
 REVIEW_TYPES = frozenset({"user_to_organizer", "organizer_to_vendor"})
 MAX_COMMENT_LEN = 2000
+REVIEW_STATUS_BATCH_MAX = 300
 
 
 def _uid():
     return int(get_jwt_identity())
 
 
-def _rating_summary_for_user(user_id: int):
-    """Aggregates where this user is the review subject."""
-    q_org = (
-        db.session.query(func.avg(Review.rating), func.count(Review.id))
-        .filter(
-            Review.subject_id == user_id,
-            Review.review_type == "user_to_organizer",
-            Review.status == "published",
-        )
-        .one()
-    )
-    q_vendor = (
-        db.session.query(func.avg(Review.rating), func.count(Review.id))
+def _empty_summary():
+    return {"organizer": {"avg": None, "count": 0}, "vendor": {"avg": None, "count": 0}}
+
+
+def rating_summary_query(user_ids):
+    """(subject_id, review_type, avg rating, count) of published reviews about ``user_ids``."""
+    return (
+        db.session.query(Review.subject_id, Review.review_type, func.avg(Review.rating), func.count(Review.id))
         .filter(
-            Review.subject_id == user_id,
-            Review.review_type == "organizer_to_vendor",
+            Review.subject_id.in_(user_ids),
+            Review.review_type.in_(REVIEW_TYPES),
             Review.status == "published",
         )
-        .one()
+        .group_by(Review.subject_id, Review.review_type)
     )
-    avg_o, cnt_o = q_org[0], q_org[1]
-    avg_v, cnt_v = q_vendor[0], q_vendor[1]
-    return {
-        "organizer": {
-            "avg": round(float(avg_o), 2) if avg_o is not None else None,
-            "count": int(cnt_o or 0),
-        },
-        "vendor": {
-            "avg": round(float(avg_v), 2) if avg_v is not None else None,
-            "count": int(cnt_v or 0),
-        },
-    }
+
+
+def rating_summaries(user_ids):
+    """{user_id: summary} where each user is the review subject; one grouped query for all ids."""
+    ids = {int(uid) for uid in user_ids}
+    out = {uid: _empty_summary() for uid in ids}
+    if not ids:
+        return out
+    rows = rating_summary_query(ids).all()
+    for subject_id, review_type, avg, count in rows:
+        key = "organizer" if review_type == "user_to_organizer" else "vendor"
+        out[subject_id][key] = {
+            "avg": round(float(avg), 2) if avg is not None else None,
+            "count": int(count or 0),
+        }
+    return out
+
+
+def _rating_summary_for_user(user_id: int):
+    """Aggregates where this user is the review subject."""
+    return rating_summaries([user_id])[int(user_id)]
 
 
 def _vendor_completed_for_event(event_id: int, vendor_id: int) -> bool:
@@ -164,49 +172,108 @@ def create_event_review(event_id):
     return jsonify({"message": "Review created", "review": review.to_dict()}), 201
 
 
+def review_statuses(author, events):
+    """
+    {event_id: review status} for what ``author`` (User or Identity) may / did review on
+    each event. Grouped queries over Review, vendor_completed_events and Payment, so the
+    cost does not grow per event.
+    """
+    out = {
+        e.id: {
+            "event_id": e.id,
+            "my_user_to_organizer": None,
+            "my_organizer_to_vendor": {},
+            "can_review_organizer": False,
+            "can_review_vendor_ids": [],
+        }
+        for e in events
+    }
+    owned = [e for e in events if author.role == "user" and e.user_id == author.id]
+    organized_ids = [e.id for e in events if author.role == "organizer" and e.organizer_id == author.id]
+    for e in owned:
+        out[e.id]["can_review_organizer"] = (
+            e.organizer_id is not None and e.organizer_status == "accepted" and e.status == "completed"
+        )
+
+    if owned:
+        review_type, scoped_ids = "user_to_organizer", [e.id for e in owned]
+    elif organized_ids:
+        review_type, scoped_ids = "organizer_to_vendor", organized_ids
+    else:
+        return out
+
+    reviews = Review.query.filter(
+        Review.event_id.in_(scoped_ids),
+        Review.author_id == author.id,
+        Review.review_type == review_type,
+    ).all()
+    for r in reviews:
+        if review_type == "user_to_organizer":
+            out[r.event_id]["my_user_to_organizer"] = r.to_dict()
+        else:
+            out[r.event_id]["my_organizer_to_vendor"][str(r.subject_id)] = r.to_dict()
+
+    if organized_ids:
+        # Same eligibility as create_event_review: vendor marked complete, or final payment settled
+        eligible = defaultdict(set)
+        completed = db.session.query(vendor_completed_events.c.event_id, vendor_completed_events.c.vendor_id).filter(
+            vendor_completed_events.c.event_id.in_(organized_ids)
+        )
+        paid = db.session.query(Payment.event_id, Payment.vendor_id).filter(
+            Payment.event_id.in_(organized_ids),
+            Payment.vendor_id.isnot(None),
+            Payment.status == "completed",
+            Payment.payment_type.in_(("final", "vendor_settlement")),
+        )
+        for event_id, vendor_id in completed.union(paid):
+            eligible[event_id].add(vendor_id)
+        for event_id in organized_ids:
+            out[event_id]["can_review_vendor_ids"] = sorted(eligible.get(event_id, ()))
+    return out
+
+
 @reviews_bp.route("/events/<int:event_id>/review-status", methods=["GET"])
 @jwt_required()
 def event_review_status(event_id):
     """What the current user has already submitted for this event (for UI)."""
-    author_id = _uid()
     event = Event.query.get(event_id)
     if not event:
         return jsonify({"error": "Event not found"}), 404
 
-    user_row = User.query.get(author_id)
-    if not user_row:
+    author = current_identity()
+    if not author:
         return jsonify({"error": "User not found"}), 404
 
-    out = {
-        "event_id": event_id,
-        "my_user_to_organizer": None,
-        "my_organizer_to_vendor": {},
-        "can_review_organizer": False,
-        "can_review_vendor_ids": [],
-    }
+    return jsonify(review_statuses(author, [event])[event.id]), 200
 
-    if user_row.role == "user" and event.user_id == author_id:
-        out["can_review_organizer"] = (
-            event.organizer_id is not None
-            and event.organizer_status == "accepted"
-            and event.status == "completed"
-        )
-        r = Review.query.filter_by(
-            event_id=event_id, author_id=author_id, review_type="user_to_organizer"
-        ).first()
-        if r:
-            out["my_user_to_organizer"] = r.to_dict()
 
-    if user_row.role == "organizer" and event.organizer_id == author_id:
-        completed_ids = [v.id for v in event.completed_by_vendors.all()]
-        out["can_review_vendor_ids"] = completed_ids
-        vendor_reviews = Review.query.filter_by(
-            event_id=event_id, author_id=author_id, review_type="organizer_to_vendor"
-        ).all()
-        for vr in vendor_reviews:
-            out["my_organizer_to_vendor"][str(vr.subject_id)] = vr.to_dict()
+@reviews_bp.route("/events/review-status", methods=["POST"])
+@jwt_required()
+def batch_event_review_status():
+    """Body: { "event_ids": [...] } (at most REVIEW_STATUS_BATCH_MAX). Unknown ids are listed in not_found."""
+    author = current_identity()
+    if not author:
+        return jsonify({"error": "User not found"}), 404
 
-    return jsonify(out), 200
+    data = request.get_json() or {}
+    ids = data.get("event_ids")
+    if not isinstance(ids, list):
+        return jsonify({"error": "event_ids must be a list"}), 400
+    if len(ids) > REVIEW_STATUS_BATCH_MAX:
+        return jsonify({"error": f"At most {REVIEW_STATUS_BATCH_MAX} event_ids per request"}), 400
+    try:
+        int_ids = list(dict.fromkeys(int(x) for x in ids))
+    except (TypeError, ValueError):
+        return jsonify({"error": "event_ids must be integers"}), 400
+
+    events = Event.query.filter(Event.id.in_(int_ids)).all() if int_ids else []
+    statuses = review_statuses(author, events)
+    return jsonify(
+        {
+            "statuses": {str(eid): status for eid, status in statuses.items()},
+            "not_found": [eid for eid in int_ids if eid not in statuses],
+        }
+    ), 200
 
 
 @reviews_bp.route("/users/<int:user_id>/reviews", methods=["GET"])
@@ -258,5 +325,5 @@ def batch_rating_summaries():
     except (TypeError, ValueError):
         return jsonify({"error": "user_ids must be integers"}), 400
 
-    summaries = {str(uid): _rating_summary_for_user(uid) for uid in int_ids}
+    summaries = {str(uid): summary for uid, summary in rating_summaries(int_ids).items()}
     return jsonify({"summaries": summaries}), 200
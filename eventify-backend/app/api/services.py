@@ -1,10 +1,25 @@
 # app/routes/services.py - FIXED IMPORTS
-from flask import Blueprint, request, jsonify
+import logging
+from flask import Blueprint, request, jsonify, current_app
 from app.extensions import db
 from app.models import Service, ServicePackage, User, Event  # ✅ Correct import
-import json
+from app.notification_fanout import publish_service_change
+from app.utils.pagination import decode_cursor, encode_cursor, parse_limit
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import contains_eager, selectinload
 
 services_bp = Blueprint('services', __name__)
+logger = logging.getLogger(__name__)
+
+
+def _as_list(value):
+    """Normalize availability / portfolioImages / features payloads for JSON columns."""
+    if value is None or value == '':
+        return []
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
 
 # ✅ Get all services for a vendor
 @services_bp.route('/api/vendor/services', methods=['GET'])
@@ -19,15 +34,77 @@ def get_vendor_services():
         return jsonify([service.to_dict() for service in services])
     
     except Exception as e:
-        print("❌ Error fetching services:", str(e))
+        logger.exception("Error fetching services: %s", e)
         return jsonify({"error": "Internal server error"}), 500
 
+# ✅ Public catalog across vendors (filters + keyset pagination)
+@services_bp.route('/api/services/catalog', methods=['GET'])
+def get_service_catalog():
+    """
+    Active services ordered by (basePrice, id).
+    Query: category, eventType, city, min_price, max_price, limit (<=100), cursor.
+    One query for services + vendor, one selectin query for packages.
+    """
+    args = request.args
+    try:
+        min_price = float(args['min_price']) if args.get('min_price') else None
+        max_price = float(args['max_price']) if args.get('max_price') else None
+        cursor = decode_cursor(args.get('cursor'), 2)
+        if cursor:
+            cursor = float(cursor[0]), int(cursor[1])
+    except (TypeError, ValueError):
+        return jsonify({"error": "min_price, max_price and cursor must be valid"}), 400
+    limit = parse_limit(args.get('limit'))
+
+    q = (
+        Service.query.join(Service.vendor)
+        .options(contains_eager(Service.vendor), selectinload(Service.packages))
+        .filter(Service.is_active == True, User.is_active.isnot(False))  # noqa: E712
+    )
+    category = (args.get('category') or '').strip()
+    event_type = (args.get('eventType') or args.get('event_type') or '').strip()
+    city = (args.get('city') or '').strip()
+    if category:
+        q = q.filter(Service.category == category)
+    if event_type:
+        q = q.filter(Service.event_type == event_type)
+    if city:
+        q = q.filter(func.lower(User.city) == city.lower())
+    if min_price is not None:
+        q = q.filter(Service.base_price >= min_price)
+    if max_price is not None:
+        q = q.filter(Service.base_price <= max_price)
+    if cursor:
+        last_price, last_id = cursor
+        q = q.filter(
+            or_(
+                Service.base_price > last_price,
+                and_(Service.base_price == last_price, Service.id > last_id),
+            )
+        )
+
+    rows = q.order_by(Service.base_price.asc(), Service.id.asc()).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    services = []
+    for svc in rows:
+        item = svc.to_dict()
+        item["vendor"] = {"id": svc.vendor.id, "name": svc.vendor.name, "city": svc.vendor.city}
+        services.append(item)
+
+    return jsonify({
+        "services": services,
+        "next_cursor": encode_cursor([rows[-1].base_price, rows[-1].id]) if has_more else None,
+    })
+
+
 # ✅ Create new service - FIXED VERSION
 @services_bp.route('/api/vendor/services', methods=['POST'])
 def create_service():
     try:
         data = request.get_json()
-        print("📦 Received service data:", data)
+        logger.debug("Received service data: %s", data)
         
         if not data:
             return jsonify({"error": "No JSON data received"}), 400
@@ -54,14 +131,14 @@ def create_service():
             base_price=base_price,
             description=data.get('description', ''),
             location=data.get('location', ''),
-            availability=str(data.get('availability', [])),
-            portfolio_images=str(data.get('portfolioImages', [])),
+            availability=_as_list(data.get('availability')),
+            portfolio_images=_as_list(data.get('portfolioImages')),
             is_active=data.get('isActive', True)
         )
         
         db.session.add(service)
         db.session.flush()  # Get service ID without committing
-        print(f"✅ Service created with ID: {service.id}")
+        logger.info("Service created with ID: %s", service.id)
         
         # Create packages if provided
         packages_data = data.get('packages', [])
@@ -72,34 +149,23 @@ def create_service():
                     package_name=pkg_data.get('packageName', 'Basic Package'),
                     price=float(pkg_data.get('price', 0)),
                     duration=pkg_data.get('duration', ''),
-                    features=str(pkg_data.get('features', []))
+                    features=_as_list(pkg_data.get('features'))
                 )
                 db.session.add(package)
-                print(f"📋 Package added: {package.package_name}")
+                logger.debug("Package added: %s", package.package_name)
             except Exception as pkg_error:
-                print(f"❌ Error creating package: {pkg_error}")
+                logger.exception("Error creating package: %s", pkg_error)
                 continue
         
         # Commit everything
         db.session.commit()
-        print("✅ Service and packages saved to database")
+        logger.debug("Service and packages saved to database")
         
-        # Notify Organizers linked to this vendor
+        # Notify Organizers linked to this vendor (coalesced in the background)
         try:
-            from app.api.payments import create_notification
-            vendor = User.query.get(vendor_id)
-            if vendor:
-                organizer_ids = set([event.user_id for event in vendor.assigned_events])
-                for org_id in organizer_ids:
-                    create_notification(
-                        org_id,
-                        "🆕 New Service Added",
-                        f"Vendor '{vendor.name}' added a new service: {service.name}",
-                        "service_update",
-                        {"vendor_id": vendor_id}
-                    )
+            publish_service_change(current_app._get_current_object(), vendor_id, service.id, service.name, "created")
         except Exception as e:
-            print(f"❌ Notification failed: {e}")
+            logger.warning("Notification failed: %s", e)
         
         return jsonify({
             "message": "Service created successfully", 
@@ -108,7 +174,7 @@ def create_service():
         
     except Exception as e:
         db.session.rollback()
-        print("❌ Error creating service:", str(e))
+        logger.exception("Error creating service: %s", e)
         return jsonify({"error": f"Failed to create service: {str(e)}"}), 500
 
 # ✅ Update service - FIXED VERSION
@@ -121,7 +187,7 @@ def update_service(service_id):
         if not data:
             return jsonify({"error": "No JSON data received"}), 400
             
-        print(f"🔄 Updating service {service_id} with data:", data)
+        logger.debug("Updating service %s with data: %s", service_id, data)
         
         # Update service fields
         service.name = data.get('name', service.name)
@@ -130,13 +196,13 @@ def update_service(service_id):
         service.base_price = float(data.get('basePrice', service.base_price))
         service.description = data.get('description', service.description)
         service.location = data.get('location', service.location)
-        service.availability = str(data.get('availability', service.availability))
-        service.portfolio_images = str(data.get('portfolioImages', service.portfolio_images))
+        service.availability = _as_list(data.get('availability', service.availability))
+        service.portfolio_images = _as_list(data.get('portfolioImages', service.portfolio_images))
         service.is_active = data.get('isActive', service.is_active)
         
         # Delete old packages
         ServicePackage.query.filter_by(service_id=service_id).delete()
-        print(f"🗑️ Deleted old packages for service {service_id}")
+        logger.debug("Deleted old packages for service %s", service_id)
         
         # Add new packages
         packages_data = data.get('packages', [])
@@ -147,32 +213,23 @@ def update_service(service_id):
                     package_name=pkg_data.get('packageName', ''),
                     price=float(pkg_data.get('price', 0)),
                     duration=pkg_data.get('duration', ''),
-                    features=str(pkg_data.get('features', []))
+                    features=_as_list(pkg_data.get('features'))
                 )
                 db.session.add(package)
-                print(f"📋 Added package: {package.package_name}")
+                logger.debug("Added package: %s", package.package_name)
             except Exception as pkg_error:
-                print(f"❌ Error creating package: {pkg_error}")
+                logger.exception("Error creating package: %s", pkg_error)
                 continue
         
         db.session.commit()
         
-        # Notify Organizers linked to this vendor
+        # Notify Organizers linked to this vendor (coalesced in the background)
         try:
-            from app.api.payments import create_notification
-            vendor = User.query.get(service.vendor_id)
-            if vendor:
-                organizer_ids = set([event.user_id for event in vendor.assigned_events])
-                for org_id in organizer_ids:
-                    create_notification(
-                        org_id,
-                        "📝 Service Updated",
-                        f"Vendor '{vendor.name}' updated their service: {service.name}",
-                        "service_update",
-                        {"vendor_id": service.vendor_id}
-                    )
+            publish_service_change(
+                current_app._get_current_object(), service.vendor_id, service.id, service.name, "updated"
+            )
         except Exception as e:
-            print(f"❌ Notification failed: {e}")
+            logger.warning("Notification failed: %s", e)
             
         return jsonify({
             "message": "Service updated successfully", 
@@ -181,7 +238,7 @@ def update_service(service_id):
         
     except Exception as e:
         db.session.rollback()
-        print("❌ Error updating service:", str(e))
+        logger.exception("Error updating service: %s", e)
         return jsonify({"error": f"Failed to update service: {str(e)}"}), 500
 
 # ✅ Delete service
@@ -191,12 +248,12 @@ def delete_service(service_id):
         service = Service.query.get_or_404(service_id)
         db.session.delete(service)
         db.session.commit()
-        print(f"🗑️ Service {service_id} deleted successfully")
+        logger.info("Service %s deleted successfully", service_id)
         return jsonify({"message": "Service deleted successfully"})
         
     except Exception as e:
         db.session.rollback()
-        print("❌ Error deleting service:", str(e))
+        logger.exception("Error deleting service: %s", e)
         return jsonify({"error": str(e)}), 500
 
 # ✅ Toggle service status
@@ -208,7 +265,7 @@ def toggle_service_status(service_id):
         db.session.commit()
         
         status = "active" if service.is_active else "inactive"
-        print(f"🔄 Service {service_id} status toggled to: {status}")
+        logger.info("Service %s status toggled to: %s", service_id, status)
         
         return jsonify({
             "message": "Service status updated", 
@@ -217,7 +274,7 @@ def toggle_service_status(service_id):
         
     except Exception as e:
         db.session.rollback()
-        print("❌ Error toggling service status:", str(e))
+        logger.exception("Error toggling service status: %s", e)
         return jsonify({"error": str(e)}), 500
 
     
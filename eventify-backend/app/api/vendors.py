@@ -1,3 +1,4 @@
+import logging
 from datetime import datetime
 
 from flask import Blueprint, request, jsonify
@@ -16,17 +17,22 @@ from app.models import (
     get_reserving_vendor_id_for_event,
 )
 from app.extensions import jwt
+from app.conditional import conditional
+from app.current_user import current_identity, load_current_user
+from app.fragment_cache import touch
 
 vendors_bp = Blueprint("vendors", __name__, url_prefix="/api/vendors")
+logger = logging.getLogger(__name__)
 
 
 # ✅ Get all vendors
 @vendors_bp.route("", methods=["GET"])
 @jwt_required()
+@conditional("user", "event", "vendor_events", "vendor_completed_events", "vendor_event_verification", "review")
 def get_vendors():
     try:
         current_user_id = int(get_jwt_identity())
-        current_user = User.query.get(current_user_id)
+        current_user = current_identity()
         if not current_user:
             return jsonify({"error": "User not found"}), 404
 
@@ -116,7 +122,7 @@ def get_vendors():
             })
         return jsonify(vendor_list), 200
     except Exception as e:
-        print(f"❌ Error fetching vendors: {str(e)}")
+        logger.exception("Error fetching vendors: %s", e)
         return jsonify({"error": "Internal server error"}), 500
 
 
@@ -136,7 +142,7 @@ def assign_vendor():
             return jsonify({"error": "Vendor or event not found"}), 404
 
         current_user_id = int(get_jwt_identity())
-        user = User.query.get(current_user_id)
+        user = current_identity()
         
         if event.organizer_id != current_user_id:
             return jsonify({
@@ -195,6 +201,7 @@ def assign_vendor():
                     partnership_status="pending",
                 )
             )
+        touch(Event, [event_id])  # partnership_pending_count changed
         db.session.commit()
         # Refresh relationship cache
         db.session.expire(vendor)
@@ -209,7 +216,7 @@ def assign_vendor():
                 {"event_id": event_id, "type": "partnership_request"},
             )
         except Exception as e:
-            print(f"Partnership request notification failed: {e}")
+            logger.warning("Partnership request notification failed: %s", e)
 
         return jsonify({
             "message": f"Partnership request sent to {vendor.name} for “{event.name}”.",
@@ -217,7 +224,7 @@ def assign_vendor():
         }), 200
 
     except Exception as e:
-        print(f"❌ Error assigning vendor: {str(e)}")
+        logger.exception("Error assigning vendor: %s", e)
         db.session.rollback()
         return jsonify({"error": "Internal server error"}), 500
 
@@ -232,7 +239,7 @@ def accept_partnership():
         if not event_id:
             return jsonify({"error": "event_id is required"}), 400
         current_user_id = int(get_jwt_identity())
-        vendor = User.query.get(current_user_id)
+        vendor = current_identity()
         if not vendor or vendor.role != "vendor":
             return jsonify({"error": "Only vendor accounts can accept a partnership request"}), 403
 
@@ -255,6 +262,7 @@ def accept_partnership():
             )
             .values(partnership_status="accepted", partnership_confirmed_at=now)
         )
+        touch(Event, [event.id])
         if event.status == "advance_payment_completed":
             event.status = "vendor_assigned"
         db.session.commit()
@@ -270,7 +278,7 @@ def accept_partnership():
                     {"event_id": event_id, "vendor_id": current_user_id},
                 )
         except Exception as e:
-            print(f"Accept partnership notification: {e}")
+            logger.warning("Accept partnership notification: %s", e)
         return jsonify({
             "message": "Partnership confirmed. You are now connected to this event.",
             "partnership_status": "accepted",
@@ -278,7 +286,7 @@ def accept_partnership():
         }), 200
     except Exception as e:
         db.session.rollback()
-        print(f"accept_partnership: {e}")
+        logger.exception("accept_partnership: %s", e)
         return jsonify({"error": "Internal server error"}), 500
 
 
@@ -292,7 +300,7 @@ def decline_partnership():
         if not event_id:
             return jsonify({"error": "event_id is required"}), 400
         current_user_id = int(get_jwt_identity())
-        vendor = User.query.get(current_user_id)
+        vendor = current_identity()
         if not vendor or vendor.role != "vendor":
             return jsonify({"error": "Only vendor accounts can decline a partnership request"}), 403
         if get_vendor_event_partnership_status(current_user_id, int(event_id)) != "pending":
@@ -312,6 +320,7 @@ def decline_partnership():
             )
             .values(partnership_status="rejected", partnership_confirmed_at=now)
         )
+        touch(Event, [event.id])
         db.session.commit()
         try:
             from app.api.payments import create_notification
@@ -324,11 +333,11 @@ def decline_partnership():
                     {"event_id": int(event_id), "vendor_id": current_user_id},
                 )
         except Exception as e:
-            print(f"Decline partnership notification: {e}")
+            logger.warning("Decline partnership notification: %s", e)
         return jsonify({"message": "Partnership request declined", "event_id": int(event_id)}), 200
     except Exception as e:
         db.session.rollback()
-        print(f"decline_partnership: {e}")
+        logger.exception("decline_partnership: %s", e)
         return jsonify({"error": "Internal server error"}), 500
 
 
@@ -368,7 +377,7 @@ def unassign_vendor():
                     {"event_id": event_id}
                 )
             except Exception as e:
-                print(f"Unassign notification failed: {e}")
+                logger.warning("Unassign notification failed: %s", e)
                 
             return jsonify({
                 "message": f"✅ Vendor '{vendor.name}' unassigned from '{event.name}'",
@@ -378,7 +387,7 @@ def unassign_vendor():
             return jsonify({"error": "Vendor is not assigned to this event"}), 400
 
     except Exception as e:
-        print(f"❌ Error unassigning vendor: {str(e)}")
+        logger.exception("Error unassigning vendor: %s", e)
         db.session.rollback()
         return jsonify({"error": "Internal server error"}), 500
     
@@ -558,10 +567,10 @@ def mark_event_completed(event_id):
     """Mark an event as completed by vendor"""
     try:
         current_user_id = get_jwt_identity()
-        print(f"🔄 Marking event {event_id} as completed by vendor {current_user_id}")
+        logger.debug("Marking event %s as completed by vendor %s", event_id, current_user_id)
         
         # Get the vendor
-        vendor = User.query.get(current_user_id)
+        vendor = load_current_user()
         if not vendor:
             return jsonify({"error": "Vendor not found"}), 404
         
@@ -599,9 +608,9 @@ def mark_event_completed(event_id):
                 {"event_id": event.id, "vendor_id": vendor.id, "action": "vendor_work_verification"}
             )
         except Exception as e:
-            print(f"Completion notification failed: {e}")
+            logger.warning("Completion notification failed: %s", e)
         
-        print(f"✅ Event {event_id} marked as completed for vendor {current_user_id}")
+        logger.info("Event %s marked as completed for vendor %s", event_id, current_user_id)
         
         return jsonify({
             "message": "Event marked as completed successfully",
@@ -612,7 +621,7 @@ def mark_event_completed(event_id):
         
     except Exception as e:
         db.session.rollback()
-        print(f"❌ Error marking event as completed: {str(e)}")
+        logger.exception("Error marking event as completed: %s", e)
         return jsonify({"error": str(e)}), 500
 
 
@@ -665,7 +674,7 @@ def verify_vendor_work(event_id, vendor_id):
                 {"event_id": event_id, "vendor_id": vendor_id},
             )
         except Exception as e:
-            print(f"Verify notification failed: {e}")
+            logger.warning("Verify notification failed: %s", e)
 
         return jsonify({
             "message": "Vendor work verified successfully",
@@ -733,5 +742,5 @@ def get_available_vendors():
             for v in vendors
         ]), 200
     except Exception as e:
-        print(f"❌ Error fetching available vendors: {str(e)}")
+        logger.exception("Error fetching available vendors: %s", e)
         return jsonify({"error": "Internal server error"}), 500
\ No newline at end of file
@@ -0,0 +1,100 @@
+"""Maintained unread counters behind the chat and notification badges.
+
+``chat_unread_counter`` holds unread messages per (receiver, event) and
+``user_badge_counter.chat_unread`` the receiver's total. ``send_message`` adds to both
+in the same transaction as the message; mark-read subtracts what its UPDATE touched,
+so reading a badge is a primary-key lookup instead of a COUNT over chat_message.
+``rebuild_chat_counters`` recomputes everything from chat_message (backfill / repair).
+
+Notifications are kept in memory (app.api.payments), so their unread totals live next
+to that list, under the same lock.
+"""
+from __future__ import annotations
+
+from sqlalchemy import case, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.extensions import db
+from app.models import ChatMessage, ChatUnreadCounter, UserBadgeCounter
+from app.utils.bulk import bulk_delete, bulk_update
+
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def _clamped(column, delta: int):
+    return case((column + delta > 0, column + delta), else_=0)
+
+
+def _add(model, key: dict, column_name: str, delta: int) -> None:
+    """``column += delta`` on the row at ``key`` (never below 0), creating the row when adding."""
+    column = getattr(model, column_name)
+    criteria = [getattr(model, k) == v for k, v in key.items()]
+    if delta <= 0:
+        bulk_update(model, {column: _clamped(column, delta)}, *criteria)
+        return
+    upsert = _UPSERT_INSERTS.get(db.session.get_bind().dialect.name)
+    if upsert is not None:
+        stmt = upsert(model).values(**key, **{column_name: delta})
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key),
+            set_={column_name: model.__table__.c[column_name] + delta},
+        )
+        db.session.execute(stmt)
+        return
+    if not bulk_update(model, {column: column + delta}, *criteria):
+        db.session.execute(insert(model).values(**key, **{column_name: delta}))
+
+
+def record_chat_message(receiver_id: int, event_id: int) -> None:
+    """A message to ``receiver_id`` was added in the current transaction."""
+    receiver_id, event_id = int(receiver_id), int(event_id)
+    _add(ChatUnreadCounter, {"user_id": receiver_id, "event_id": event_id}, "count", 1)
+    _add(UserBadgeCounter, {"user_id": receiver_id}, "chat_unread", 1)
+
+
+def record_chat_read(receiver_id: int, event_id: int, marked: int) -> None:
+    """``marked`` messages in this event were just flipped to read for ``receiver_id``."""
+    if marked <= 0:
+        return
+    receiver_id, event_id = int(receiver_id), int(event_id)
+    _add(ChatUnreadCounter, {"user_id": receiver_id, "event_id": event_id}, "count", -marked)
+    _add(UserBadgeCounter, {"user_id": receiver_id}, "chat_unread", -marked)
+
+
+def chat_unread_total(user_id: int) -> int:
+    row = db.session.get(UserBadgeCounter, int(user_id))
+    return row.chat_unread if row else 0
+
+
+def chat_unread_by_event(user_id: int, event_ids=None) -> dict:
+    """{event_id: unread} for the user, optionally limited to ``event_ids``; zero rows omitted."""
+    query = db.session.query(ChatUnreadCounter.event_id, ChatUnreadCounter.count).filter(
+        ChatUnreadCounter.user_id == int(user_id), ChatUnreadCounter.count > 0
+    )
+    if event_ids is not None:
+        event_ids = [int(e) for e in event_ids]
+        if not event_ids:
+            return {}
+        query = query.filter(ChatUnreadCounter.event_id.in_(event_ids))
+    return {event_id: count for event_id, count in query}
+
+
+def rebuild_chat_counters() -> None:
+    """Recompute both chat tables from chat_message; the caller commits."""
+    bulk_delete(ChatUnreadCounter)
+    bulk_delete(UserBadgeCounter)
+    unread = ChatMessage.is_read.is_(False)
+    db.session.execute(
+        insert(ChatUnreadCounter).from_select(
+            ["user_id", "event_id", "count"],
+            select(ChatMessage.receiver_id, ChatMessage.event_id, func.count())
+            .where(unread)
+            .group_by(ChatMessage.receiver_id, ChatMessage.event_id),
+        )
+    )
+    db.session.execute(
+        insert(UserBadgeCounter).from_select(
+            ["user_id", "chat_unread"],
+            select(ChatMessage.receiver_id, func.count()).where(unread).group_by(ChatMessage.receiver_id),
+        )
+    )
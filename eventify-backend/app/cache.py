@@ -0,0 +1,501 @@
+"""Cross-request cache with TTLs, tag invalidation and stampede protection.
+
+``cache`` (app/extensions.py) fronts one backend per app, picked by ``CACHE_BACKEND``:
+
+- ``memory``: a per-process LRU of ``CACHE_MAX_ENTRIES`` entries. With several
+  workers, each one has its own copy and invalidations stay in that process.
+- ``redis``: any Redis-compatible server at ``REDIS_URL``. The client comes from
+  app/providers.py.
+- ``sqlite``: a file at ``CACHE_SQLITE_PATH``, shared by the workers of one host.
+
+Entries expire after ``ttl`` seconds (``CACHE_DEFAULT_TTL`` when omitted). The
+shared backends pickle values, while ``memory`` returns the stored object itself.
+
+Tags: ``set(key, value, tags=("event:42", "user:7"))`` records each tag's
+version, and ``invalidate_tags("event:42")`` bumps it. Every entry carrying the
+tag then misses, in every worker using the backend. A tag version that is
+missing (evicted, expired or never written) is created from the clock, so
+losing one can only cause misses.
+
+Database writes invalidate tags when they commit:
+
+- ``<table>:<id>`` for every row the session updated or deleted
+- ``<table>`` for every table written, including inserts, bulk statements and
+  many-to-many link tables
+
+Tags collected by a transaction that rolls back are dropped.
+
+``get_or_set(key, producer)`` computes a missing value once. Threads of one
+process wait on a per-key lock. On the shared backends, the first process takes
+a lock entry for ``CACHE_LOCK_TIMEOUT`` seconds, and the others poll for its
+value. If the holder takes longer than that, they compute the value
+themselves.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect
+
+from app.db_routing import RoutingSession
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+_POLL_SECONDS = 0.05
+
+
+def _fresh_version() -> int:
+    return time.time_ns()
+
+
+class MemoryBackend:
+    shared = False
+
+    def __init__(self, max_entries=10_000, max_versions=100_000):
+        self.max_entries = max_entries
+        self.max_versions = max_versions
+        self._entries = OrderedDict()  # key -> (monotonic deadline or None, value)
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key, now):
+        hit = self._entries.get(key)
+        if hit is None:
+            return _MISSING
+        if hit[0] is not None and hit[0] <= now:
+            del self._entries[key]
+            return _MISSING
+        self._entries.move_to_end(key)
+        return hit[1]
+
+    def get_many(self, keys):
+        now = time.monotonic()
+        with self._lock:
+            return [self._live(key, now) for key in keys]
+
+    def _store(self, key, value, ttl):
+        self._entries[key] = (time.monotonic() + ttl if ttl else None, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def add(self, key, value, ttl=None) -> bool:
+        with self._lock:
+            if self._live(key, time.monotonic()) is not _MISSING:
+                return False
+            self._store(key, value, ttl)
+            return True
+
+    def delete(self, keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def versions(self, keys):
+        with self._lock:
+            if len(self._versions) > self.max_versions:
+                self._versions.clear()
+            return [self._versions.setdefault(key, _fresh_version()) for key in keys]
+
+    def bump(self, keys):
+        with self._lock:
+            for key in keys:
+                self._versions[key] = self._versions.get(key, _fresh_version()) + 1
+
+    def clear(self, prefix=""):
+        with self._lock:
+            for store in (self._entries, self._versions):
+                for key in [k for k in store if k.startswith(prefix)]:
+                    del store[key]
+
+
+class RedisBackend:
+    shared = True
+
+    def __init__(self, client, version_ttl=86_400):
+        self._client = client
+        self.version_ttl = int(version_ttl)
+
+    @staticmethod
+    def _px(ttl):
+        return max(1, int(ttl * 1000)) if ttl else None
+
+    def get_many(self, keys):
+        return [_MISSING if raw is None else pickle.loads(raw) for raw in self._client.mget(keys)]
+
+    def set(self, key, value, ttl=None):
+        self._client.set(key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), px=self._px(ttl))
+
+    def add(self, key, value, ttl=None) -> bool:
+        return bool(self._client.set(key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), nx=True, px=self._px(ttl)))
+
+    def delete(self, keys):
+        if keys:
+            self._client.delete(*keys)
+
+    def versions(self, keys):
+        pipe = self._client.pipeline(transaction=False)
+        fresh = _fresh_version()
+        for key in keys:
+            pipe.set(key, fresh, nx=True, ex=self.version_ttl)
+        pipe.mget(keys)
+        return [int(v) for v in pipe.execute()[-1]]
+
+    def bump(self, keys):
+        pipe = self._client.pipeline(transaction=False)
+        fresh = _fresh_version()
+        for key in keys:
+            pipe.set(key, fresh, nx=True, ex=self.version_ttl)
+            pipe.incr(key)
+        pipe.execute()
+
+    def clear(self, prefix=""):
+        batch = []
+        for key in self._client.scan_iter(match=f"{prefix}*", count=500):
+            batch.append(key)
+            if len(batch) >= 500:
+                self._client.delete(*batch)
+                batch = []
+        if batch:
+            self._client.delete(*batch)
+
+
+class SQLiteBackend:
+    """Entries and tag versions in one SQLite file; one connection per thread and process."""
+
+    shared = True
+    _PURGE_EVERY = 1000  # sets between sweeps of expired rows
+    _CHUNK = 500  # keys per IN (...) statement
+
+    def __init__(self, path, timeout=5.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._sets = 0
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entry (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS cache_version (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            # autocommit; a forked child opens its own connection
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _chunks(self, keys):
+        keys = list(keys)
+        for start in range(0, len(keys), self._CHUNK):
+            chunk = keys[start:start + self._CHUNK]
+            yield chunk, ",".join("?" * len(chunk))
+
+    def get_many(self, keys):
+        now = time.time()
+        found = {}
+        for chunk, marks in self._chunks(keys):
+            rows = self._conn().execute(
+                f"SELECT key, value FROM cache_entry WHERE key IN ({marks}) AND (expires_at IS NULL OR expires_at > ?)",
+                (*chunk, now),
+            )
+            found.update((key, pickle.loads(value)) for key, value in rows)
+        return [found.get(key, _MISSING) for key in keys]
+
+    def set(self, key, value, ttl=None):
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_entry (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), now + ttl if ttl else None),
+        )
+        self._sets += 1
+        if self._sets % self._PURGE_EVERY == 0:
+            conn.execute("DELETE FROM cache_entry WHERE expires_at <= ?", (now,))
+
+    def add(self, key, value, ttl=None) -> bool:
+        now = time.time()
+        cursor = self._conn().execute(
+            "INSERT INTO cache_entry (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at "
+            "WHERE cache_entry.expires_at IS NOT NULL AND cache_entry.expires_at <= ?",
+            (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), now + ttl if ttl else None, now),
+        )
+        return cursor.rowcount == 1
+
+    def delete(self, keys):
+        for chunk, marks in self._chunks(keys):
+            self._conn().execute(f"DELETE FROM cache_entry WHERE key IN ({marks})", chunk)
+
+    def _select_versions(self, conn, keys):
+        found = {}
+        for chunk, marks in self._chunks(keys):
+            found.update(conn.execute(f"SELECT key, value FROM cache_version WHERE key IN ({marks})", chunk))
+        return found
+
+    def versions(self, keys):
+        # a plain read for known tags; only missing ones take the write lock, once
+        conn = self._conn()
+        found = self._select_versions(conn, keys)
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        if missing:
+            fresh = _fresh_version()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO cache_version (key, value) VALUES (?, ?)", [(k, fresh) for k in missing]
+                )
+                found.update(self._select_versions(conn, missing))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return [found[key] for key in keys]
+
+    def bump(self, keys):
+        fresh = _fresh_version()
+        self._conn().executemany(
+            "INSERT INTO cache_version (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = cache_version.value + 1",
+            [(key, fresh + 1) for key in keys],
+        )
+
+    def clear(self, prefix=""):
+        conn = self._conn()
+        for table in ("cache_entry", "cache_version"):
+            conn.execute(f"DELETE FROM {table} WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+
+
+def make_backend(config):
+    name = (config.get("CACHE_BACKEND") or "memory").lower()
+    if name == "memory":
+        return MemoryBackend(int(config.get("CACHE_MAX_ENTRIES", 10_000)))
+    if name == "redis":
+        from app.providers import get
+
+        client = get("redis")
+        if client is None:
+            raise RuntimeError("CACHE_BACKEND=redis needs REDIS_URL")
+        return RedisBackend(client)
+    if name == "sqlite":
+        return SQLiteBackend(config["CACHE_SQLITE_PATH"])
+    raise ValueError(f"Unknown CACHE_BACKEND {name!r} (memory, redis or sqlite)")
+
+
+class _AppCache:
+    def __init__(self, backend, prefix, default_ttl, lock_timeout):
+        self.backend = backend
+        self.prefix = prefix
+        self.default_ttl = default_ttl
+        self.lock_timeout = lock_timeout
+
+
+_key_locks = {}  # key -> [lock, users]
+_key_locks_guard = threading.Lock()
+
+
+@contextmanager
+def _key_lock(key):
+    with _key_locks_guard:
+        slot = _key_locks.setdefault(key, [threading.Lock(), 0])
+        slot[1] += 1
+    try:
+        with slot[0]:
+            yield
+    finally:
+        with _key_locks_guard:
+            slot[1] -= 1
+            if not slot[1]:
+                _key_locks.pop(key, None)
+
+
+class Cache:
+    """Flask extension; every method acts on the current app's backend. Backend errors read as misses."""
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        config = app.config
+        if (config.get("CACHE_BACKEND") or "").lower() == "sqlite" and not config.get("CACHE_SQLITE_PATH"):
+            os.makedirs(app.instance_path, exist_ok=True)
+            config["CACHE_SQLITE_PATH"] = os.path.join(app.instance_path, "cache.sqlite")
+        app.extensions["cache"] = _AppCache(
+            make_backend(config),
+            config.get("CACHE_KEY_PREFIX", ""),
+            float(config.get("CACHE_DEFAULT_TTL", 300) or 0),
+            float(config.get("CACHE_LOCK_TIMEOUT", 10) or 0),
+        )
+
+    @staticmethod
+    def _app_cache():
+        return current_app.extensions["cache"]
+
+    @property
+    def shared(self) -> bool:
+        """True when other workers see the same entries (redis / sqlite)."""
+        return self._app_cache().backend.shared
+
+    def _tag_keys(self, state, tags):
+        return [f"{state.prefix}tag:{tag}" for tag in tags]
+
+    def _lookup(self, state, key):
+        try:
+            entry = state.backend.get_many([state.prefix + key])[0]
+            if entry is _MISSING:
+                return _MISSING
+            value, tags, versions = entry
+            if tags and tuple(state.backend.versions(self._tag_keys(state, tags))) != versions:
+                return _MISSING
+            return value
+        except Exception as ex:
+            logger.warning("cache get %s failed: %s", key, ex)
+            return _MISSING
+
+    def _store(self, state, key, value, ttl, tags, versions=None):
+        tags = tuple(tags)
+        try:
+            if versions is None:
+                versions = tuple(state.backend.versions(self._tag_keys(state, tags))) if tags else ()
+            state.backend.set(state.prefix + key, (value, tags, versions), state.default_ttl if ttl is None else ttl)
+        except Exception as ex:
+            logger.warning("cache set %s failed: %s", key, ex)
+
+    def get(self, key, default=None):
+        value = self._lookup(self._app_cache(), key)
+        return default if value is _MISSING else value
+
+    def set(self, key, value, ttl=None, tags=()) -> None:
+        """``ttl`` in seconds (default ``CACHE_DEFAULT_TTL``; 0 = until evicted or invalidated)."""
+        self._store(self._app_cache(), key, value, ttl, tags)
+
+    def delete(self, *keys) -> None:
+        state = self._app_cache()
+        try:
+            state.backend.delete([state.prefix + key for key in keys])
+        except Exception as ex:
+            logger.warning("cache delete failed: %s", ex)
+
+    def invalidate_tags(self, *tags) -> None:
+        """Every entry stored with one of ``tags`` misses from now on."""
+        if not tags:
+            return
+        state = self._app_cache()
+        try:
+            state.backend.bump(self._tag_keys(state, sorted(set(tags))))
+        except Exception as ex:
+            logger.warning("cache tag invalidation failed: %s", ex)
+
+    def get_or_set(self, key, producer, ttl=None, tags=()):
+        """Cached value, or ``producer()`` stored under ``key``; concurrent misses compute it once."""
+        state = self._app_cache()
+        value = self._lookup(state, key)
+        if value is not _MISSING:
+            return value
+        with _key_lock(key):
+            value = self._lookup(state, key)
+            if value is not _MISSING:
+                return value
+            tags = tuple(tags)
+            try:
+                # read before computing, so an invalidation during producer() leaves the entry stale on arrival
+                versions = tuple(state.backend.versions(self._tag_keys(state, tags))) if tags else ()
+            except Exception as ex:
+                logger.warning("cache get %s failed: %s", key, ex)
+                return producer()
+            lock_key = f"{state.prefix}lock:{key}"
+            holder = not state.backend.shared or self._try_lock(state, lock_key)
+            if not holder:
+                deadline = time.monotonic() + state.lock_timeout
+                while time.monotonic() < deadline:
+                    time.sleep(_POLL_SECONDS)
+                    value = self._lookup(state, key)
+                    if value is not _MISSING:
+                        return value
+                logger.info("cache lock %s timed out; computing without it", key)
+            try:
+                value = producer()
+                self._store(state, key, value, ttl, tags, versions)
+            finally:
+                if holder and state.backend.shared:
+                    try:
+                        state.backend.delete([lock_key])
+                    except Exception:
+                        pass
+            return value
+
+    def _try_lock(self, state, lock_key) -> bool:
+        try:
+            return state.backend.add(lock_key, uuid.uuid4().hex, state.lock_timeout)
+        except Exception as ex:
+            logger.warning("cache lock failed: %s", ex)
+            return True
+
+    def clear(self) -> None:
+        """Drop this app's entries and tag versions (everything under ``CACHE_KEY_PREFIX``)."""
+        state = self._app_cache()
+        state.backend.clear(state.prefix)
+
+
+# --- invalidation from database writes ----------------------------------------
+
+
+def _pending_tags(session) -> set:
+    return session.info.setdefault("cache_tags", set())
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _collect_flushed(session, _flush_context):
+    tags = _pending_tags(session)
+    for obj in session.new:
+        tags.update(table.name for table in inspect(obj).mapper.tables)
+    for obj in (*session.dirty, *session.deleted):
+        state = inspect(obj)
+        mapper = state.mapper
+        tags.update(table.name for table in mapper.tables)
+        if state.identity is not None:
+            tags.add(f"{mapper.local_table.name}:{':'.join(str(part) for part in state.identity)}")
+        for rel in mapper.relationships:
+            if rel.secondary is not None and state.attrs[rel.key].history.has_changes():
+                tags.add(rel.secondary.name)
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _collect_statement(orm_execute_state):
+    if orm_execute_state.is_select:
+        return
+    name = getattr(getattr(orm_execute_state.statement, "table", None), "name", None)
+    if name:
+        _pending_tags(orm_execute_state.session).add(name)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _invalidate_committed(session):
+    tags = session.info.pop("cache_tags", None)
+    if tags and has_app_context() and "cache" in current_app.extensions:
+        from app.extensions import cache
+
+        cache.invalidate_tags(*tags)
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _forget_tags(session):
+    session.info.pop("cache_tags", None)
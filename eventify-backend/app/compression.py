@@ -0,0 +1,125 @@
+"""Response compression negotiated from ``Accept-Encoding``.
+
+Brotli (``br``) is used when the ``brotli`` package is installed and the client
+accepts it; otherwise gzip is used. The client's q-values decide, and ties go
+to brotli. Only text-like bodies are compressed (JSON, text/*, JS, SVG). A
+body is compressed when it is at least ``COMPRESSION_MIN_SIZE`` bytes and the
+result is smaller.
+
+Streamed responses (a generator body, e.g. the admin CSV export) are compressed
+chunk by chunk. Each chunk is flushed, so the client still receives rows as
+they are produced. The size threshold does not apply to them because their
+size is not known up front.
+
+Compressible responses always get ``Vary: Accept-Encoding``. A strong ETag
+becomes weak once the body is compressed, since the bytes differ from the
+identity form. Files sent by ``send_from_directory``, ``Cache-Control:
+no-transform`` responses and bodies that already have a ``Content-Encoding``
+pass through untouched.
+"""
+from __future__ import annotations
+
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli to enable "br"
+    brotli = None
+
+_COMPRESSIBLE_PREFIXES = ("text/",)
+_COMPRESSIBLE_TYPES = frozenset((
+    "application/json",
+    "application/javascript",
+    "application/problem+json",
+    "image/svg+xml",
+))
+_SKIP_STATUS = frozenset((204, 206, 304))
+
+
+def available_encodings():
+    """Encodings this process can produce, in server preference order."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def is_compressible(mimetype) -> bool:
+    return bool(mimetype) and (mimetype in _COMPRESSIBLE_TYPES or mimetype.startswith(_COMPRESSIBLE_PREFIXES))
+
+
+def compress(data: bytes, encoding: str, level=None) -> bytes:
+    """One-shot body compression; ``level`` is the gzip level or brotli quality."""
+    if encoding == "br":
+        return brotli.compress(data, quality=4 if level is None else level)
+    # wbits 31: gzip container, not a bare zlib stream
+    compressor = zlib.compressobj(6 if level is None else level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks, encoding: str, level=None):
+    """Compress an iterable of str/bytes chunks, flushing after each one."""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=4 if level is None else level)
+        process, flush, finish = compressor.process, compressor.flush, compressor.finish
+    else:
+        compressor = zlib.compressobj(6 if level is None else level, zlib.DEFLATED, 31)
+        process, flush, finish = compressor.compress, (lambda: compressor.flush(zlib.Z_SYNC_FLUSH)), compressor.flush
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            if not chunk:
+                continue
+            out = process(chunk) + flush()
+            if out:
+                yield out
+        yield finish()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def init_compression(app) -> None:
+    if not app.config.get("COMPRESSION_ENABLED", True):
+        return
+    min_size = int(app.config.get("COMPRESSION_MIN_SIZE", 1024))
+    levels = {
+        "gzip": int(app.config.get("COMPRESSION_GZIP_LEVEL", 6)),
+        "br": int(app.config.get("COMPRESSION_BROTLI_QUALITY", 4)),
+    }
+
+    @app.after_request
+    def _compress_response(response):
+        if (
+            request.method == "HEAD"
+            or response.status_code < 200
+            or response.status_code in _SKIP_STATUS
+            or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+            or not is_compressible(response.mimetype)
+        ):
+            return response
+        response.vary.add("Accept-Encoding")
+        if "no-transform" in (response.headers.get("Cache-Control") or ""):
+            return response
+        encoding = request.accept_encodings.best_match(available_encodings())
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = compress_stream(response.response, encoding, levels[encoding])
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < min_size:
+                return response
+            compressed = compress(data, encoding, levels[encoding])
+            if len(compressed) >= len(data):
+                return response
+            response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
@@ -0,0 +1,193 @@
+"""Conditional GET (ETag / Last-Modified / 304) for read-heavy polled endpoints.
+
+``@conditional("event", "payment", ...)`` names the tables a view reads. Each
+table has a write counter in ``resource_version``, bumped inside the
+committing transaction whenever a flush, bulk UPDATE/DELETE or Core INSERT
+touches that table. The ETag hashes together:
+
+- the endpoint
+- the JWT identity
+- the query string
+- those counters
+- an optional ``extra()`` token, for state that lives outside the database
+
+When the client's ``If-None-Match`` matches, the view is never called: the
+request costs one primary-key SELECT and returns ``304 Not Modified``.
+
+Versions are read before the view runs. A write that lands in between gives
+new data under the old ETag, so the next poll simply refetches. A 304 is
+never stale.
+
+``Last-Modified`` is sent only when there is no ``extra`` token, and only once
+the second of the latest write has passed. It is that second plus one, so a
+later write always compares newer. ``If-Modified-Since`` is honoured only
+without ``If-None-Match``.
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+from datetime import datetime, timedelta
+
+from flask import current_app, make_response, request
+from sqlalchemy import event, inspect, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.db_routing import RoutingSession
+from app.extensions import db
+from app.models import ResourceVersion
+
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+_CONDITIONAL_METHODS = frozenset(("GET", "HEAD"))
+
+# tables some @conditional view depends on; writes to other tables are not counted
+_WATCHED = set()
+
+
+def conditional(*tables, extra=None):
+    """Serve 304 when nothing in ``tables`` (and ``extra()``, if given) changed since the client's ETag."""
+    _WATCHED.update(tables)
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method not in _CONDITIONAL_METHODS or not current_app.config.get("CONDITIONAL_GET_ENABLED", True):
+                return view(*args, **kwargs)
+            etag, last_modified = current_validators(tables, extra)
+            if _not_modified(etag, last_modified):
+                response = current_app.response_class(status=304)
+                _set_validators(response, etag, last_modified)
+                return response
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                _set_validators(response, etag, last_modified)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def resource_versions(names) -> dict:
+    """{table: (version, updated_at)}; tables never written report (0, None)."""
+    names = sorted(set(names))
+    if not names:
+        return {}
+    rows = db.session.execute(
+        select(ResourceVersion.name, ResourceVersion.version, ResourceVersion.updated_at).where(
+            ResourceVersion.name.in_(names)
+        )
+    )
+    found = {name: (version, updated_at) for name, version, updated_at in rows}
+    return {name: found.get(name, (0, None)) for name in names}
+
+
+def _identity():
+    from flask_jwt_extended import get_jwt_identity
+
+    try:
+        return get_jwt_identity()
+    except RuntimeError:
+        # view without @jwt_required
+        return None
+
+
+def current_validators(tables, extra=None):
+    """(strong ETag value, Last-Modified datetime or None) for this request."""
+    versions = resource_versions(tables)
+    digest = hashlib.blake2b(digest_size=10)
+    for part in (request.endpoint, _identity(), request.query_string.decode("latin-1")):
+        digest.update(f"{part}\x1f".encode("utf-8"))
+    for name, (version, _) in versions.items():
+        digest.update(f"{name}={version}\x1f".encode("utf-8"))
+    last_modified = None
+    if extra is not None:
+        digest.update(str(extra()).encode("utf-8"))
+    else:
+        stamps = [updated_at for _, updated_at in versions.values() if updated_at is not None]
+        if stamps:
+            second_after = max(stamps).replace(microsecond=0) + timedelta(seconds=1)
+            if second_after <= datetime.utcnow():
+                last_modified = second_after
+    return digest.hexdigest(), last_modified
+
+
+def _not_modified(etag, last_modified) -> bool:
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    since = request.if_modified_since
+    return last_modified is not None and since is not None and last_modified <= since.replace(tzinfo=None)
+
+
+def _set_validators(response, etag, last_modified) -> None:
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    # per-user payloads: browsers may keep them, shared caches must not, and every use revalidates
+    response.headers["Cache-Control"] = "private, no-cache"
+    response.vary.add("Authorization")
+
+
+# --- write side: count changed tables per transaction ----------------------
+
+
+def _changed(session) -> set:
+    return session.info.setdefault("changed_tables", set())
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _collect_flushed(session, _flush_context):
+    changed = _changed(session)
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        state = inspect(obj)
+        mapper = state.mapper
+        changed.update(table.name for table in mapper.tables)
+        for rel in mapper.relationships:
+            if rel.secondary is not None and state.attrs[rel.key].history.has_changes():
+                changed.add(rel.secondary.name)
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _collect_statement(orm_execute_state):
+    if orm_execute_state.is_select:
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    name = getattr(table, "name", None)
+    if name and name in _WATCHED:
+        _changed(orm_execute_state.session).add(name)
+
+
+@event.listens_for(RoutingSession, "before_commit")
+def _bump_versions(session):
+    if session.new or session.dirty or session.deleted:
+        # the commit's own flush runs after this hook; flush now so its tables are counted
+        session.flush()
+    names = sorted(session.info.pop("changed_tables", set()) & _WATCHED)
+    if names:
+        bump(session, names)
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _forget_changes(session):
+    session.info.pop("changed_tables", None)
+
+
+def bump(session, names) -> None:
+    """Increment the counters for ``names`` in ``session``'s transaction (creating missing rows)."""
+    now = datetime.utcnow()
+    table = ResourceVersion.__table__
+    upsert = _UPSERT_INSERTS.get(session.get_bind().dialect.name)
+    if upsert is not None:
+        stmt = upsert(table).values([{"name": name, "version": 1, "updated_at": now} for name in names])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["name"],
+            set_={"version": table.c.version + 1, "updated_at": stmt.excluded.updated_at},
+        )
+        session.execute(stmt)
+        return
+    for name in names:
+        result = session.execute(
+            update(table).where(table.c.name == name).values(version=table.c.version + 1, updated_at=now)
+        )
+        if not result.rowcount:
+            session.execute(table.insert().values(name=name, version=1, updated_at=now))
@@ -2,14 +2,48 @@ import os
 from datetime import timedelta
 from dotenv import load_dotenv
 
+from app.utils import jsonfast
+
 load_dotenv()
 
 class Config:
     SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret")
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///dev.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # JSON columns (service availability, portfolio, package features) go through orjson.
+    # create_app() merges the DB_PROFILE options below into these (see engine_options()).
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "json_serializer": jsonfast.dumps,
+        "json_deserializer": jsonfast.loads_column,
+    }
+    # Optional read replica (the "replica" bind); see app/db_routing.py
+    DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+    SQLALCHEMY_BINDS = {"replica": DATABASE_REPLICA_URL} if DATABASE_REPLICA_URL else {}
+    # get: GET/HEAD reads use the replica | marked: only @read_replica views | off
+    REPLICA_READS = os.getenv("REPLICA_READS", "get").lower()
+    # After a user's write, their reads stay on the primary this long (replication lag)
+    REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+    # One-shot startup schema patches (app/schema_patches.py); off when Alembic owns the schema
+    SCHEMA_PATCHES_ENABLED = os.getenv("SCHEMA_PATCHES_ENABLED", "1").lower() in ("1", "true", "yes")
+    # A patch lease older than this (seconds) is assumed abandoned by a crashed worker
+    SCHEMA_PATCH_LOCK_TIMEOUT = float(os.getenv("SCHEMA_PATCH_LOCK_TIMEOUT", "120"))
+    # Engine profile: auto (by URL scheme) | sqlite | server | none (driver defaults)
+    DB_PROFILE = os.getenv("DB_PROFILE", "auto").lower()
+    # sqlite profile: applied as PRAGMAs on every new connection
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+    SQLITE_MMAP_SIZE_MB = int(os.getenv("SQLITE_MMAP_SIZE_MB", "256"))
+    # server profile (PostgreSQL / MySQL)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "15000"))
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "jwt-secret-change-in-production")
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    GROQ_API_KEY = os.getenv("GROQ_API_KEY")
     STRIPE_SECRET_KEY = os.getenv("STRIPE_SECRET_KEY")
     STRIPE_WEBHOOK_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET")
 
@@ -26,8 +60,100 @@ class Config:
     MAIL_PASSWORD = os.getenv("MAIL_PASSWORD")
     MAIL_DEFAULT_SENDER = ('Eventify', os.getenv("MAIL_USERNAME"))
     UPLOAD_FOLDER = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'static', 'uploads')
+    # Seconds to cache a JWT user's role / is_active / name across requests (0 = per request only)
+    CURRENT_USER_CACHE_TTL = float(os.getenv("CURRENT_USER_CACHE_TTL", "30"))
+    # Organizer "open events" sidebar badge cache (seconds; 0 disables)
+    OPEN_EVENTS_COUNT_TTL = float(os.getenv("OPEN_EVENTS_COUNT_TTL", "60"))
+    # Service-change notifications for the same vendor within this window are merged
+    NOTIFICATION_COALESCE_SECONDS = float(os.getenv("NOTIFICATION_COALESCE_SECONDS", "5"))
+    # Logging: json (one object per line) or text; LOG_LEVELS="app.api.services=WARNING,app.api.payments=DEBUG"
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+    # Opt-in per-request SQL counting: Server-Timing header, slow / N+1 logging, admin report
+    SQL_INSTRUMENTATION = os.getenv("SQL_INSTRUMENTATION", "0").lower() in ("1", "true", "yes")
+    SQL_SLOW_REQUEST_MS = float(os.getenv("SQL_SLOW_REQUEST_MS", "500"))
+    # Same statement shape this many times in one request is reported as an N+1 suspect
+    SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5"))
+    # GET /metrics (Prometheus text format); when METRICS_TOKEN is set, scrapes need "Authorization: Bearer <token>"
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1").lower() in ("1", "true", "yes")
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+    # ETag / Last-Modified and 304 on @conditional list endpoints (app/conditional.py)
+    CONDITIONAL_GET_ENABLED = os.getenv("CONDITIONAL_GET_ENABLED", "1").lower() in ("1", "true", "yes")
+    # gzip / brotli (when installed) response compression, negotiated via Accept-Encoding
+    COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "1").lower() in ("1", "true", "yes")
+    # Smaller bodies go out uncompressed (bytes); streamed bodies are always compressed
+    COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+    # Providers to build at startup instead of on first use (app/providers.py), e.g. "openai,stripe"
+    PROVIDER_WARMUP = os.getenv("PROVIDER_WARMUP", "")
+    # Cross-request cache (app/cache.py): memory (per process) | redis (REDIS_URL) | sqlite (one file per host)
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+    REDIS_URL = os.getenv("REDIS_URL")
+    # Defaults to <instance folder>/cache.sqlite
+    CACHE_SQLITE_PATH = os.getenv("CACHE_SQLITE_PATH")
+    CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "eventify:")
+    CACHE_DEFAULT_TTL = float(os.getenv("CACHE_DEFAULT_TTL", "300"))
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+    # get_or_set: how long other workers wait for the one computing a missing value (seconds)
+    CACHE_LOCK_TIMEOUT = float(os.getenv("CACHE_LOCK_TIMEOUT", "10"))
+    # Serialized Event / User dicts kept per process, keyed by row_version (app/fragment_cache.py; 0 disables)
+    FRAGMENT_CACHE_SIZE = int(os.getenv("FRAGMENT_CACHE_SIZE", "4096"))
+    # With a shared CACHE_BACKEND, fragments are also shared between workers for this many seconds (0 = process-local)
+    FRAGMENT_CACHE_SHARED_TTL = float(os.getenv("FRAGMENT_CACHE_SHARED_TTL", "3600"))
     # Required by Nominatim usage policy — set a real contact URL or email in production
     NOMINATIM_USER_AGENT = os.getenv(
         "NOMINATIM_USER_AGENT",
         "Eventify/1.0 (venue search; https://github.com/)",
     )
+
+
+def db_profile(config) -> str:
+    """Resolve ``DB_PROFILE=auto`` from the database URL scheme."""
+    profile = (config.get("DB_PROFILE") or "auto").lower()
+    if profile != "auto":
+        return profile
+    uri = config.get("SQLALCHEMY_DATABASE_URI") or ""
+    return "sqlite" if uri.startswith("sqlite") else "server"
+
+
+def sqlite_pragmas(config) -> list:
+    """(pragma, value) pairs for the sqlite profile, in the order they are applied."""
+    return [
+        ("journal_mode", config.get("SQLITE_JOURNAL_MODE", "WAL")),
+        ("synchronous", config.get("SQLITE_SYNCHRONOUS", "NORMAL")),
+        ("busy_timeout", int(config.get("SQLITE_BUSY_TIMEOUT_MS", 5000))),
+        # negative cache_size is in KiB rather than pages
+        ("cache_size", -int(config.get("SQLITE_CACHE_SIZE_KB", 65536))),
+        ("mmap_size", int(config.get("SQLITE_MMAP_SIZE_MB", 256)) * 1024 * 1024),
+        ("temp_store", "MEMORY"),
+    ]
+
+
+def engine_options(config) -> dict:
+    """SQLALCHEMY_ENGINE_OPTIONS for the selected profile, merged over the configured ones."""
+    options = dict(config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    profile = db_profile(config)
+    uri = config.get("SQLALCHEMY_DATABASE_URI") or ""
+    if profile == "sqlite":
+        connect_args = dict(options.get("connect_args") or {})
+        # the driver-level wait; PRAGMA busy_timeout covers the same on reconnects
+        connect_args.setdefault("timeout", int(config.get("SQLITE_BUSY_TIMEOUT_MS", 5000)) / 1000)
+        options["connect_args"] = connect_args
+    elif profile == "server":
+        options.setdefault("pool_size", int(config.get("DB_POOL_SIZE", 10)))
+        options.setdefault("max_overflow", int(config.get("DB_MAX_OVERFLOW", 20)))
+        options.setdefault("pool_timeout", int(config.get("DB_POOL_TIMEOUT", 30)))
+        options.setdefault("pool_recycle", int(config.get("DB_POOL_RECYCLE", 1800)))
+        options.setdefault("pool_pre_ping", True)
+        timeout_ms = int(config.get("DB_STATEMENT_TIMEOUT_MS", 0))
+        if timeout_ms:
+            connect_args = dict(options.get("connect_args") or {})
+            if uri.startswith("postgresql"):
+                connect_args.setdefault("options", f"-c statement_timeout={timeout_ms}")
+            elif uri.startswith("mysql"):
+                # SELECT-only in MySQL; writes are bounded by innodb_lock_wait_timeout
+                connect_args.setdefault("init_command", f"SET SESSION max_execution_time={timeout_ms}")
+            options["connect_args"] = connect_args
+    return options
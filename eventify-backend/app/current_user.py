@@ -0,0 +1,106 @@
+"""The JWT user for the current request, loaded at most once.
+
+``load_current_user()`` returns the full ``User`` row and memoizes it on ``flask.g``.
+``current_identity()`` returns only (id, role, is_active, name). Those fields are
+also kept in the shared cache (app/cache.py) for ``CURRENT_USER_CACHE_TTL`` seconds
+(0 disables it), so role checks such as ``require_admin`` usually cost no query.
+An ORM commit that changes a user drops that user's entry (tag ``user:<id>``):
+in every worker with a shared ``CACHE_BACKEND`` (redis or sqlite), but only in
+the committing process with the default ``memory`` backend. Call
+``invalidate_identity`` after bulk statements that change a user's role, status
+or name.
+"""
+from __future__ import annotations
+
+from typing import NamedTuple, Optional
+
+from flask import current_app, g, has_app_context
+from flask_jwt_extended import get_jwt_identity
+
+from app.extensions import cache, db
+from app.models import User
+
+
+class Identity(NamedTuple):
+    id: int
+    role: Optional[str]
+    is_active: bool
+    name: Optional[str]
+
+
+def _key(user_id) -> str:
+    return f"identity:{user_id}"
+
+
+def current_user_id() -> Optional[int]:
+    """JWT identity as int, or None when it is missing or not numeric."""
+    try:
+        return int(get_jwt_identity())
+    except (TypeError, ValueError):
+        return None
+
+
+def _identity_from_user(user: User) -> Identity:
+    return Identity(user.id, user.role, user.is_active is not False, user.name)
+
+
+def _ttl() -> float:
+    return float(current_app.config.get("CURRENT_USER_CACHE_TTL", 0) or 0)
+
+
+def _remember(identity: Identity) -> None:
+    ttl = _ttl()
+    if ttl > 0:
+        cache.set(_key(identity.id), identity, ttl=ttl, tags=("identity", f"user:{identity.id}"))
+
+
+def load_current_user() -> Optional[User]:
+    """The ``User`` row for the JWT identity (None if deleted); one lookup per request."""
+    if "current_user" not in g:
+        uid = current_user_id()
+        user = db.session.get(User, uid) if uid is not None else None
+        g.current_user = user
+        if user is not None:
+            g.current_identity = _identity_from_user(user)
+            _remember(g.current_identity)
+    return g.current_user
+
+
+def current_identity() -> Optional[Identity]:
+    """Role/status/name of the JWT user, from the request, the TTL cache, or one narrow query."""
+    if "current_identity" in g:
+        return g.current_identity
+    uid = current_user_id()
+    identity = None
+    if uid is not None:
+        identity = cache.get(_key(uid)) if _ttl() > 0 else None
+        if identity is None:
+            row = (
+                db.session.query(User.id, User.role, User.is_active, User.name)
+                .filter(User.id == uid)
+                .first()
+            )
+            if row is not None:
+                identity = Identity(row.id, row.role, row.is_active is not False, row.name)
+                _remember(identity)
+    g.current_identity = identity
+    return identity
+
+
+def invalidate_identity(*user_ids) -> None:
+    """Drop cached identities (all of them when called without ids)."""
+    ids = set()
+    for uid in user_ids:
+        try:
+            ids.add(int(uid))
+        except (TypeError, ValueError):
+            continue
+    if not has_app_context():
+        return
+    if not user_ids:
+        cache.invalidate_tags("identity")
+    elif ids:
+        cache.delete(*(_key(uid) for uid in ids))
+    identity = g.get("current_identity")
+    if identity is not None and (not user_ids or identity.id in ids):
+        g.pop("current_identity", None)
@@ -0,0 +1,148 @@
+"""Send read-only queries to a replica bind, with read-your-writes stickiness.
+
+Configure ``DATABASE_REPLICA_URL``; it becomes the ``replica`` entry of
+``SQLALCHEMY_BINDS``. ``RoutingSession.get_bind`` sends a plain SELECT to the
+replica when the current request allows it. Everything else stays on the
+primary: flushes, UPDATE/DELETE/INSERT, ``FOR UPDATE``, raw ``text()``, and any
+query after this session has written.
+
+Which requests may read from the replica (``REPLICA_READS``):
+
+- ``get`` (default): GET/HEAD requests, except views marked ``@use_primary``
+- ``marked``: only views marked ``@read_replica``, plus ``replica_reads()`` blocks
+- ``off``: never
+
+After a user's request writes, that user's requests read from the primary for
+``REPLICA_STICKY_SECONDS``, so replication lag never hides their own change. The
+sticky window is kept in the shared cache (app/cache.py), so with a shared
+``CACHE_BACKEND`` every worker honours it.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.selectable import CompoundSelect
+
+REPLICA_BIND = "replica"
+_READ_METHODS = frozenset(("GET", "HEAD"))
+
+
+def use_primary(view):
+    """Mark a view that must read from the primary even on GET (e.g. it writes what it reads)."""
+    view._db_reads = "primary"
+    return view
+
+
+def read_replica(view):
+    """Mark a view whose reads may go to the replica (needed when ``REPLICA_READS=marked``)."""
+    view._db_reads = "replica"
+    return view
+
+
+class StickyWrites:
+    """user id -> read from the primary until the cache entry expires."""
+
+    @staticmethod
+    def _key(user_id):
+        return f"replica_sticky:{user_id}"
+
+    def mark(self, user_id, seconds):
+        from app.extensions import cache
+
+        if seconds > 0:
+            cache.set(self._key(user_id), True, ttl=seconds)
+        else:
+            cache.delete(self._key(user_id))
+
+    def active(self, user_id):
+        from app.extensions import cache
+
+        return cache.get(self._key(user_id)) is not None
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and self._replica_allowed(clause):
+            engine = self._db.engines.get(REPLICA_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _replica_allowed(self, clause):
+        if self.info.get("wrote"):
+            return False
+        if not isinstance(clause, (Select, CompoundSelect)) or getattr(clause, "_for_update_arg", None) is not None:
+            return False
+        if self.info.get("replica"):
+            return True
+        return has_request_context() and g.get("db_read_replica", False)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _flushed(session, _flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _bulk_write(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@contextmanager
+def replica_reads():
+    """Route this block's SELECTs to the replica regardless of the request (reports, exports)."""
+    from app.extensions import db
+
+    session = db.session()
+    previous = session.info.get("replica")
+    session.info["replica"] = True
+    try:
+        yield
+    finally:
+        session.info["replica"] = previous
+
+
+def _request_user_id():
+    from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+    try:
+        verify_jwt_in_request(optional=True)
+        return get_jwt_identity()
+    except Exception:
+        # bad or expired token: the view's own @jwt_required reports it
+        return None
+
+
+def init_read_routing(app) -> None:
+    """Request hooks deciding replica eligibility and recording writes for stickiness."""
+    mode = (app.config.get("REPLICA_READS") or "get").lower()
+    if REPLICA_BIND not in (app.config.get("SQLALCHEMY_BINDS") or {}) or mode == "off":
+        return
+    sticky = app.extensions["replica_sticky_writes"] = StickyWrites()
+
+    @app.before_request
+    def _choose_read_bind():
+        view = app.view_functions.get(request.endpoint)
+        marked = getattr(view, "_db_reads", None)
+        if request.method not in _READ_METHODS or marked == "primary":
+            allowed = False
+        else:
+            allowed = marked == "replica" or mode == "get"
+        g.db_user_id = _request_user_id()
+        if allowed and g.db_user_id is not None and sticky.active(g.db_user_id):
+            allowed = False
+        g.db_read_replica = allowed
+
+    @app.after_request
+    def _remember_writes(response):
+        from app.extensions import db
+
+        user_id = g.get("db_user_id")
+        if user_id is not None and response.status_code < 400 and db.session().info.get("wrote"):
+            sticky.mark(user_id, float(current_app.config.get("REPLICA_STICKY_SECONDS", 5)))
+        return response
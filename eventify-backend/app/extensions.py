@@ -3,10 +3,30 @@ from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from flask_mail import Mail
+from sqlalchemy import event
 
+from app.cache import Cache
+from app.db_routing import RoutingSession
 
-db = SQLAlchemy()
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 migrate = Migrate()
 jwt = JWTManager()
 cors = CORS()
-mail = Mail()  
\ No newline at end of file
+mail = Mail()  
+# Cross-request cache shared by the workers (app/cache.py; CACHE_BACKEND)
+cache = Cache()
+
+
+def apply_sqlite_pragmas(engine, pragmas) -> None:
+    """Run ``PRAGMA name=value`` for each (name, value) on every new DB-API connection."""
+    statements = [f"PRAGMA {name}={value}" for name, value in pragmas]
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
@@ -0,0 +1,238 @@
+"""Serialized ``Event`` / ``User`` dicts, reused until the row changes.
+
+Rendering an event runs two vendor queries. The same event is rendered for the
+host, the organizer, every vendor and the admin. Both models carry a
+``row_version`` counter, and a rendered dict is stored under
+``(model, shape, id, row_version)``. A changed row simply gets a new key, and
+the old entry ages out of the LRU. ``shape`` is a digest of the model's
+``DICT_FIELDS``, so a deploy that changes ``to_dict`` never reads old entries.
+
+``row_version`` is bumped by:
+
+- every ORM flush that changes a column of the row, or one of its many-to-many
+  collections (the objects at both ends are bumped)
+- ``bulk_update()`` on these models
+- ``touch()``, called by routes that write ``vendor_events`` with Core
+  statements (vendor assign, partnership accept / decline)
+- renaming or deleting a user, which touches the events showing that user's name
+
+Only committed state is cached. An object with unflushed changes skips the
+cache, and so does a session whose transaction has already written.
+User fragments leave out ``profile_image``, which can be a 2 MB base64 upload,
+so the LRU's entry cap stays a rough bound on memory.
+
+Entries live in a per-process LRU of ``FRAGMENT_CACHE_SIZE`` dicts (0 disables
+the cache). With a shared ``CACHE_BACKEND`` (redis or sqlite, see app/cache.py)
+they are also shared between workers for ``FRAGMENT_CACHE_SHARED_TTL`` seconds
+(0 keeps them process-local). Hits are returned as shallow copies, so callers
+may add keys but must not mutate nested lists.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect, update
+
+from app.db_routing import RoutingSession
+from app.extensions import cache
+
+_UNSAFE = "fragments_unsafe"
+
+
+class FragmentCache:
+    """Bounded LRU of rendered dicts, optionally backed by a shared store (``get`` / ``set(key, value, ttl=)``)."""
+
+    def __init__(self, max_entries, shared=None, shared_ttl=0):
+        self.max_entries = max_entries
+        self._shared = shared
+        self.shared_ttl = shared_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _shared_store(self):
+        if self._shared is None and self.shared_ttl > 0:
+            self._shared = cache if cache.shared else False
+        return self._shared or None
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+        shared = self._shared_store()
+        if shared is not None:
+            value = shared.get(key)
+            if value is not None:
+                self._remember(key, value)
+                with self._lock:
+                    self.hits += 1
+                return value
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, value) -> None:
+        self._remember(key, value)
+        shared = self._shared_store()
+        if shared is not None:
+            shared.set(key, value, ttl=self.shared_ttl)
+
+    def _remember(self, key, value) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def init_fragment_cache(app) -> None:
+    size = int(app.config.get("FRAGMENT_CACHE_SIZE", 0) or 0)
+    app.extensions["fragment_cache"] = (
+        FragmentCache(size, shared_ttl=float(app.config.get("FRAGMENT_CACHE_SHARED_TTL", 0) or 0)) if size > 0 else None
+    )
+
+
+def _cache():
+    return current_app.extensions.get("fragment_cache") if has_app_context() else None
+
+
+_shapes = {}
+
+
+def _shape(model) -> str:
+    shape = _shapes.get(model)
+    if shape is None:
+        shape = _shapes[model] = hashlib.blake2b("\x1f".join(model.DICT_FIELDS).encode("utf-8"), digest_size=4).hexdigest()
+    return shape
+
+
+def lookup_fragment(obj):
+    """(key, cached dict or None). The key is None when ``obj`` must not use the cache."""
+    cache = _cache()
+    if cache is None:
+        return None, None
+    state = inspect(obj)
+    if not state.persistent or state.modified or state.session.info.get(_UNSAFE):
+        return None, None
+    model = type(obj)
+    key = f"frag:{model.__tablename__}:{_shape(model)}:{obj.id}:{obj.row_version}"
+    return key, cache.get(key)
+
+
+def store_fragment(key, value) -> None:
+    """Keep a copy of ``value`` under a key from ``lookup_fragment``; the caller may mutate its own."""
+    cache = _cache()
+    if key is not None and cache is not None:
+        cache.put(key, dict(value))
+
+
+# --- version bumps ----------------------------------------------------------
+
+
+def _versioned(model) -> bool:
+    return "row_version" in model.__table__.c
+
+
+def _touch_values(model) -> dict:
+    """New row_version; columns with ``onupdate`` keep their value (a touch is not an edit)."""
+    values = {"row_version": model.row_version + 1}
+    for column in model.__table__.c:
+        if column.onupdate is not None:
+            values[column.key] = getattr(model, column.key)
+    return values
+
+
+def touch(model, ids, session=None) -> None:
+    """Bump ``row_version`` of ``model`` rows ``ids`` in the current transaction."""
+    ids = sorted({int(i) for i in ids if i is not None})
+    if not ids:
+        return
+    if session is None:
+        from app.extensions import db
+
+        session = db.session
+    session.execute(
+        update(model).where(model.id.in_(ids)).values(_touch_values(model)),
+        execution_options={"synchronize_session": False},
+    )
+
+
+def _touch_instance(obj) -> None:
+    for key, value in _touch_values(type(obj)).items():
+        setattr(obj, key, value)
+
+
+def _named_events(session, user_ids) -> None:
+    """Touch the events whose dicts show these users' names (organizer, partner or completed vendor)."""
+    from app.models.models import Event, vendor_completed_events, vendor_events
+
+    ids = {event_id for (event_id,) in session.query(Event.id).filter(Event.organizer_id.in_(user_ids))}
+    for link in (vendor_events, vendor_completed_events):
+        ids.update(event_id for (event_id,) in session.query(link.c.event_id).filter(link.c.vendor_id.in_(user_ids)))
+    touch(Event, ids, session)
+
+
+@event.listens_for(RoutingSession, "before_flush")
+def _bump_row_versions(session, _flush_context, _instances):
+    from app.models.models import User
+
+    edited = set()
+    touched = set()
+    renamed = set()
+    for obj in list(session.dirty):
+        state = inspect(obj)
+        if not _versioned(state.mapper.class_):
+            continue
+        if session.is_modified(obj, include_collections=False):
+            edited.add(obj)
+            if isinstance(obj, User) and state.attrs.name.history.has_changes():
+                renamed.add(obj.id)
+        for rel in state.mapper.relationships:
+            if rel.secondary is None:
+                continue
+            history = state.attrs[rel.key].history
+            if history.has_changes():
+                touched.add(obj)
+                touched.update(
+                    other for other in (*history.added, *history.deleted)
+                    if _versioned(type(other)) and inspect(other).persistent
+                )
+    for obj in edited:
+        obj.row_version = type(obj).row_version + 1
+    for obj in touched - edited:
+        _touch_instance(obj)
+    renamed.update(obj.id for obj in session.deleted if isinstance(obj, User))
+    if renamed:
+        _named_events(session, renamed)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_flushed(session, _flush_context):
+    session.info[_UNSAFE] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_written(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info[_UNSAFE] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+@event.listens_for(RoutingSession, "after_rollback")
+def _transaction_done(session):
+    session.info.pop(_UNSAFE, None)
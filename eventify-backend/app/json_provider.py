@@ -0,0 +1,79 @@
+"""Flask JSON provider backed by orjson (``jsonify``, ``request.get_json``).
+
+orjson writes datetimes natively as ISO 8601. Naive values are treated as UTC
+and end in ``Z``, the same as ``isoformat_utc_z``. ``Decimal`` is written as a
+string, as Flask's default provider did. Responses are encoded straight to
+bytes with no intermediate ``str``. Keys stay sorted (Flask's default) so
+equal payloads give byte-identical bodies. Values orjson cannot encode, such
+as integers wider than 64 bits, fall back to the stdlib provider.
+"""
+from __future__ import annotations
+
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date, datetime
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+from app.utils.datetime_serialize import isoformat_utc_z
+
+_BASE_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+
+def _default(value):
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if hasattr(value, "__html__"):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _stdlib_default(value):
+    """What orjson handles natively, for the rare payload that needs the stdlib encoder."""
+    if isinstance(value, datetime):
+        return isoformat_utc_z(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    return _default(value)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    def _options(self, indent=False):
+        options = _BASE_OPTIONS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps_bytes(self, obj, indent=False) -> bytes:
+        try:
+            return orjson.dumps(obj, default=_default, option=self._options(indent))
+        except orjson.JSONEncodeError:
+            return json.dumps(
+                obj, default=_stdlib_default, sort_keys=self.sort_keys, indent=2 if indent else None,
+                separators=None if indent else (",", ":"), ensure_ascii=False,
+            ).encode("utf-8")
+
+    def dumps(self, obj, **kwargs) -> str:
+        if kwargs:
+            # callers asking for stdlib options (cls=, indent=4, ...) get the stdlib encoder
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(self.dumps_bytes(obj, indent=pretty) + b"\n", mimetype=self.mimetype)
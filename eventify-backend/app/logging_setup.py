@@ -0,0 +1,139 @@
+"""Structured, non-blocking logging for the ``app`` logger tree.
+
+Request threads only put records on an in-memory queue. A ``QueueListener``
+thread formats them and writes them to stdout, as one JSON object per line
+(``LOG_FORMAT=json``, the default) or as plain text. Every record carries the
+``request_id`` of the request that produced it: the incoming ``X-Request-ID``
+header, or a generated id. The id is echoed back on the response.
+
+Levels: ``LOG_LEVEL`` for the ``app`` tree, plus per-module overrides in
+``LOG_LEVELS``, e.g. ``app.api.services=WARNING,app.api.payments=DEBUG``.
+Modules log through ``logging.getLogger(__name__)``; Flask's ``app.logger``
+is the same ``app`` logger.
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import queue
+import sys
+import threading
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from flask import g, has_request_context, request
+from flask.logging import default_handler
+
+from app.utils import jsonfast
+
+_RESERVED = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+_lock = threading.Lock()
+_state = {"pid": None, "listener": None, "handler": None}
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the current request id, on the calling thread before they are queued."""
+
+    def filter(self, record):
+        record.request_id = g.get("request_id") if has_request_context() else None
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        out = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            out["request_id"] = record.request_id
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith("_"):
+                out[key] = value if isinstance(value, (str, int, float, bool, type(None))) else repr(value)
+        if record.exc_text:
+            out["exc"] = record.exc_text
+        return jsonfast.dumps(out)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s")
+
+    def format(self, record):
+        if not hasattr(record, "request_id"):
+            record.request_id = None
+        return super().format(record)
+
+
+class _StructuredQueueHandler(QueueHandler):
+    """Render the message and traceback on the caller's thread, keep extra fields for the formatter."""
+
+    def prepare(self, record):
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        record.stack_info = None
+        return record
+
+
+def _parse_levels(spec):
+    levels = {}
+    for part in (spec or "").split(","):
+        name, _, level = part.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def _stop_listener():
+    listener = _state["listener"]
+    if listener is not None and _state["pid"] == os.getpid():
+        listener.stop()
+    _state["listener"] = None
+
+
+def configure_logging(app) -> None:
+    """Install the queue handler on the ``app`` logger and the request-id hooks."""
+    with _lock:
+        if _state["pid"] != os.getpid():
+            # New process (first call, or a forked worker): the listener thread did not survive
+            log_queue = queue.SimpleQueue()
+            stream = logging.StreamHandler(sys.stdout)
+            stream.setFormatter(JsonFormatter() if app.config.get("LOG_FORMAT", "json") == "json" else TextFormatter())
+            handler = _StructuredQueueHandler(log_queue)
+            handler.addFilter(RequestIdFilter())
+            listener = QueueListener(log_queue, stream, respect_handler_level=True)
+            listener.start()
+            _state.update(pid=os.getpid(), listener=listener, handler=handler)
+            atexit.register(_stop_listener)
+
+        root = logging.getLogger("app")
+        root.removeHandler(default_handler)
+        for existing in list(root.handlers):
+            if isinstance(existing, _StructuredQueueHandler) and existing is not _state["handler"]:
+                root.removeHandler(existing)
+        if _state["handler"] not in root.handlers:
+            root.addHandler(_state["handler"])
+        root.propagate = False
+        root.setLevel(app.config.get("LOG_LEVEL", "INFO"))
+        for name, level in _parse_levels(app.config.get("LOG_LEVELS")).items():
+            logging.getLogger(name).setLevel(level)
+
+    @app.before_request
+    def _assign_request_id():
+        incoming = (request.headers.get("X-Request-ID") or "").strip()
+        g.request_id = incoming[:64] if incoming else uuid.uuid4().hex
+
+    @app.after_request
+    def _echo_request_id(response):
+        request_id = g.get("request_id")
+        if request_id:
+            response.headers["X-Request-ID"] = request_id
+        return response
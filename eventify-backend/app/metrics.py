@@ -0,0 +1,202 @@
+"""Prometheus text-format metrics without a client library.
+
+Hot-path writes are lock-free: every thread increments its own shard of each
+histogram. A lock is taken only when a thread first touches a histogram and when
+``/metrics`` is scraped, which sums the shards. Shards are keyed by thread ident,
+and a scrape folds the shards of finished threads into a retired total, so a
+thread-per-request server keeps one shard per live thread. Gauges (DB pool,
+notification backlog, fan-out queue) are read at scrape time.
+
+- ``http_request_duration_seconds{blueprint,endpoint,method,status}``
+- ``outbound_request_duration_seconds{service,outcome}``, wrapped around Stripe,
+  Nominatim, OpenAI/Groq, Google OAuth and SMTP calls via ``track_outbound``
+"""
+from __future__ import annotations
+
+import bisect
+import hmac
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import Response, current_app, g, request
+
+from app.extensions import db
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+OUTBOUND_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    def __init__(self, name, documentation, labelnames, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._local = threading.local()
+        self._shards = {}  # thread ident -> (thread, shard)
+        self._retired = {}  # totals of shards whose thread has exited
+        self._lock = threading.Lock()
+
+    def _new_series(self):
+        # [per-bucket counts..., +Inf count, sum]
+        return [0] * (len(self.buckets) + 1) + [0.0]
+
+    def _shard(self):
+        shard = getattr(self._local, "series", None)
+        if shard is None:
+            shard = self._local.series = {}
+            with self._lock:
+                previous = self._shards.get(threading.get_ident())
+                if previous is not None:
+                    # the ident belonged to a thread that has exited since the last scrape
+                    self._add(self._retired, previous[1])
+                self._shards[threading.get_ident()] = (threading.current_thread(), shard)
+        return shard
+
+    def _add(self, totals, shard):
+        for labels, series in list(shard.items()):
+            acc = totals.get(labels)
+            if acc is None:
+                acc = totals[labels] = self._new_series()
+            for i, v in enumerate(series):
+                acc[i] += v
+
+    def observe(self, value, *labels):
+        """``labels`` in ``labelnames`` order."""
+        shard = self._shard()
+        series = shard.get(labels)
+        if series is None:
+            series = shard[labels] = self._new_series()
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def collect(self):
+        """{labels: (cumulative bucket counts incl. +Inf, sum)} summed over every thread."""
+        totals = {}
+        with self._lock:
+            for ident, (thread, shard) in list(self._shards.items()):
+                if not thread.is_alive():
+                    self._add(self._retired, shard)
+                    del self._shards[ident]
+            self._add(totals, self._retired)
+            live = [shard for _thread, shard in self._shards.values()]
+        for shard in live:
+            self._add(totals, shard)
+        out = {}
+        for labels, acc in totals.items():
+            cumulative, running = [], 0
+            for count in acc[:-1]:
+                running += count
+                cumulative.append(running)
+            out[labels] = (cumulative, acc[-1])
+        return out
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, (cumulative, total) in sorted(self.collect().items()):
+            base = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.labelnames, labels))
+            sep = "," if base else ""
+            for bound, count in zip(self.buckets + (float("inf"),), cumulative):
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{self.name}_bucket{{{base}{sep}le="{le}"}} {count}')
+            lines.append(f"{self.name}_sum{{{base}}} {total:.6f}")
+            lines.append(f"{self.name}_count{{{base}}} {cumulative[-1]}")
+        return lines
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by blueprint and endpoint.",
+    ("blueprint", "endpoint", "method", "status"),
+    LATENCY_BUCKETS,
+)
+OUTBOUND_LATENCY = Histogram(
+    "outbound_request_duration_seconds",
+    "Latency of calls to external services.",
+    ("service", "outcome"),
+    OUTBOUND_BUCKETS,
+)
+
+
+@contextmanager
+def track_outbound(service):
+    """Time an external call: ``with track_outbound("stripe"): ...``. Exceptions are recorded as outcome=error."""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        OUTBOUND_LATENCY.observe(time.perf_counter() - started, service, outcome)
+
+
+def _gauge(lines, name, documentation, value, labels=""):
+    lines.append(f"# HELP {name} {documentation}")
+    lines.append(f"# TYPE {name} gauge")
+    lines.append(f"{name}{labels} {value}")
+
+
+def _pool_gauges(lines):
+    pool = db.engine.pool
+    for attr, name, documentation in (
+        ("size", "db_pool_size", "Configured DB connection pool size."),
+        ("checkedout", "db_pool_checked_out", "DB connections currently in use."),
+        ("overflow", "db_pool_overflow", "DB connections open beyond pool_size."),
+    ):
+        fn = getattr(pool, attr, None)
+        if callable(fn):
+            _gauge(lines, name, documentation, fn())
+
+
+def _queue_gauges(lines):
+    from app.api.payments import demo_notifications, pending_unread_notifications
+    from app.notification_fanout import fanout
+
+    _gauge(lines, "notifications_stored", "In-memory notifications held by the API process.", len(demo_notifications))
+    _gauge(lines, "notifications_unread", "Unread in-memory notifications across users.", pending_unread_notifications())
+    _gauge(lines, "notification_fanout_pending_vendors", "Vendors with service changes waiting to fan out.", fanout.pending_count())
+
+
+def render_metrics():
+    lines = REQUEST_LATENCY.render() + OUTBOUND_LATENCY.render()
+    _pool_gauges(lines)
+    _queue_gauges(lines)
+    return "\n".join(lines) + "\n"
+
+
+def init_metrics(app) -> None:
+    """Request timing hooks and the ``/metrics`` route (``METRICS_ENABLED``; optional ``METRICS_TOKEN``)."""
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+
+    @app.before_request
+    def _start_request_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _observe_request(response):
+        started = g.pop("metrics_started", None)
+        if started is not None and request.endpoint != "metrics":
+            endpoint = request.endpoint or "unmatched"
+            REQUEST_LATENCY.observe(
+                time.perf_counter() - started,
+                request.blueprint or "app",
+                endpoint,
+                request.method,
+                str(response.status_code),
+            )
+        return response
+
+    @app.route("/metrics", endpoint="metrics")
+    def metrics():
+        token = current_app.config.get("METRICS_TOKEN")
+        if token:
+            supplied = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+            if not hmac.compare_digest(supplied.encode("utf-8"), token.encode("utf-8")):
+                return Response("unauthorized\n", status=401, mimetype="text/plain")
+        return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
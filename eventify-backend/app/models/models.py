@@ -1,8 +1,14 @@
 from app.utils.datetime_serialize import isoformat_utc_z
 from app.extensions import db
+from app.fragment_cache import lookup_fragment, store_fragment
 from passlib.hash import bcrypt
 from datetime import datetime
+import secrets
 from sqlalchemy import and_, func
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.visitors import InternalTraversal
+from sqlalchemy.orm import joinedload, load_only, selectinload
 
 
 # Association table for vendor-event assignments
@@ -13,6 +19,8 @@ vendor_events = db.Table('vendor_events',
     db.Column('assigned_at', db.DateTime, default=db.func.current_timestamp()),
     db.Column('partnership_status', db.String(20), nullable=False, server_default='accepted'),
     db.Column('partnership_confirmed_at', db.DateTime, nullable=True),
+    # Partners of an event by status (conversations, reviews, budget agreements)
+    db.Index('ix_vendor_events_event_status', 'event_id', 'partnership_status'),
 )
 
 vendor_completed_events = db.Table('vendor_completed_events',
@@ -39,6 +47,27 @@ def get_vendor_event_partnership_status(vendor_id, event_id):
     )
 
 
+def check_projection(model, fields=None, include=None):
+    """Raise ValueError naming any ``fields`` / ``include`` entry ``model.to_dict`` cannot render."""
+    unknown = set(fields or ()) - set(model.DICT_FIELDS) - set(model.DICT_RELATIONS)
+    unknown |= set(include or ()) - set(model.DICT_RELATIONS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+
+def _projection(model, fields, include):
+    """(scalar fields, relations) to render. Both None = everything, as before projections existed."""
+    check_projection(model, fields, include)
+    scalars = list(model.DICT_FIELDS) if fields is None else [f for f in model.DICT_FIELDS if f in fields]
+    if include is not None:
+        relations = [r for r in model.DICT_RELATIONS if r in include]
+    elif fields is None:
+        relations = list(model.DICT_RELATIONS)
+    else:
+        relations = [r for r in model.DICT_RELATIONS if r in fields]
+    return scalars, relations
+
+
 def get_accepted_vendor_id_for_event(event_id):
     """
     If any vendor has accepted (approved) partnership for this event, return that vendor's id.
@@ -77,6 +106,29 @@ def get_reserving_vendor_id_for_event(event_id):
     return int(row[0]) if row else None
 
 
+def get_reserving_vendor_ids_for_events(event_ids):
+    """Batch form of get_reserving_vendor_id_for_event: {event_id: vendor_id} in one grouped query."""
+    ids = [int(e) for e in event_ids or [] if e is not None]
+    if not ids:
+        return {}
+    rows = (
+        db.session.query(vendor_events.c.event_id, func.min(vendor_events.c.vendor_id))
+        .filter(
+            vendor_events.c.event_id.in_(ids),
+            vendor_events.c.partnership_status.in_(("pending", "accepted")),
+        )
+        .group_by(vendor_events.c.event_id)
+        .all()
+    )
+    return {int(eid): int(vid) for eid, vid in rows}
+
+
+def _initial_row_version():
+    # SQLite reuses the highest rowid after a delete; a random start keeps a reused id
+    # from finding the deleted row's cached dict
+    return secrets.randbelow(1 << 30)
+
+
 class User(db.Model):
     __tablename__ = "user"
 
@@ -95,6 +147,8 @@ class User(db.Model):
     is_verified = db.Column(db.Boolean, default=False)  # ✅ NEW
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    # Bumped on every change; keys the serialized-dict cache (app/fragment_cache.py)
+    row_version = db.Column(db.Integer, nullable=False, default=_initial_row_version, server_default="1")
 
     assigned_events = db.relationship(
         'Event',
@@ -132,28 +186,92 @@ class User(db.Model):
             return None
         return email
 
-    def to_dict(self):
-        events_out = []
-        for event in self.assigned_events or []:
-            if self.role == "vendor" and get_vendor_event_partnership_status(self.id, event.id) != "accepted":
-                continue
-            events_out.append(event.to_dict())
-        return {
-            "id": self.id,
-            "name": self.name,
-            "email": self.email,
-            "role": self.role,
-            "city": self.city,
-            "phone": self.phone,
-            "category": self.category,
-            "profile_image": self.profile_image,
-            "organizer_availability": self.organizer_availability,
-            "organizer_package_summary": self.organizer_package_summary,
-            "is_verified": self.is_verified,  # ✅ include in API responses
-            "is_active": self.is_active,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "assigned_events": events_out,
-        }
+    # to_dict(fields=, include=): scalar fields map 1:1 to columns; assigned_events is a relation
+    DICT_FIELDS = (
+        "id", "name", "email", "role", "city", "phone", "category", "profile_image",
+        "organizer_availability", "organizer_package_summary", "is_verified", "is_active", "created_at",
+    )
+    DICT_RELATIONS = ("assigned_events",)
+    # Lists and auth responses: no base64 image, no embedded events
+    SUMMARY_FIELDS = tuple(f for f in DICT_FIELDS if f != "profile_image")
+
+    @classmethod
+    def dict_load_options(cls, fields=None, include=None):
+        """Query options loading only what ``to_dict(fields, include)`` renders."""
+        scalars, relations = _projection(cls, fields, include)
+        columns = {"id", "role", "row_version", *scalars}  # role decides which assigned events are shown
+        options = [load_only(*(getattr(cls, c) for c in (*cls.DICT_FIELDS, "row_version") if c in columns))]
+        if "assigned_events" in relations:
+            options.append(selectinload(cls.assigned_events))
+        return options
+
+    def to_dict(self, fields=None, include=None):
+        """
+        Every field by default. ``fields`` limits the output to those names; ``include``
+        picks the relations to embed (only ``assigned_events``), and when omitted relations
+        are embedded only if named in ``fields``. ValueError on unknown names.
+        """
+        scalars, relations = _projection(User, fields, include)
+        # only the summary fields are cached: assigned events come from the Event cache, and
+        # profile_image (a base64 upload of up to 2 MB) is always read from the row
+        key, cached = lookup_fragment(self)
+        if cached is None:
+            cached = {name: getattr(self, name) for name in scalars if name != "profile_image"}
+            if "created_at" in cached:
+                cached["created_at"] = self.created_at.isoformat() if self.created_at else None
+            if len(cached) == len(User.SUMMARY_FIELDS):
+                store_fragment(key, cached)
+        out = {name: self.profile_image if name == "profile_image" else cached[name] for name in scalars}
+        if "assigned_events" in relations:
+            out["assigned_events"] = self._assigned_event_dicts()
+        return out
+
+    def _assigned_event_dicts(self):
+        events = list(self.assigned_events or [])
+        if self.role == "vendor" and events:
+            accepted = {
+                event_id
+                for (event_id,) in db.session.query(vendor_events.c.event_id).filter(
+                    vendor_events.c.vendor_id == self.id,
+                    vendor_events.c.partnership_status == "accepted",
+                )
+            }
+            events = [e for e in events if e.id in accepted]
+        return Event.to_dicts(events)
+
+
+# Event.to_dict field -> (columns read, getter(event, prefetched vendor data))
+_EVENT_DICT = {
+    "id": (("id",), lambda e, v: e.id),
+    "name": (("name",), lambda e, v: e.name),
+    "date": (("date",), lambda e, v: e.date),
+    "venue": (("venue",), lambda e, v: e.venue),
+    "budget": (("budget",), lambda e, v: e.budget),
+    "total_budget": (("budget",), lambda e, v: e.budget),
+    "total_spent": (("total_spent",), lambda e, v: e.total_spent or 0),
+    "remaining_budget": (
+        ("remaining_budget", "budget", "total_spent"),
+        lambda e, v: e.remaining_budget if e.remaining_budget is not None else (e.budget - (e.total_spent or 0)),
+    ),
+    "vendor_category": (("vendor_category",), lambda e, v: e.vendor_category),
+    "image_url": (("image_url",), lambda e, v: e.image_url),
+    "progress": (("progress",), lambda e, v: e.progress),
+    "status": (("status",), lambda e, v: e.status),
+    "organizer_advance_paid": (("organizer_advance_paid",), lambda e, v: bool(e.organizer_advance_paid)),
+    "organizer_final_requested": (("organizer_final_requested",), lambda e, v: bool(e.organizer_final_requested)),
+    "organizer_final_paid": (("organizer_final_paid",), lambda e, v: bool(e.organizer_final_paid)),
+    "user_id": (("user_id",), lambda e, v: e.user_id),
+    "organizer_id": (("organizer_id",), lambda e, v: e.organizer_id),
+    "organizer_name": (("organizer_id",), lambda e, v: e.organizer.name if e.organizer else None),
+    "organizer_status": (("organizer_status",), lambda e, v: e.organizer_status),
+    "assigned_vendors": ((), lambda e, v: [name for _, name in v["accepted"]]),
+    "assigned_vendor_ids": ((), lambda e, v: [vid for vid, _ in v["accepted"]]),
+    "partnership_pending_count": ((), lambda e, v: int(v["pending"] or 0)),
+    "completed_vendor_ids": ((), lambda e, v: [vid for vid, _ in v["completed"]]),
+    "completed_vendors": ((), lambda e, v: [{"id": vid, "name": name or "Vendor"} for vid, name in v["completed"]]),
+    "created_at": (("created_at",), lambda e, v: e.created_at.isoformat() if e.created_at else None),
+    "updated_at": (("updated_at",), lambda e, v: e.updated_at.isoformat() if e.updated_at else None),
+}
 
 
 class Event(db.Model):
@@ -192,60 +310,134 @@ class Event(db.Model):
         onupdate=datetime.utcnow,
         nullable=True,
     )
+    row_version = db.Column(db.Integer, nullable=False, default=_initial_row_version, server_default="1")
+
+    # to_dict(fields=): see _EVENT_DICT; vendor fields are served by prefetch_dict_relations
+    DICT_FIELDS = tuple(_EVENT_DICT)
+    DICT_RELATIONS = ()
+    VENDOR_FIELDS = frozenset(
+        ("assigned_vendors", "assigned_vendor_ids", "partnership_pending_count", "completed_vendor_ids", "completed_vendors")
+    )
 
     # Relationships
     creator = db.relationship('User', foreign_keys=[user_id], backref='events_created')
     organizer = db.relationship('User', foreign_keys=[organizer_id], backref='events_organized')
 
-    def to_dict(self):
-        # Only vendors who accepted the partnership count as "assigned" for most UI.
-        accepted_on_event = (
-            User.query.join(vendor_events, User.id == vendor_events.c.vendor_id)
+    @staticmethod
+    def prefetch_dict_relations(events):
+        """
+        Vendor data used by to_dict for many events in two queries:
+        {event_id: {"accepted": [(id, name)], "pending": int, "completed": [(id, name)]}}.
+        Only vendors who accepted the partnership count as "assigned" for most UI.
+        """
+        ids = [e.id for e in events if e.id is not None]
+        out = {eid: {"accepted": [], "pending": 0, "completed": []} for eid in ids}
+        if not ids:
+            return out
+        links = (
+            db.session.query(vendor_events.c.event_id, vendor_events.c.partnership_status, User.id, User.name)
+            .join(User, User.id == vendor_events.c.vendor_id)
             .filter(
-                vendor_events.c.event_id == self.id,
-                vendor_events.c.partnership_status == "accepted",
+                vendor_events.c.event_id.in_(ids),
+                vendor_events.c.partnership_status.in_(("accepted", "pending")),
             )
+            .order_by(vendor_events.c.event_id, User.id)
             .all()
         )
-        pending_count = (
-            db.session.query(func.count(vendor_events.c.vendor_id))
-            .filter(
-                vendor_events.c.event_id == self.id,
-                vendor_events.c.partnership_status == "pending",
-            )
-            .scalar()
-            or 0
+        for event_id, status, vendor_id, vendor_name in links:
+            if status == "accepted":
+                out[event_id]["accepted"].append((vendor_id, vendor_name))
+            else:
+                out[event_id]["pending"] += 1
+        completed = (
+            db.session.query(vendor_completed_events.c.event_id, User.id, User.name)
+            .join(User, User.id == vendor_completed_events.c.vendor_id)
+            .filter(vendor_completed_events.c.event_id.in_(ids))
+            .order_by(vendor_completed_events.c.event_id, User.id)
+            .all()
         )
-        return {
-            "id": self.id,
-            "name": self.name,
-            "date": self.date,
-            "venue": self.venue,
-            "budget": self.budget,
-            "total_budget": self.budget,
-            "total_spent": self.total_spent or 0,
-            "remaining_budget": self.remaining_budget if self.remaining_budget is not None else (self.budget - (self.total_spent or 0)),
-            "vendor_category": self.vendor_category,
-            "image_url": self.image_url,
-            "progress": self.progress,
-            "status": self.status,
-            "organizer_advance_paid": bool(self.organizer_advance_paid),
-            "organizer_final_requested": bool(self.organizer_final_requested),
-            "organizer_final_paid": bool(self.organizer_final_paid),
-            "user_id": self.user_id,
-            "organizer_id": self.organizer_id,
-            "organizer_name": self.organizer.name if self.organizer else None,
-            "organizer_status": self.organizer_status,
-            "assigned_vendors": [vendor.name for vendor in accepted_on_event],
-            "assigned_vendor_ids": [v.id for v in accepted_on_event],
-            "partnership_pending_count": int(pending_count or 0),
-            "completed_vendor_ids": [v.id for v in self.completed_by_vendors.all()],
-            "completed_vendors": [
-                {"id": v.id, "name": v.name or "Vendor"} for v in self.completed_by_vendors.all()
-            ],
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-        }
+        for event_id, vendor_id, vendor_name in completed:
+            out[event_id]["completed"].append((vendor_id, vendor_name))
+        return out
+
+    def to_dict(self, prefetched=None, fields=None):
+        """
+        ``prefetched``: this event's entry from prefetch_dict_relations (batch callers).
+        ``fields``: only these keys; the vendor lookups and the organizer load are skipped
+        unless a field needs them. ValueError on unknown names.
+        """
+        return self._to_dict(prefetched, fields, *lookup_fragment(self))
+
+    @staticmethod
+    def to_dicts(events, fields=None):
+        """``to_dict`` for many events; the cache misses share one prefetch_dict_relations call."""
+        looked_up = [(e, *lookup_fragment(e)) for e in events]
+        prefetched = {}
+        if fields is None or not Event.VENDOR_FIELDS.isdisjoint(fields):
+            prefetched = Event.prefetch_dict_relations([e for e, _, cached in looked_up if cached is None])
+        return [e._to_dict(prefetched.get(e.id), fields, key, cached) for e, key, cached in looked_up]
+
+    def _to_dict(self, prefetched, fields, key, cached):
+        names = Event.DICT_FIELDS if fields is None else _projection(Event, fields, None)[0]
+        if cached is not None:
+            return {name: cached[name] for name in names}
+        if prefetched is None:
+            if fields is None or not Event.VENDOR_FIELDS.isdisjoint(names):
+                prefetched = Event.prefetch_dict_relations([self]).get(self.id)
+            prefetched = prefetched or {"accepted": [], "pending": 0, "completed": []}
+        out = {name: _EVENT_DICT[name][1](self, prefetched) for name in names}
+        if fields is None:
+            store_fragment(key, out)
+        return out
+
+    @classmethod
+    def dict_load_options(cls, fields=None):
+        """Query options loading only the columns (and organizer) ``to_dict(fields=...)`` reads."""
+        names = cls.DICT_FIELDS if fields is None else _projection(cls, fields, None)[0]
+        columns = {"id", "row_version"}.union(*(_EVENT_DICT[name][0] for name in names))
+        options = [load_only(*(getattr(cls, c) for c in sorted(columns)))]
+        if "organizer_name" in names:
+            options.append(joinedload(cls.organizer).load_only(User.id, User.name))
+        return options
+
+
+def event_recency_expr():
+    """Last activity time used to order event lists (matches the recency indexes)."""
+    return func.coalesce(Event.updated_at, Event.created_at)
+
+
+class _DescNullsLast(ColumnElement):
+    """``expr DESC NULLS LAST``; plain ``DESC`` where NULLs already sort last and the syntax is rejected in indexes."""
+
+    inherit_cache = True
+    _traverse_internals = [("element", InternalTraversal.dp_clauseelement)]
+
+    def __init__(self, element):
+        self.element = element
+        self.type = element.type
+
+
+@compiles(_DescNullsLast)
+def _desc_nulls_last(element, compiler, **kw):
+    return compiler.process(element.element.desc().nulls_last(), **kw)
+
+
+@compiles(_DescNullsLast, "sqlite")
+@compiles(_DescNullsLast, "mysql")
+def _desc_nulls_smallest(element, compiler, **kw):
+    return compiler.process(element.element.desc(), **kw)
+
+
+def event_recency_order():
+    """Newest activity first, events without timestamps last; the same on every engine and in the indexes."""
+    return _DescNullsLast(event_recency_expr())
+
+
+# Dashboard lists: WHERE user_id / organizer_id = ? ORDER BY recency DESC NULLS LAST, id DESC
+db.Index("ix_event_user_recency", Event.user_id, event_recency_order(), Event.id.desc())
+db.Index("ix_event_organizer_recency", Event.organizer_id, event_recency_order(), Event.id.desc())
+# Open-events feed / badge: status = 'created' AND organizer_id IS NULL
+db.Index("ix_event_status_organizer", Event.status, Event.organizer_id)
 
 
 class EventApplication(db.Model):
@@ -259,7 +451,11 @@ class EventApplication(db.Model):
     status = db.Column(db.String(20), default="pending")  # pending, accepted, rejected (other applicant chosen), declined (host declined, may re-apply)
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
 
-    __table_args__ = (db.UniqueConstraint("event_id", "organizer_id", name="uq_event_application_event_organizer"),)
+    __table_args__ = (
+        db.UniqueConstraint("event_id", "organizer_id", name="uq_event_application_event_organizer"),
+        # "My applications" for an organizer, filtered by status
+        db.Index("ix_event_application_organizer_status", "organizer_id", "status"),
+    )
 
     event = db.relationship("Event", backref=db.backref("applications", lazy="dynamic"))
     organizer = db.relationship("User", backref=db.backref("event_applications", lazy="dynamic"))
@@ -281,6 +477,7 @@ class EventApplication(db.Model):
 
 class PaymentRequest(db.Model):
     __tablename__ = "payment_request"
+    __table_args__ = (db.Index("ix_payment_request_event_vendor", "event_id", "vendor_id"),)
     
     id = db.Column(db.Integer, primary_key=True)
     event_id = db.Column(db.Integer, db.ForeignKey('event.id'), nullable=False)
@@ -363,6 +560,12 @@ class BudgetPlanItem(db.Model):
 
 class Payment(db.Model):
     __tablename__ = "payment"
+    __table_args__ = (
+        # Budget summary / ledger: event_id = ? AND status = 'completed' AND payment_type IN (...)
+        db.Index("ix_payment_event_status_type", "event_id", "status", "payment_type"),
+        # Vendor earnings and admin user summary
+        db.Index("ix_payment_vendor_status", "vendor_id", "status"),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     event_id = db.Column(db.Integer, db.ForeignKey('event.id'), nullable=False)
@@ -448,6 +651,14 @@ class Review(db.Model):
 
 class ChatMessage(db.Model):
     __tablename__ = "chat_message"
+    __table_args__ = (
+        # Unread badge / mark-read: receiver_id = ? AND is_read = false
+        db.Index("ix_chat_message_receiver_read", "receiver_id", "is_read"),
+        # Event thread and last message per event: event_id = ? ORDER BY created_at
+        db.Index("ix_chat_message_event_created", "event_id", "created_at"),
+        # Direct conversation between two users, newest first
+        db.Index("ix_chat_message_pair_created", "sender_id", "receiver_id", "created_at"),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     sender_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -476,6 +687,32 @@ class ChatMessage(db.Model):
         }
 
 
+class ChatUnreadCounter(db.Model):
+    """Unread chat messages per (receiver, event); maintained by app.badge_counters."""
+    __tablename__ = "chat_unread_counter"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), primary_key=True)
+    event_id = db.Column(db.Integer, primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class UserBadgeCounter(db.Model):
+    """Per-user badge totals (one primary-key read for the /api/badges poll)."""
+    __tablename__ = "user_badge_counter"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), primary_key=True)
+    chat_unread = db.Column(db.Integer, nullable=False, default=0)
+
+
+class ResourceVersion(db.Model):
+    """Write counter per table, bumped by the committing transaction; the ETag source in app.conditional."""
+    __tablename__ = "resource_version"
+
+    name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
 class OrganizerPaymentRequest(db.Model):
     """Organizer requests payment from event owner (Phase 3 professional flow)."""
     __tablename__ = "organizer_payment_request"
@@ -539,33 +776,39 @@ class ServicePackage(db.Model):
     __tablename__ = "service_package"
     
     id = db.Column(db.Integer, primary_key=True)
-    service_id = db.Column(db.Integer, db.ForeignKey('service.id'), nullable=False)
+    service_id = db.Column(db.Integer, db.ForeignKey('service.id'), nullable=False, index=True)
     package_name = db.Column(db.String(200), nullable=False)
     price = db.Column(db.Float, nullable=False)
     duration = db.Column(db.String(100))
-    features = db.Column(db.Text)
+    features = db.Column(db.JSON)  # list[str]
     
     def to_dict(self):
         return {
             "packageName": self.package_name,
             "price": self.price,
             "duration": self.duration,
-            "features": eval(self.features) if self.features else []
+            "features": self.features or []
         }
 
 class Service(db.Model):
     __tablename__ = "service"
+    # Catalog browsing: equality filters first, then (base_price, id) for range + keyset order
+    __table_args__ = (
+        db.Index("ix_service_catalog_category", "is_active", "category", "event_type", "base_price", "id"),
+        db.Index("ix_service_catalog_event_type", "is_active", "event_type", "base_price", "id"),
+        db.Index("ix_service_catalog_price", "is_active", "base_price", "id"),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    vendor_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    vendor_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     name = db.Column(db.String(200), nullable=False)
     category = db.Column(db.String(100), nullable=False)
     event_type = db.Column(db.String(100), nullable=False)
     base_price = db.Column(db.Float, nullable=False)
     description = db.Column(db.Text)
     location = db.Column(db.String(200))
-    availability = db.Column(db.Text)
-    portfolio_images = db.Column(db.Text)
+    availability = db.Column(db.JSON)  # list of date strings
+    portfolio_images = db.Column(db.JSON)  # list of image URLs
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())  # ✅ CHANGE THIS LINE
     
@@ -581,8 +824,8 @@ class Service(db.Model):
             "basePrice": self.base_price,
             "description": self.description,
             "location": self.location,
-            "availability": eval(self.availability) if self.availability else [],
-            "portfolioImages": eval(self.portfolio_images) if self.portfolio_images else [],
+            "availability": self.availability or [],
+            "portfolioImages": self.portfolio_images or [],
             "isActive": self.is_active,
             "packages": [pkg.to_dict() for pkg in self.packages],
             "vendor_id": self.vendor_id
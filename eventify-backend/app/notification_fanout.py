@@ -0,0 +1,148 @@
+"""Background fan-out of vendor service changes to the organizers of linked events.
+
+Request handlers call ``publish_service_change`` after commit and return at once.
+A daemon worker holds each vendor's changes for ``NOTIFICATION_COALESCE_SECONDS``
+(from the first change), then resolves every recipient for all due vendors in one
+query and appends the notifications in one batch. Several edits by the same vendor
+inside the window become a single notification per organizer.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+from app.extensions import db
+from app.models import Event, User, vendor_events
+
+
+class ServiceChangeFanout:
+    def __init__(self):
+        self._cond = threading.Condition()
+        # vendor_id -> {"due": monotonic deadline, "changes": {service_id: (change, service_name)}}
+        self._pending = {}
+        self._thread = None
+        self._pid = None
+        self._app = None
+
+    def publish(self, app, vendor_id, service_id, service_name, change):
+        """Queue a ``created`` / ``updated`` change for a vendor's service."""
+        window = float(app.config.get("NOTIFICATION_COALESCE_SECONDS", 5))
+        with self._cond:
+            self._ensure_worker(app)
+            batch = self._pending.get(int(vendor_id))
+            if batch is None:
+                batch = self._pending[int(vendor_id)] = {"due": time.monotonic() + window, "changes": {}}
+            prev = batch["changes"].get(service_id)
+            # created then edited inside the window is still news of a new service
+            if prev and prev[0] == "created":
+                change = "created"
+            batch["changes"][service_id] = (change, service_name)
+            self._cond.notify()
+
+    def pending_count(self):
+        """Vendors whose changes are waiting for their coalescing window."""
+        with self._cond:
+            return len(self._pending)
+
+    def flush(self):
+        """Deliver everything pending now, ignoring the window (tests, shutdown)."""
+        with self._cond:
+            batches, self._pending = self._pending, {}
+            app = self._app
+        if batches and app is not None:
+            self._deliver(app, batches)
+
+    def _ensure_worker(self, app):
+        # Called with the lock held. A forked worker process inherits neither the
+        # thread nor a usable lock owner, so restart per pid.
+        self._app = app
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        if self._pid != os.getpid():
+            self._pending = {}
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name="notification-fanout", daemon=True)
+        self._thread.start()
+
+    def _take_due(self):
+        with self._cond:
+            while True:
+                if not self._pending:
+                    self._cond.wait()
+                    continue
+                now = time.monotonic()
+                due = {v: b for v, b in self._pending.items() if b["due"] <= now}
+                if due:
+                    for v in due:
+                        del self._pending[v]
+                    return self._app, due
+                self._cond.wait(min(b["due"] for b in self._pending.values()) - now)
+
+    def _run(self):
+        while True:
+            app, batches = self._take_due()
+            try:
+                self._deliver(app, batches)
+            except Exception as ex:
+                app.logger.warning("notification fan-out failed: %s", ex)
+
+    def _deliver(self, app, batches):
+        from app.api.payments import create_notifications
+
+        with app.app_context():
+            try:
+                rows = (
+                    db.session.query(vendor_events.c.vendor_id, User.name, Event.user_id)
+                    .join(Event, Event.id == vendor_events.c.event_id)
+                    .join(User, User.id == vendor_events.c.vendor_id)
+                    .filter(vendor_events.c.vendor_id.in_(list(batches)))
+                    .distinct()
+                    .all()
+                )
+            finally:
+                db.session.remove()
+
+        recipients = {}
+        vendor_names = {}
+        for vendor_id, vendor_name, owner_id in rows:
+            vendor_names[vendor_id] = vendor_name
+            if owner_id is not None:
+                recipients.setdefault(vendor_id, set()).add(owner_id)
+
+        items = []
+        for vendor_id, batch in batches.items():
+            title, message = _summarize(vendor_names.get(vendor_id, "A vendor"), batch["changes"])
+            for org_id in sorted(recipients.get(vendor_id, ())):
+                items.append({
+                    "user_id": org_id,
+                    "title": title,
+                    "message": message,
+                    "type": "service_update",
+                    "extra_data": {"vendor_id": vendor_id, "service_ids": list(batch["changes"])},
+                })
+        if items:
+            create_notifications(items)
+
+
+def _summarize(vendor_name, changes):
+    if len(changes) == 1:
+        change, service_name = next(iter(changes.values()))
+        if change == "created":
+            return "🆕 New Service Added", f"Vendor '{vendor_name}' added a new service: {service_name}"
+        return "📝 Service Updated", f"Vendor '{vendor_name}' updated their service: {service_name}"
+    names = ", ".join(name for _, name in changes.values())
+    if all(change == "created" for change, _ in changes.values()):
+        return "🆕 New Services Added", f"Vendor '{vendor_name}' added {len(changes)} new services: {names}"
+    return "📝 Services Updated", f"Vendor '{vendor_name}' updated {len(changes)} services: {names}"
+
+
+fanout = ServiceChangeFanout()
+
+
+def publish_service_change(app, vendor_id, service_id, service_name, change):
+    fanout.publish(app, vendor_id, service_id, service_name, change)
+
+
+def flush():
+    fanout.flush()
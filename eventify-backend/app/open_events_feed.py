@@ -0,0 +1,98 @@
+"""Open events an organizer may apply to, and the cached sidebar badge count.
+
+An event is open when it has no organizer and status is ``created``. It is hidden
+from an organizer who already has a *pending* application (declined organizers may
+re-apply). That is a NOT EXISTS anti-join on event_application, so the query does
+not grow with an organizer's application history.
+
+Badge counts are kept in the shared cache (app/cache.py) per organizer for
+``OPEN_EVENTS_COUNT_TTL`` seconds. Any committed write to ``event`` or
+``event_application`` drops them in every worker. ``invalidate_open_events`` does
+the same for one organizer or all of them, for callers outside a session commit.
+"""
+from __future__ import annotations
+
+from flask import current_app
+from sqlalchemy import and_, exists
+
+from app.extensions import cache
+from app.models import Event, EventApplication
+
+
+def open_events_query(organizer_id: int):
+    """Events open to this organizer (status/organizer_id served by ix_event_status_organizer)."""
+    has_pending_application = exists().where(
+        and_(
+            EventApplication.event_id == Event.id,
+            EventApplication.organizer_id == organizer_id,
+            EventApplication.status == "pending",
+        )
+    )
+    return Event.query.filter(
+        Event.status == "created",
+        Event.organizer_id.is_(None),
+        ~has_pending_application,
+    )
+
+
+def _float_arg(args, key):
+    raw = args.get(key)
+    if raw in (None, ""):
+        return None
+    try:
+        return float(raw)
+    except (TypeError, ValueError):
+        raise ValueError(f"{key} must be a number")
+
+
+def apply_feed_filters(query, args):
+    """category (vendor_category), city (matched in venue), min_budget / max_budget. ValueError on bad numbers."""
+    category = (args.get("category") or "").strip()
+    if category:
+        query = query.filter(Event.vendor_category == category)
+    city = (args.get("city") or "").strip()
+    if city:
+        query = query.filter(Event.venue.ilike(f"%{city}%"))
+    min_budget = _float_arg(args, "min_budget")
+    if min_budget is not None:
+        query = query.filter(Event.budget >= min_budget)
+    max_budget = _float_arg(args, "max_budget")
+    if max_budget is not None:
+        query = query.filter(Event.budget <= max_budget)
+    return query
+
+
+def feed_page(query, after_id=None, limit=None):
+    """Newest first by id. Returns (events, next_after_id)."""
+    if after_id is not None:
+        query = query.filter(Event.id < int(after_id))
+    query = query.order_by(Event.id.desc())
+    if limit is None:
+        return query.all(), None
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, rows[-1].id
+
+
+def open_events_count(organizer_id: int) -> int:
+    """Badge count for an organizer, cached until invalidated or TTL expiry."""
+    ttl = float(current_app.config.get("OPEN_EVENTS_COUNT_TTL", 0) or 0)
+
+    def count():
+        return open_events_query(organizer_id).order_by(None).count()
+
+    if ttl <= 0:
+        return count()
+    return cache.get_or_set(
+        f"open_events_count:{organizer_id}",
+        count,
+        ttl=ttl,
+        tags=("open_events", f"open_events:{organizer_id}", Event.__tablename__, EventApplication.__tablename__),
+    )
+
+
+def invalidate_open_events(organizer_id=None) -> None:
+    """Drop one organizer's cached count, or every organizer's when called with no id."""
+    cache.invalidate_tags("open_events" if organizer_id is None else f"open_events:{int(organizer_id)}")
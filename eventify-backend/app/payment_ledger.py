@@ -0,0 +1,222 @@
+"""25% / 75% payment split and the per-(event, vendor) settlement state machine.
+
+The ``EventVendorAgreement`` row is the cached payment state for an event-vendor
+pair (``pending`` -> ``advance_paid`` -> ``completed``). Transitions are validated
+against that row instead of probing ``Payment`` for existing advance/final rows,
+so settling many vendors for one event costs one agreement query plus one flush.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy.orm import joinedload
+
+from app.extensions import db
+from app.models import Event, EventVendorAgreement, Payment
+
+ADVANCE_SHARE = 0.25
+FINAL_SHARE = 0.75
+
+# Payment types that count against an event budget (same rules as budget summary).
+BUDGET_PAYMENT_TYPES = ("advance", "final", "organizer_advance", "organizer_final")
+
+# payment_type -> (required agreement status, status after the payment)
+_VENDOR_TRANSITIONS = {
+    "advance": ("pending", "advance_paid"),
+    "final": ("advance_paid", "completed"),
+}
+
+
+def budget_payments_query(event_ids: Iterable[int]):
+    """Completed payments that count against the budgets of ``event_ids``."""
+    return Payment.query.filter(
+        Payment.event_id.in_(list(event_ids)),
+        Payment.status == "completed",
+        Payment.payment_type.in_(BUDGET_PAYMENT_TYPES),
+    )
+
+
+class PaymentTransitionError(ValueError):
+    """A vendor payment that the state machine (or budget) does not allow."""
+
+    def __init__(self, message: str, status_code: int = 400, vendor_id: Optional[int] = None):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.vendor_id = vendor_id
+
+    def to_dict(self) -> dict:
+        out = {"error": self.message}
+        if self.vendor_id is not None:
+            out["vendor_id"] = self.vendor_id
+        return out
+
+
+def split_amounts(total) -> tuple:
+    """Return (advance, final) for a total, each rounded to 2 decimals."""
+    total = float(total or 0)
+    return round(total * ADVANCE_SHARE, 2), round(total * FINAL_SHARE, 2)
+
+
+def classify_organizer_amount(budget, amount) -> Optional[str]:
+    """'advance' or 'final' when ``amount`` is the 25% / 75% organizer fee for ``budget``."""
+    total_budget = float(budget or 0)
+    if total_budget <= 0:
+        return None
+    paid = float(amount or 0)
+    advance_amt, final_amt = split_amounts(total_budget)
+    if abs(paid - advance_amt) < 0.01:
+        return "advance"
+    if abs(paid - final_amt) < 0.01:
+        return "final"
+    return None
+
+
+def load_agreements(event_id: int) -> dict:
+    """All agreements for an event keyed by vendor_id (vendor eager-loaded)."""
+    rows = (
+        EventVendorAgreement.query.options(joinedload(EventVendorAgreement.vendor))
+        .filter_by(event_id=event_id)
+        .all()
+    )
+    return {int(a.vendor_id): a for a in rows}
+
+
+def _validate_item(item: dict, agreements: dict, states: dict) -> tuple:
+    vendor_id = item.get("vendor_id")
+    payment_type = item.get("payment_type")
+    amount = item.get("amount")
+    if vendor_id is None or not payment_type or amount is None:
+        raise PaymentTransitionError("event_id, vendor_id, payment_type, and amount required")
+    try:
+        vendor_id = int(vendor_id)
+    except (TypeError, ValueError):
+        raise PaymentTransitionError("vendor_id must be an integer")
+    if payment_type not in _VENDOR_TRANSITIONS:
+        raise PaymentTransitionError("payment_type must be 'advance' or 'final'", vendor_id=vendor_id)
+
+    agreement = agreements.get(vendor_id)
+    if not agreement:
+        raise PaymentTransitionError(
+            "No vendor agreement found for this event-vendor. Set agreed price first.",
+            404,
+            vendor_id,
+        )
+    try:
+        amount = float(amount)
+    except (TypeError, ValueError):
+        raise PaymentTransitionError("amount must be a number", vendor_id=vendor_id)
+
+    advance_amt, final_amt = split_amounts(agreement.agreed_price)
+    state = states[vendor_id]
+    if payment_type == "advance":
+        if abs(amount - advance_amt) > 0.01:
+            raise PaymentTransitionError(
+                f"Advance must be exactly 25% (Rs. {advance_amt:,.2f})", vendor_id=vendor_id
+            )
+        if state != "pending":
+            raise PaymentTransitionError("Advance already paid for this vendor", vendor_id=vendor_id)
+    else:
+        if abs(amount - final_amt) > 0.01:
+            raise PaymentTransitionError(
+                f"Final must be exactly 75% (Rs. {final_amt:,.2f})", vendor_id=vendor_id
+            )
+        if state == "pending":
+            raise PaymentTransitionError(
+                "Must pay advance (25%) before final payment", vendor_id=vendor_id
+            )
+        if state == "completed":
+            raise PaymentTransitionError(
+                "Final payment already made for this vendor", vendor_id=vendor_id
+            )
+    return vendor_id, payment_type, amount, agreement
+
+
+def settle_vendor_payments(
+    event: Event,
+    items: Iterable[dict],
+    payment_method: str = "bank_transfer",
+    notes: Optional[str] = None,
+    agreements: Optional[dict] = None,
+) -> list:
+    """
+    Register advance/final vendor payments for one event, all or nothing.
+
+    Every item is validated against the agreement state (advancing it in memory so
+    an advance and a final for the same vendor may share a batch) and against the
+    remaining budget before anything is written. Payments are added to the session
+    and flushed; the caller commits. Returns the new ``Payment`` rows in item order.
+    """
+    items = list(items)
+    if not items:
+        raise PaymentTransitionError("payments array required")
+    if agreements is None:
+        agreements = load_agreements(event.id)
+    states = {vid: (a.payment_status or "pending") for vid, a in agreements.items()}
+
+    total_budget = float(event.budget or 0)
+    spent = float(event.total_spent or 0)
+    planned = []
+    for item in items:
+        vendor_id, payment_type, amount, agreement = _validate_item(item, agreements, states)
+        if spent + amount > total_budget:
+            raise PaymentTransitionError("Payment would exceed event budget", vendor_id=vendor_id)
+        spent += amount
+        states[vendor_id] = _VENDOR_TRANSITIONS[payment_type][1]
+        planned.append((vendor_id, payment_type, amount, agreement, item))
+
+    now = datetime.now()
+    payments = []
+    for vendor_id, payment_type, amount, agreement, item in planned:
+        payments.append(
+            Payment(
+                event_id=event.id,
+                vendor_id=vendor_id,
+                payment_type=payment_type,
+                amount=amount,
+                currency="PKR",
+                status="completed",
+                payment_method=item.get("payment_method") or payment_method,
+                payment_date=now,
+                notes=(item.get("notes") if "notes" in item else notes) or None,
+            )
+        )
+        agreement.payment_status = _VENDOR_TRANSITIONS[payment_type][1]
+    db.session.add_all(payments)
+
+    event.total_spent = spent
+    event.remaining_budget = total_budget - spent
+    db.session.flush()
+    return payments
+
+
+def build_event_ledger(event: Event, agreements: Optional[dict] = None) -> dict:
+    """Budget totals plus per-vendor advance/final state read from the agreement rows."""
+    if agreements is None:
+        agreements = load_agreements(event.id)
+    vendors = []
+    for a in sorted(agreements.values(), key=lambda r: r.id):
+        advance_amt, final_amt = split_amounts(a.agreed_price)
+        status = a.payment_status or "pending"
+        vendors.append({
+            "id": a.id,
+            "vendor_id": a.vendor_id,
+            "vendor_name": a.vendor.name if a.vendor else "Unknown",
+            "service_type": a.service_type or "General",
+            "agreed_price": a.agreed_price,
+            "advance_amount": advance_amt,
+            "final_amount": final_amt,
+            "advance_status": "paid" if status in ("advance_paid", "completed") else "pending",
+            "final_status": "paid" if status == "completed" else "pending",
+            "payment_status": status,
+        })
+    total_budget = float(event.budget or 0)
+    total_spent = float(event.total_spent or 0)
+    return {
+        "event_id": event.id,
+        "total_budget": total_budget,
+        "total_spent": total_spent,
+        "remaining_budget": total_budget - total_spent,
+        "vendor_agreements": vendors,
+    }
@@ -0,0 +1,174 @@
+"""Lazily built third-party clients (OpenAI, Groq, Stripe, outbound HTTP, Redis).
+
+Importing ``openai`` (pydantic, httpx) and ``stripe`` costs hundreds of
+milliseconds and tens of MB per worker. Nothing here imports them until a route
+first asks for the client. Each provider is built once per process. After a
+fork (gunicorn ``--preload``) the child drops the parent's instances and lock,
+so HTTP connection pools are never shared across processes. The modules stay
+imported in the child, so warming up in the master still pays off.
+
+``PROVIDER_WARMUP`` (e.g. ``openai,stripe``) builds providers during
+``create_app``; ``warmup()`` can also be called from a gunicorn ``post_fork`` hook.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+
+from flask import current_app, has_app_context
+
+logger = logging.getLogger(__name__)
+
+_UNSET = object()
+
+
+class LazyProvider:
+    def __init__(self, name, factory):
+        self.name = name
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._value = _UNSET
+
+    @property
+    def loaded(self):
+        return self._value is not _UNSET
+
+    def get(self):
+        value = self._value
+        if value is _UNSET:
+            with self._lock:
+                if self._value is _UNSET:
+                    self._value = self._factory(_config())
+                value = self._value
+        return value
+
+    def reset(self):
+        self._lock = threading.Lock()
+        self._value = _UNSET
+
+
+def _config():
+    if has_app_context():
+        return current_app.config
+    from app.config import Config
+
+    return {k: getattr(Config, k) for k in dir(Config) if k.isupper()}
+
+
+_registry = {}
+
+
+def register(name, factory):
+    """``factory(config)`` returns the client, or None when it is not configured."""
+    provider = _registry[name] = LazyProvider(name, factory)
+    return provider
+
+
+def get(name):
+    return _registry[name].get()
+
+
+def loaded():
+    """Names of providers built in this process."""
+    return sorted(name for name, p in _registry.items() if p.loaded)
+
+
+def warmup(names=None):
+    """Build the named providers now (all when ``names`` is None); returns what was built."""
+    built = []
+    for name in names if names is not None else list(_registry):
+        try:
+            _registry[name].get()
+            built.append(name)
+        except Exception as ex:
+            logger.warning("provider warmup %s failed: %s", name, ex)
+    return built
+
+
+def _reset_after_fork():
+    for provider in _registry.values():
+        provider.reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+# --- providers -------------------------------------------------------------
+
+
+def _openai(config):
+    key = config.get("OPENAI_API_KEY")
+    if not key:
+        return None
+    from openai import OpenAI
+
+    return OpenAI(api_key=key)
+
+
+def _chat_ai(config):
+    """(client, model, metrics service) for the assistant: Groq when configured, else OpenAI."""
+    groq_key = config.get("GROQ_API_KEY")
+    if groq_key:
+        from openai import OpenAI
+
+        return OpenAI(api_key=groq_key, base_url="https://api.groq.com/openai/v1"), "llama-3.1-8b-instant", "groq"
+    client = get("openai")
+    return (client, "gpt-3.5-turbo", "openai") if client else None
+
+
+def _stripe(config):
+    import stripe
+
+    stripe.api_key = config.get("STRIPE_SECRET_KEY")
+    return stripe
+
+
+def _http(config):
+    import requests
+
+    return requests
+
+
+def _redis(config):
+    url = config.get("REDIS_URL")
+    if not url:
+        return None
+    import redis
+
+    return redis.Redis.from_url(url)
+
+
+register("openai", _openai)
+register("chat_ai", _chat_ai)
+register("stripe", _stripe)
+register("http", _http)
+register("redis", _redis)
+
+
+def openai_client():
+    """OpenAI client, or None without OPENAI_API_KEY."""
+    return get("openai")
+
+
+def chat_ai():
+    """(client, model, service) for /api/chat/ask, or None when no AI key is set."""
+    return get("chat_ai")
+
+
+def stripe_sdk():
+    """The ``stripe`` module with ``api_key`` set."""
+    return get("stripe")
+
+
+def http():
+    """The ``requests`` module, imported on first outbound call."""
+    return get("http")
+
+
+def init_providers(app) -> None:
+    names = [n.strip() for n in (app.config.get("PROVIDER_WARMUP") or "").split(",") if n.strip()]
+    if names:
+        with app.app_context():
+            warmup(names)
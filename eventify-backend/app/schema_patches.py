@@ -1,114 +1,371 @@
-"""Apply lightweight DB patches when Alembic was not run (e.g. local SQLite)."""
+"""Apply lightweight DB patches when Alembic was not run (e.g. local SQLite).
 
-from sqlalchemy import inspect, text
+Patches are registered in order with ``@schema_patch(name)``; names are permanent.
+``run_schema_patches`` (called by ``create_app``) reads ``schema_patch_version``
+once and returns when every registered name is there, which is the normal boot.
+Otherwise one process takes the lease row in that table, runs each pending patch,
+then ``db.create_all()`` for tables no patch covers. A patch is recorded only if it
+succeeds, so a failed patch is retried on the next boot. The other workers wait
+for the lease and then find nothing left to do.
+
+Every ``ensure_*`` function can still be called directly with the app to re-run it.
+"""
+
+import functools
+import time
+import warnings
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, delete, exc, insert, inspect, select, text
 
 from .extensions import db
 
+# Kept out of the models' metadata, like alembic_version: drop_all() must not reset it
+schema_patch_version = Table(
+    "schema_patch_version",
+    MetaData(),
+    Column("name", String(100), primary_key=True),
+    Column("applied_at", DateTime, nullable=False),
+)
+_LEASE = "__lock__"
+_PATCHES = []  # (name, body) in registration order
 
-def ensure_user_organizer_columns(app) -> None:
-    """Add user.organizer_* columns if missing (matches models + migrations)."""
-    with app.app_context():
+
+def schema_patch(name):
+    """Register a patch body; the decorated ``ensure_*(app)`` runs it in an app context."""
+
+    def register(body):
+        _PATCHES.append((name, body))
+
+        @functools.wraps(body)
+        def run(app):
+            with app.app_context():
+                body()
+
+        run.patch_name = name
+        return run
+
+    return register
+
+
+def registered_patches():
+    return [name for name, _ in _PATCHES]
+
+
+def _applied_names():
+    """Names recorded in schema_patch_version, or None when the table does not exist yet."""
+    try:
+        with db.engine.connect() as conn:
+            return {name for (name,) in conn.execute(select(schema_patch_version.c.name))} - {_LEASE}
+    except exc.DBAPIError:
+        return None
+
+
+@contextmanager
+def _patch_lease(timeout):
+    """Hold the ``__lock__`` row; a lease older than ``timeout`` seconds is taken over."""
+    while True:
         try:
-            inspector = inspect(db.engine)
-            tables = inspector.get_table_names()
-            if "user" not in tables:
-                return
-            cols = {c["name"] for c in inspector.get_columns("user")}
             with db.engine.begin() as conn:
-                if "organizer_availability" not in cols:
-                    conn.execute(
-                        text(
-                            "ALTER TABLE user ADD COLUMN organizer_availability VARCHAR(32)"
-                        )
-                    )
-                if "organizer_package_summary" not in cols:
+                conn.execute(insert(schema_patch_version).values(name=_LEASE, applied_at=datetime.utcnow()))
+            break
+        except exc.IntegrityError:
+            with db.engine.begin() as conn:
+                taken_at = conn.execute(
+                    select(schema_patch_version.c.applied_at).where(schema_patch_version.c.name == _LEASE)
+                ).scalar()
+                if taken_at is not None and taken_at < datetime.utcnow() - timedelta(seconds=timeout):
+                    # the holder died mid-run; only the waiter that deletes this exact lease retries first
                     conn.execute(
-                        text(
-                            "ALTER TABLE user ADD COLUMN organizer_package_summary TEXT"
+                        delete(schema_patch_version).where(
+                            schema_patch_version.c.name == _LEASE, schema_patch_version.c.applied_at == taken_at
                         )
                     )
-        except Exception as ex:
-            app.logger.warning("ensure_user_organizer_columns: %s", ex)
+                    continue
+            time.sleep(0.2)
+    try:
+        yield
+    finally:
+        with db.engine.begin() as conn:
+            conn.execute(delete(schema_patch_version).where(schema_patch_version.c.name == _LEASE))
 
 
-def ensure_budget_plan_table(app) -> None:
-    """Create budget_plan_item if missing (matches models + migrations)."""
+def run_schema_patches(app) -> list:
+    """Apply pending patches exactly once across workers; returns the names applied by this call."""
+    if not app.config.get("SCHEMA_PATCHES_ENABLED", True):
+        return []
+    from app import models  # noqa: F401  (create_all needs every table registered)
+
+    names = registered_patches()
     with app.app_context():
-        try:
-            from app.models.models import BudgetPlanItem
+        applied = _applied_names()
+        if applied is not None and applied.issuperset(names):
+            return []
+
+        schema_patch_version.create(bind=db.engine, checkfirst=True)
+        done = []
+        with _patch_lease(float(app.config.get("SCHEMA_PATCH_LOCK_TIMEOUT", 120))):
+            applied = _applied_names() or set()
+            pending = [(name, body) for name, body in _PATCHES if name not in applied]
+            if not pending:
+                return done
+            for name, body in pending:
+                started = time.perf_counter()
+                try:
+                    body()
+                    db.session.commit()
+                except Exception as ex:
+                    db.session.rollback()
+                    app.logger.warning("schema patch %s failed, will retry on next start: %s", name, ex)
+                    continue
+                finally:
+                    db.session.remove()
+                with db.engine.begin() as conn:
+                    conn.execute(insert(schema_patch_version).values(name=name, applied_at=datetime.utcnow()))
+                done.append(name)
+                app.logger.info("schema patch %s applied in %.0f ms", name, (time.perf_counter() - started) * 1000)
+            # After the patches, so ones that backfill new tables still see them missing
+            db.create_all()
+        return done
+
 
-            BudgetPlanItem.__table__.create(bind=db.engine, checkfirst=True)
-        except Exception as ex:
-            app.logger.warning("ensure_budget_plan_table: %s", ex)
+@schema_patch("user_organizer_columns")
+def ensure_user_organizer_columns() -> None:
+    """Add user.organizer_* columns if missing (matches models + migrations)."""
+    inspector = inspect(db.engine)
+    tables = inspector.get_table_names()
+    if "user" not in tables:
+        return
+    cols = {c["name"] for c in inspector.get_columns("user")}
+    with db.engine.begin() as conn:
+        if "organizer_availability" not in cols:
+            conn.execute(
+                text(
+                    "ALTER TABLE user ADD COLUMN organizer_availability VARCHAR(32)"
+                )
+            )
+        if "organizer_package_summary" not in cols:
+            conn.execute(
+                text(
+                    "ALTER TABLE user ADD COLUMN organizer_package_summary TEXT"
+                )
+            )
 
 
-def ensure_vendor_events_partnership_columns(app) -> None:
+@schema_patch("budget_plan_table")
+def ensure_budget_plan_table() -> None:
+    """Create budget_plan_item if missing (matches models + migrations)."""
+    from app.models.models import BudgetPlanItem
+
+    BudgetPlanItem.__table__.create(bind=db.engine, checkfirst=True)
+
+
+@schema_patch("vendor_events_partnership_columns")
+def ensure_vendor_events_partnership_columns() -> None:
     """Add vendor_events partnership columns for approve-before-assign flow (SQLite / dev)."""
-    with app.app_context():
-        try:
-            inspector = inspect(db.engine)
-            tables = inspector.get_table_names()
-            if "vendor_events" not in tables:
-                return
-            cols = {c["name"] for c in inspector.get_columns("vendor_events")}
-            with db.engine.begin() as conn:
-                if "partnership_status" not in cols:
-                    conn.execute(
-                        text(
-                            "ALTER TABLE vendor_events ADD COLUMN partnership_status VARCHAR(20) NOT NULL DEFAULT 'accepted'"
-                        )
-                    )
-                    conn.execute(
-                        text(
-                            "UPDATE vendor_events SET partnership_status = 'accepted' "
-                            "WHERE partnership_status IS NULL OR TRIM(COALESCE(partnership_status, '')) = ''"
-                        )
-                    )
-                if "partnership_confirmed_at" not in cols:
-                    conn.execute(
-                        text(
-                            "ALTER TABLE vendor_events ADD COLUMN partnership_confirmed_at DATETIME"
-                        )
-                    )
-                    conn.execute(
-                        text(
-                            "UPDATE vendor_events SET partnership_confirmed_at = assigned_at "
-                            "WHERE partnership_status = 'accepted' AND partnership_confirmed_at IS NULL"
-                        )
-                    )
-        except Exception as ex:
-            app.logger.warning("ensure_vendor_events_partnership_columns: %s", ex)
+    inspector = inspect(db.engine)
+    tables = inspector.get_table_names()
+    if "vendor_events" not in tables:
+        return
+    cols = {c["name"] for c in inspector.get_columns("vendor_events")}
+    with db.engine.begin() as conn:
+        if "partnership_status" not in cols:
+            conn.execute(
+                text(
+                    "ALTER TABLE vendor_events ADD COLUMN partnership_status VARCHAR(20) NOT NULL DEFAULT 'accepted'"
+                )
+            )
+            conn.execute(
+                text(
+                    "UPDATE vendor_events SET partnership_status = 'accepted' "
+                    "WHERE partnership_status IS NULL OR TRIM(COALESCE(partnership_status, '')) = ''"
+                )
+            )
+        if "partnership_confirmed_at" not in cols:
+            conn.execute(
+                text(
+                    "ALTER TABLE vendor_events ADD COLUMN partnership_confirmed_at DATETIME"
+                )
+            )
+            conn.execute(
+                text(
+                    "UPDATE vendor_events SET partnership_confirmed_at = assigned_at "
+                    "WHERE partnership_status = 'accepted' AND partnership_confirmed_at IS NULL"
+                )
+            )
 
 
-def ensure_event_timestamps(app) -> None:
+@schema_patch("event_timestamps")
+def ensure_event_timestamps() -> None:
     """Add event.created_at / event.updated_at if missing (SQLite and others without Alembic)."""
-    with app.app_context():
-        try:
-            inspector = inspect(db.engine)
-            tables = inspector.get_table_names()
-            if "event" not in tables:
-                return
-            cols = {c["name"] for c in inspector.get_columns("event")}
-            with db.engine.begin() as conn:
-                if "created_at" not in cols:
-                    conn.execute(
-                        text("ALTER TABLE event ADD COLUMN created_at DATETIME")
-                    )
-                if "updated_at" not in cols:
-                    conn.execute(
-                        text("ALTER TABLE event ADD COLUMN updated_at DATETIME")
-                    )
-                conn.execute(
+    inspector = inspect(db.engine)
+    tables = inspector.get_table_names()
+    if "event" not in tables:
+        return
+    cols = {c["name"] for c in inspector.get_columns("event")}
+    with db.engine.begin() as conn:
+        if "created_at" not in cols:
+            conn.execute(
+                text("ALTER TABLE event ADD COLUMN created_at DATETIME")
+            )
+        if "updated_at" not in cols:
+            conn.execute(
+                text("ALTER TABLE event ADD COLUMN updated_at DATETIME")
+            )
+        conn.execute(
+            text(
+                "UPDATE event SET created_at = CURRENT_TIMESTAMP "
+                "WHERE created_at IS NULL"
+            )
+        )
+        conn.execute(
+            text(
+                "UPDATE event SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP) "
+                "WHERE updated_at IS NULL"
+            )
+        )
+
+
+_SERVICE_JSON_COLUMNS = (
+    ("service", ("availability", "portfolio_images")),
+    ("service_package", ("features",)),
+)
+
+
+@schema_patch("service_json_columns")
+def ensure_service_json_columns() -> None:
+    """Rewrite legacy ``str(list)`` service/package values as JSON (see service_json_columns migration)."""
+    from app.utils.jsonfast import dumps, loads, parse_legacy_literal
+
+    tables = set(inspect(db.engine).get_table_names())
+    with db.engine.begin() as conn:
+        for table, columns in _SERVICE_JSON_COLUMNS:
+            if table not in tables:
+                continue
+            for col in columns:
+                # Python reprs quote strings with ' ; JSON never starts a string that way.
+                rows = conn.execute(
                     text(
-                        "UPDATE event SET created_at = CURRENT_TIMESTAMP "
-                        "WHERE created_at IS NULL"
+                        f"SELECT id, {col} FROM {table} "
+                        f"WHERE {col} LIKE '%''%' OR {col} LIKE '%None%' OR {col} LIKE '%True%' OR {col} LIKE '%False%'"
                     )
-                )
-                conn.execute(
-                    text(
-                        "UPDATE event SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP) "
-                        "WHERE updated_at IS NULL"
+                ).fetchall()
+                for row_id, raw in rows:
+                    try:
+                        loads(raw)
+                        continue
+                    except ValueError:
+                        pass
+                    parsed = parse_legacy_literal(raw)
+                    conn.execute(
+                        text(f"UPDATE {table} SET {col} = :v WHERE id = :id"),
+                        {"v": dumps(parsed if parsed is not None else []), "id": row_id},
                     )
+
+
+def _existing_index_names(inspector, table_name) -> set:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", exc.SAWarning)
+        names = {ix["name"] for ix in inspector.get_indexes(table_name)}
+    if db.engine.dialect.name == "sqlite":
+        # The inspector skips expression indexes on SQLite, so checkfirst would miss them
+        with db.engine.connect() as conn:
+            names.update(
+                row[0]
+                for row in conn.execute(
+                    text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :t"), {"t": table_name}
                 )
-        except Exception as ex:
-            app.logger.warning("ensure_event_timestamps: %s", ex)
+            )
+    return names
+
+
+def _create_model_indexes(model_names) -> None:
+    """Create missing indexes declared on the given models (or plain ``db.Table`` objects)."""
+    from app.models import models as m
+
+    inspector = inspect(db.engine)
+    tables = set(inspector.get_table_names())
+    for name in model_names:
+        target = getattr(m, name)
+        table = getattr(target, "__table__", target)
+        if table.name not in tables:
+            continue
+        existing = _existing_index_names(inspector, table.name)
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=db.engine)
+
+
+@schema_patch("service_catalog_indexes")
+def ensure_service_catalog_indexes() -> None:
+    """Create the service catalog indexes on databases created before they existed."""
+    _create_model_indexes(("Service", "ServicePackage"))
+
+
+@schema_patch("event_indexes")
+def ensure_event_indexes() -> None:
+    """Create event recency (GET /api/events) and open-feed (status, organizer_id) indexes."""
+    _create_model_indexes(("Event",))
+
+
+@schema_patch("hot_path_indexes")
+def ensure_hot_path_indexes() -> None:
+    """Create the payment / chat / partnership / application indexes (hot_path_indexes migration)."""
+    _create_model_indexes(("Payment", "ChatMessage", "vendor_events", "EventApplication", "PaymentRequest"))
+
+
+@schema_patch("badge_counter_tables")
+def ensure_badge_counter_tables() -> None:
+    """Create chat_unread_counter / user_badge_counter and backfill them from chat_message once."""
+    from app.badge_counters import rebuild_chat_counters
+    from app.models.models import ChatUnreadCounter, UserBadgeCounter
+
+    tables = set(inspect(db.engine).get_table_names())
+    if "user" not in tables:
+        return
+    missing = {ChatUnreadCounter.__tablename__, UserBadgeCounter.__tablename__} - tables
+    if not missing:
+        return
+    ChatUnreadCounter.__table__.create(bind=db.engine, checkfirst=True)
+    UserBadgeCounter.__table__.create(bind=db.engine, checkfirst=True)
+    if "chat_message" in tables:
+        rebuild_chat_counters()
+        db.session.commit()
+
+
+@schema_patch("resource_version_table")
+def ensure_resource_version_table() -> None:
+    """Create resource_version (resource_versions migration), the ETag counters behind app.conditional."""
+    from app.models.models import ResourceVersion
+
+    ResourceVersion.__table__.create(bind=db.engine, checkfirst=True)
+
+
+@schema_patch("row_version_columns")
+def ensure_row_version_columns() -> None:
+    """Add user.row_version / event.row_version (row_versions migration) if missing."""
+    inspector = inspect(db.engine)
+    tables = inspector.get_table_names()
+    with db.engine.begin() as conn:
+        for table in ("user", "event"):
+            if table not in tables:
+                continue
+            if "row_version" not in {c["name"] for c in inspector.get_columns(table)}:
+                conn.execute(text(f'ALTER TABLE "{table}" ADD COLUMN row_version INTEGER NOT NULL DEFAULT 1'))
+
+
+@schema_patch("event_recency_nulls_last")
+def ensure_event_recency_nulls_last() -> None:
+    """Rebuild the event recency indexes as DESC NULLS LAST (event_recency_nulls_last migration)."""
+    if db.engine.dialect.name in ("sqlite", "mysql"):
+        return  # NULLs already sort last for DESC there; the indexes are unchanged
+    inspector = inspect(db.engine)
+    if "event" not in inspector.get_table_names():
+        return
+    existing = _existing_index_names(inspector, "event")
+    with db.engine.begin() as conn:
+        for name in ("ix_event_user_recency", "ix_event_organizer_recency"):
+            if name in existing:
+                conn.execute(text(f"DROP INDEX {name}"))
+    _create_model_indexes(("Event",))
@@ -0,0 +1,145 @@
+"""Opt-in per-request SQL instrumentation (``SQL_INSTRUMENTATION=1``).
+
+Engine events count every statement and its time while a request is active.
+Statements are fingerprinted: bound parameters are already ``?``, and expanded IN
+lists and literals are collapsed. A fingerprint that repeats at least
+``SQL_N_PLUS_ONE_THRESHOLD`` times in one request is flagged as an N+1 suspect.
+
+Each response gets a ``Server-Timing`` header (``db`` time and query count, plus
+total ``app`` time). Slow or N+1-suspect requests are logged, and per-endpoint
+totals are kept in memory for the admin report (``GET /api/admin/sql-report``).
+"""
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import Counter
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+from app.extensions import db
+
+_IN_LIST = re.compile(r"\((?:\s*(?:\?|%\(\w+\)s|:\w+)\s*,)+\s*(?:\?|%\(\w+\)s|:\w+)\s*\)")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_SPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Normalize a SQL statement so the same query shape maps to one string."""
+    text = _STRING.sub("?", statement)
+    text = _NUMBER.sub("?", text)
+    text = _IN_LIST.sub("(?)", text)
+    return _SPACE.sub(" ", text).strip()
+
+
+class SQLReport:
+    """Per-endpoint aggregates; the lock is held only to merge one finished request."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, endpoint, queries, db_ms, repeated):
+        with self._lock:
+            row = self._endpoints.setdefault(
+                endpoint,
+                {"requests": 0, "queries": 0, "max_queries": 0, "db_ms": 0.0, "n_plus_one": 0, "repeated": Counter()},
+            )
+            row["requests"] += 1
+            row["queries"] += queries
+            row["max_queries"] = max(row["max_queries"], queries)
+            row["db_ms"] += db_ms
+            if repeated:
+                row["n_plus_one"] += 1
+                row["repeated"].update(repeated)
+
+    def top(self, n=20, sort="db_ms"):
+        with self._lock:
+            rows = [
+                {
+                    "endpoint": endpoint,
+                    "requests": row["requests"],
+                    "queries": row["queries"],
+                    "avg_queries": round(row["queries"] / row["requests"], 2),
+                    "max_queries": row["max_queries"],
+                    "db_ms": round(row["db_ms"], 2),
+                    "avg_db_ms": round(row["db_ms"] / row["requests"], 2),
+                    "n_plus_one": row["n_plus_one"],
+                    "top_repeated": [{"sql": sql, "count": c} for sql, c in row["repeated"].most_common(3)],
+                }
+                for endpoint, row in self._endpoints.items()
+            ]
+        rows.sort(key=lambda r: r.get(sort, 0), reverse=True)
+        return rows[:n]
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+def sql_report():
+    """The current app's report, or None when instrumentation is off."""
+    return current_app.extensions.get("sql_report")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and has_request_context() and "sql_stats" in g:
+        context._sql_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_sql_started", None)
+    if started is None or not has_request_context() or "sql_stats" not in g:
+        return
+    elapsed = time.perf_counter() - started
+    stats = g.sql_stats
+    stats["count"] += 1
+    stats["seconds"] += elapsed
+    stats["fingerprints"][fingerprint(statement)] += 1
+
+
+def init_sql_instrumentation(app) -> None:
+    """Attach engine listeners and request hooks when ``SQL_INSTRUMENTATION`` is on."""
+    if not app.config.get("SQL_INSTRUMENTATION"):
+        return
+    with app.app_context():
+        engines = list(db.engines.values())  # primary plus binds such as the read replica
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    app.extensions["sql_report"] = SQLReport()
+
+    @app.before_request
+    def _start_sql_stats():
+        g.sql_stats = {"count": 0, "seconds": 0.0, "fingerprints": Counter(), "started": time.perf_counter()}
+
+    @app.after_request
+    def _finish_sql_stats(response):
+        stats = g.pop("sql_stats", None)
+        if stats is None:
+            return response
+        total_ms = (time.perf_counter() - stats["started"]) * 1000
+        db_ms = stats["seconds"] * 1000
+        threshold = int(app.config.get("SQL_N_PLUS_ONE_THRESHOLD", 5))
+        repeated = {sql: n for sql, n in stats["fingerprints"].items() if n >= threshold}
+        endpoint = request.endpoint or request.path
+
+        response.headers.add(
+            "Server-Timing", f'db;dur={db_ms:.1f};desc="{stats["count"]} queries", app;dur={total_ms:.1f}'
+        )
+        app.extensions["sql_report"].record(endpoint, stats["count"], db_ms, repeated)
+
+        if repeated:
+            worst_sql, worst_n = max(repeated.items(), key=lambda item: item[1])
+            app.logger.warning(
+                "N+1 suspect on %s %s: %d queries, %dx %s", request.method, endpoint, stats["count"], worst_n, worst_sql[:200]
+            )
+        if total_ms >= float(app.config.get("SQL_SLOW_REQUEST_MS", 500)):
+            app.logger.warning(
+                "Slow request %s %s: %.1f ms (%d queries, %.1f ms in DB)",
+                request.method, endpoint, total_ms, stats["count"], db_ms,
+            )
+        return response
@@ -1,3 +1,4 @@
 from app.utils.datetime_serialize import isoformat_utc_z
+from app.utils import jsonfast
 
-__all__ = ["isoformat_utc_z"]
+__all__ = ["isoformat_utc_z", "jsonfast"]
@@ -0,0 +1,66 @@
+"""Set-based UPDATE / DELETE helpers that report how many rows they touched.
+
+Use these instead of loading rows only to flip a field. They run in the current
+session transaction; the caller commits. ORM objects already loaded in the session
+are not refreshed (``synchronize_session=False``) unless a strategy is passed.
+Updates to models with a ``row_version`` column bump it, as an ORM flush would
+(see app/fragment_cache.py).
+"""
+from __future__ import annotations
+
+from typing import Sequence
+
+from sqlalchemy import delete, select, update
+
+from app.extensions import db
+
+
+def _supports(kind: str) -> bool:
+    return bool(getattr(db.session.get_bind().dialect, f"{kind}_returning", False))
+
+
+def _versioned_values(target, values: dict) -> dict:
+    row_version = getattr(target, "row_version", None)
+    if row_version is None:
+        return values
+    return {**values, row_version: row_version + 1}
+
+
+def bulk_update(target, values: dict, *criteria, synchronize_session=False) -> int:
+    """``UPDATE target SET values WHERE criteria``; returns the affected row count."""
+    stmt = update(target).where(*criteria).values(_versioned_values(target, values))
+    result = db.session.execute(stmt, execution_options={"synchronize_session": synchronize_session})
+    return result.rowcount
+
+
+def bulk_delete(target, *criteria, synchronize_session=False) -> int:
+    """``DELETE FROM target WHERE criteria``; returns the affected row count."""
+    stmt = delete(target).where(*criteria)
+    result = db.session.execute(stmt, execution_options={"synchronize_session": synchronize_session})
+    return result.rowcount
+
+
+def bulk_delete_returning(target, columns: Sequence, *criteria) -> list:
+    """
+    Delete matching rows and return ``columns`` of each deleted row.
+    Uses DELETE ... RETURNING where the dialect supports it, else SELECT then DELETE
+    in the same transaction.
+    """
+    if _supports("delete"):
+        stmt = delete(target).where(*criteria).returning(*columns)
+        return db.session.execute(stmt, execution_options={"synchronize_session": False}).all()
+    rows = db.session.execute(select(*columns).where(*criteria)).all()
+    if rows:
+        bulk_delete(target, *criteria)
+    return rows
+
+
+def bulk_update_returning(target, values: dict, columns: Sequence, *criteria) -> list:
+    """UPDATE counterpart of ``bulk_delete_returning``."""
+    if _supports("update"):
+        stmt = update(target).where(*criteria).values(_versioned_values(target, values)).returning(*columns)
+        return db.session.execute(stmt, execution_options={"synchronize_session": False}).all()
+    rows = db.session.execute(select(*columns).where(*criteria)).all()
+    if rows:
+        bulk_update(target, values, *criteria)
+    return rows
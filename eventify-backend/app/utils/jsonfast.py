@@ -0,0 +1,51 @@
+"""Fast JSON encode/decode (orjson when installed, stdlib json otherwise)."""
+from __future__ import annotations
+
+import ast
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+
+def dumps(value: Any) -> str:
+    """Serialize to a JSON ``str`` (used as the SQLAlchemy JSON column serializer)."""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def loads(value):
+    """Parse JSON from ``str`` / ``bytes``."""
+    if orjson is not None:
+        return orjson.loads(value)
+    return json.loads(value)
+
+
+def parse_legacy_literal(value):
+    """
+    Parse a stored value that is either JSON or a legacy ``str(list)`` Python literal
+    (e.g. ``"['a', 'b']"``). Uses ``ast.literal_eval``, never ``eval``. Returns None if
+    neither form parses.
+    """
+    if value is None or isinstance(value, (list, dict)):
+        return value
+    try:
+        return loads(value)
+    except ValueError:
+        pass
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+        return None
+
+
+def loads_column(value):
+    """JSON column deserializer; tolerates rows not yet rewritten by the backfill."""
+    try:
+        return loads(value)
+    except ValueError:
+        return parse_legacy_literal(value)
@@ -0,0 +1,39 @@
+"""Opaque keyset-pagination cursors (URL-safe base64 of a JSON array of sort-key values)."""
+from __future__ import annotations
+
+import base64
+from typing import Optional, Sequence
+
+from app.utils import jsonfast
+
+
+def encode_cursor(values: Sequence) -> str:
+    """Encode the sort-key values of the last row on a page."""
+    raw = jsonfast.dumps(list(values)).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: Optional[str], size: int) -> Optional[list]:
+    """
+    Decode a cursor made by ``encode_cursor``. Returns None for an empty token and
+    raises ValueError when the token is malformed or does not hold ``size`` values.
+    """
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = jsonfast.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError, UnicodeError) as ex:
+        raise ValueError("Invalid cursor") from ex
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def parse_limit(value, default: int = 20, maximum: int = 100) -> int:
+    """Clamp a ``limit`` query arg to 1..maximum (default when missing/invalid)."""
+    try:
+        n = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(n, maximum))
@@ -0,0 +1,26 @@
+"""``?fields=`` / ``?include=`` query arguments for the model ``to_dict`` projections."""
+from __future__ import annotations
+
+from typing import Optional, Sequence, Tuple
+
+
+def _names(value) -> Optional[Tuple[str, ...]]:
+    if value is None:
+        return None
+    return tuple(n.strip() for n in value.split(",") if n.strip())
+
+
+def parse_projection(args, model, default_fields: Optional[Sequence[str]] = None, default_include=None):
+    """
+    (fields, include) for ``model.to_dict`` from the request args, falling back to the
+    endpoint's defaults (None = everything). An empty ``?include=`` embeds no relations.
+    Raises ValueError naming unknown fields.
+    """
+    from app.models.models import check_projection
+
+    fields = _names(args.get("fields"))
+    include = _names(args.get("include"))
+    fields = default_fields if fields is None else fields
+    include = default_include if include is None else include
+    check_projection(model, fields, include)
+    return fields, include
@@ -90,9 +90,14 @@ def run_migrations_online():
                 directives[:] = []
                 logger.info('No changes in schema detected.')
 
+    # bookkeeping of app/schema_patches.py, not part of the models
+    def include_object(object, name, type_, reflected, compare_to):
+        return not (type_ == "table" and name == "schema_patch_version")
+
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_object", include_object)
 
     connectable = get_engine()
 
@@ -0,0 +1,48 @@
+"""chat_unread_counter and user_badge_counter, backfilled from chat_message
+
+Revision ID: badge_counters
+Revises: event_open_feed_index
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "badge_counters"
+down_revision = "event_open_feed_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "chat_unread_counter",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("event_id", sa.Integer(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+        sa.PrimaryKeyConstraint("user_id", "event_id"),
+    )
+    op.create_table(
+        "user_badge_counter",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("chat_unread", sa.Integer(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"]),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    op.execute(
+        "INSERT INTO chat_unread_counter (user_id, event_id, count) "
+        "SELECT receiver_id, event_id, COUNT(*) FROM chat_message "
+        "WHERE is_read = false GROUP BY receiver_id, event_id"
+    )
+    op.execute(
+        "INSERT INTO user_badge_counter (user_id, chat_unread) "
+        "SELECT receiver_id, COUNT(*) FROM chat_message "
+        "WHERE is_read = false GROUP BY receiver_id"
+    )
+
+
+def downgrade():
+    op.drop_table("user_badge_counter")
+    op.drop_table("chat_unread_counter")
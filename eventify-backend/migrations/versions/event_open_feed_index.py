@@ -0,0 +1,29 @@
+"""event (status, organizer_id) index for the organizer open-events feed
+
+Revision ID: event_open_feed_index
+Revises: event_recency_indexes
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "event_open_feed_index"
+down_revision = "event_recency_indexes"
+branch_labels = None
+depends_on = None
+
+
+def _index_names(conn):
+    return {ix["name"] for ix in sa.inspect(conn).get_indexes("event")}
+
+
+def upgrade():
+    if "ix_event_status_organizer" not in _index_names(op.get_bind()):
+        op.create_index("ix_event_status_organizer", "event", ["status", "organizer_id"], unique=False)
+
+
+def downgrade():
+    if "ix_event_status_organizer" in _index_names(op.get_bind()):
+        op.drop_index("ix_event_status_organizer", table_name="event")
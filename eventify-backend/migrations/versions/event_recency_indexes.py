@@ -0,0 +1,43 @@
+"""event (user_id | organizer_id, coalesce(updated_at, created_at) desc, id desc) indexes
+
+Revision ID: event_recency_indexes
+Revises: service_catalog_indexes
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "event_recency_indexes"
+down_revision = "service_catalog_indexes"
+branch_labels = None
+depends_on = None
+
+
+def _recency(conn):
+    """Events without timestamps sort last; SQLite and MySQL do that for DESC and reject NULLS LAST in an index."""
+    if conn.dialect.name in ("sqlite", "mysql"):
+        return sa.text("coalesce(updated_at, created_at) DESC")
+    return sa.text("coalesce(updated_at, created_at) DESC NULLS LAST")
+
+
+def _index_names(conn):
+    return {ix["name"] for ix in sa.inspect(conn).get_indexes("event")}
+
+
+def upgrade():
+    conn = op.get_bind()
+    existing = _index_names(conn)
+    if "ix_event_user_recency" not in existing:
+        op.create_index("ix_event_user_recency", "event", ["user_id", _recency(conn), sa.text("id DESC")])
+    if "ix_event_organizer_recency" not in existing:
+        op.create_index("ix_event_organizer_recency", "event", ["organizer_id", _recency(conn), sa.text("id DESC")])
+
+
+def downgrade():
+    existing = _index_names(op.get_bind())
+    if "ix_event_organizer_recency" in existing:
+        op.drop_index("ix_event_organizer_recency", table_name="event")
+    if "ix_event_user_recency" in existing:
+        op.drop_index("ix_event_user_recency", table_name="event")
@@ -0,0 +1,39 @@
+"""event recency indexes ordered DESC NULLS LAST, matching GET /api/events
+
+Revision ID: event_recency_nulls_last
+Revises: row_versions
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "event_recency_nulls_last"
+down_revision = "row_versions"
+branch_labels = None
+depends_on = None
+
+
+_INDEXES = (("ix_event_user_recency", "user_id"), ("ix_event_organizer_recency", "organizer_id"))
+
+
+def _rebuild(nulls):
+    # SQLite and MySQL already sort NULLs last for DESC (and reject NULLS LAST in an index)
+    if op.get_bind().dialect.name in ("sqlite", "mysql"):
+        return
+    existing = {ix["name"] for ix in sa.inspect(op.get_bind()).get_indexes("event")}
+    for name, column in _INDEXES:
+        if name in existing:
+            op.drop_index(name, table_name="event")
+        op.create_index(
+            name, "event", [column, sa.text(f"coalesce(updated_at, created_at) DESC{nulls}"), sa.text("id DESC")]
+        )
+
+
+def upgrade():
+    _rebuild(" NULLS LAST")
+
+
+def downgrade():
+    _rebuild("")
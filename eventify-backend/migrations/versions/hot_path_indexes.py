@@ -0,0 +1,52 @@
+"""composite indexes for payment, chat, partnership, application and payment-request lookups
+
+Revision ID: hot_path_indexes
+Revises: badge_counters
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "hot_path_indexes"
+down_revision = "badge_counters"
+branch_labels = None
+depends_on = None
+
+
+# event.user_id / organizer_id / status are served by the recency and open-feed indexes
+_INDEXES = (
+    ("ix_payment_event_status_type", "payment", ["event_id", "status", "payment_type"]),
+    ("ix_payment_vendor_status", "payment", ["vendor_id", "status"]),
+    ("ix_chat_message_receiver_read", "chat_message", ["receiver_id", "is_read"]),
+    ("ix_chat_message_event_created", "chat_message", ["event_id", "created_at"]),
+    ("ix_chat_message_pair_created", "chat_message", ["sender_id", "receiver_id", "created_at"]),
+    ("ix_vendor_events_event_status", "vendor_events", ["event_id", "partnership_status"]),
+    ("ix_event_application_organizer_status", "event_application", ["organizer_id", "status"]),
+    ("ix_payment_request_event_vendor", "payment_request", ["event_id", "vendor_id"]),
+)
+
+
+def _existing_indexes(conn, table):
+    insp = sa.inspect(conn)
+    if table not in insp.get_table_names():
+        return None
+    return {ix["name"] for ix in insp.get_indexes(table)}
+
+
+def upgrade():
+    conn = op.get_bind()
+    for name, table, columns in _INDEXES:
+        existing = _existing_indexes(conn, table)
+        if existing is None or name in existing:
+            continue
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    conn = op.get_bind()
+    for name, table, _ in reversed(_INDEXES):
+        existing = _existing_indexes(conn, table)
+        if existing and name in existing:
+            op.drop_index(name, table_name=table)
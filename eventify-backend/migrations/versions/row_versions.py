@@ -0,0 +1,27 @@
+"""user.row_version / event.row_version: per-row change counters keying the serialized-dict cache
+
+Revision ID: row_versions
+Revises: resource_versions
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "row_versions"
+down_revision = "resource_versions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for table in ("user", "event"):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column("row_version", sa.Integer(), nullable=False, server_default="1"))
+
+
+def downgrade():
+    for table in ("event", "user"):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column("row_version")
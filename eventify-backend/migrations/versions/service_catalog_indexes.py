@@ -0,0 +1,49 @@
+"""indexes for the public service catalog (category/event_type/price keyset)
+
+Revision ID: service_catalog_indexes
+Revises: service_json_columns
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "service_catalog_indexes"
+down_revision = "service_json_columns"
+branch_labels = None
+depends_on = None
+
+
+_INDEXES = (
+    ("ix_service_catalog_category", "service", ["is_active", "category", "event_type", "base_price", "id"]),
+    ("ix_service_catalog_event_type", "service", ["is_active", "event_type", "base_price", "id"]),
+    ("ix_service_catalog_price", "service", ["is_active", "base_price", "id"]),
+    ("ix_service_vendor_id", "service", ["vendor_id"]),
+    ("ix_service_package_service_id", "service_package", ["service_id"]),
+)
+
+
+def _existing_indexes(conn, table):
+    insp = sa.inspect(conn)
+    if table not in insp.get_table_names():
+        return None
+    return {ix["name"] for ix in insp.get_indexes(table)}
+
+
+def upgrade():
+    conn = op.get_bind()
+    for name, table, columns in _INDEXES:
+        existing = _existing_indexes(conn, table)
+        # service tables come from db.create_all(), which already creates these indexes
+        if existing is None or name in existing:
+            continue
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    conn = op.get_bind()
+    for name, table, _ in reversed(_INDEXES):
+        existing = _existing_indexes(conn, table)
+        if existing and name in existing:
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,85 @@
+"""service availability/portfolio_images and package features as JSON
+
+Revision ID: service_json_columns
+Revises: event_table_timestamps
+Create Date: 2026-10-19
+
+"""
+import ast
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "service_json_columns"
+down_revision = "event_table_timestamps"
+branch_labels = None
+depends_on = None
+
+
+_COLUMNS = (
+    ("service", ("availability", "portfolio_images")),
+    ("service_package", ("features",)),
+)
+
+
+def _table_exists(conn, table):
+    return table in sa.inspect(conn).get_table_names()
+
+
+def _to_json(raw):
+    """Legacy rows hold str(list); parse with literal_eval (never eval) and re-encode."""
+    if raw is None:
+        return None
+    try:
+        json.loads(raw)
+        return raw
+    except ValueError:
+        pass
+    try:
+        value = ast.literal_eval(raw)
+    except (ValueError, SyntaxError):
+        value = []
+    return json.dumps(value)
+
+
+def upgrade():
+    conn = op.get_bind()
+    for table, columns in _COLUMNS:
+        # service tables are created by db.create_all() on fresh installs
+        if not _table_exists(conn, table):
+            continue
+        for col in columns:
+            rows = conn.execute(sa.text(f"SELECT id, {col} FROM {table}")).fetchall()
+            for row_id, raw in rows:
+                new = _to_json(raw)
+                if new != raw:
+                    conn.execute(
+                        sa.text(f"UPDATE {table} SET {col} = :v WHERE id = :id"),
+                        {"v": new, "id": row_id},
+                    )
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            for col in columns:
+                batch_op.alter_column(
+                    col,
+                    existing_type=sa.Text(),
+                    type_=sa.JSON(),
+                    existing_nullable=True,
+                    postgresql_using=f"{col}::json",
+                )
+
+
+def downgrade():
+    conn = op.get_bind()
+    for table, columns in _COLUMNS:
+        if not _table_exists(conn, table):
+            continue
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            for col in columns:
+                batch_op.alter_column(
+                    col,
+                    existing_type=sa.JSON(),
+                    type_=sa.Text(),
+                    existing_nullable=True,
+                )
@@ -1,10 +1,8 @@
 from app import create_app
-from app.extensions import db
 
+# create_app() creates missing tables and applies pending schema patches once
+# (app/schema_patches.py), so worker boots do not repeat DDL or backfills.
 app = create_app()
 
-with app.app_context():
-    db.create_all()
-
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000, debug=True)
@@ -0,0 +1,259 @@
+"""
+Replay a weighted mix of API traffic against the Flask test client and record
+p50/p95/p99 latency and SQL query counts per endpoint.
+
+Seed a database first (scripts/seed_synthetic.py), then from eventify-backend:
+    DATABASE_URL=sqlite:///bench.db python scripts/benchmark_endpoints.py
+    DATABASE_URL=sqlite:///bench.db python scripts/benchmark_endpoints.py --requests 500 --only list_events,get_vendors
+    DATABASE_URL=sqlite:///bench.db python scripts/benchmark_endpoints.py --baseline benchmarks/results/<sha>.json
+
+Results are written to benchmarks/results/<git-sha>.json (override with --out).
+With --baseline, p95 per scenario is compared and the exit status is 1 when any
+scenario is slower than --max-regression (a fraction, default 0.2 = 20%).
+Requests run in-process with no network, so the numbers are app + DB time only.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+_BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, _BACKEND_ROOT)
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event as sa_event
+from sqlalchemy import func
+
+from app import create_app
+from app.extensions import db
+from app.models import ChatMessage, Event, Payment, Review, User
+
+RESULTS_DIR = os.path.join(_BACKEND_ROOT, "benchmarks", "results")
+SAMPLE_SIZE = 200
+
+# name -> (weight, role whose token is used, path builder(rng, pools))
+SCENARIOS = {
+    "list_events:user": (20, "user", lambda rng, p: "/api/events"),
+    "list_events:organizer": (15, "organizer", lambda rng, p: "/api/events"),
+    "list_events:paged": (5, "user", lambda rng, p: "/api/events?limit=20"),
+    "get_vendors": (10, "organizer", lambda rng, p: "/api/vendors"),
+    "chat_inbox:user": (8, "user", lambda rng, p: "/api/chat/user/conversations"),
+    "chat_inbox:organizer": (8, "organizer", lambda rng, p: "/api/chat/organizer/conversations"),
+    "chat_inbox:vendor": (8, "vendor", lambda rng, p: "/api/chat/vendor/conversations"),
+    "chat_unread_count": (6, "user", lambda rng, p: "/api/chat/unread-count"),
+    "get_budget_summary": (10, "event_owner", lambda rng, p: f"/api/events/{p['event']}/budget-summary"),
+    "admin_overview": (2, "admin", lambda rng, p: "/api/admin/overview"),
+    "admin_users": (2, "admin", lambda rng, p: f"/api/admin/users?page={rng.randrange(1, 50)}"),
+    "admin_events": (2, "admin", lambda rng, p: f"/api/admin/events?page={rng.randrange(1, 50)}"),
+    "admin_payments": (2, "admin", lambda rng, p: f"/api/admin/payments?page={rng.randrange(1, 50)}"),
+    "admin_analytics": (1, "admin", lambda rng, p: "/api/admin/analytics"),
+}
+
+
+class QueryCounter:
+    """Counts statements on the engine; the harness is single-threaded."""
+
+    def __init__(self, engine):
+        self.count = 0
+        sa_event.listen(engine, "after_cursor_execute", self._after)
+
+    def _after(self, *_args):
+        self.count += 1
+
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _git(*args):
+    try:
+        return subprocess.run(
+            ["git", *args], cwd=_BACKEND_ROOT, capture_output=True, text=True, timeout=10, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _sample_ids(query, n):
+    return [row[0] for row in query.order_by(func.random()).limit(n)]
+
+
+def build_pools(rng):
+    """Sample users per role and owned events; tokens are minted once per identity."""
+    pools = {role: _sample_ids(db.session.query(User.id).filter_by(role=role, is_active=True), SAMPLE_SIZE)
+             for role in ("user", "organizer", "vendor", "admin")}
+    pools["event_owner"] = [
+        (owner, eid)
+        for eid, owner in db.session.query(Event.id, Event.user_id)
+        .filter(Event.organizer_id.isnot(None))
+        .order_by(func.random())
+        .limit(SAMPLE_SIZE)
+    ]
+    tokens = {}
+    for role, ids in pools.items():
+        for item in ids:
+            uid = item[0] if role == "event_owner" else item
+            tokens.setdefault(uid, create_access_token(identity=str(uid)))
+    return pools, tokens
+
+
+def dataset_summary():
+    return {
+        "dialect": db.engine.dialect.name,
+        "users": db.session.query(func.count(User.id)).scalar(),
+        "events": db.session.query(func.count(Event.id)).scalar(),
+        "chat_messages": db.session.query(func.count(ChatMessage.id)).scalar(),
+        "payments": db.session.query(func.count(Payment.id)).scalar(),
+        "reviews": db.session.query(func.count(Review.id)).scalar(),
+    }
+
+
+def run_benchmark(app, requests=2000, warmup=50, seed=42, only=None):
+    """Replay ``requests`` weighted requests; returns the results document (without writing it)."""
+    rng = random.Random(seed)
+    scenarios = {name: spec for name, spec in SCENARIOS.items() if not only or name in only or name.split(":")[0] in only}
+    with app.app_context():
+        pools, tokens = build_pools(rng)
+        summary = dataset_summary()
+        counter = QueryCounter(db.engine)
+        db.session.remove()
+    runnable = {name: spec for name, spec in scenarios.items() if pools.get(spec[1])}
+    if not runnable:
+        raise SystemExit("No scenario has identities to run as; seed the database first")
+
+    names = list(runnable)
+    weights = [runnable[n][0] for n in names]
+    samples = {name: {"latency": [], "queries": [], "errors": 0, "statuses": {}} for name in names}
+    client = app.test_client()
+
+    for i in range(warmup + requests):
+        name = rng.choices(names, weights=weights)[0]
+        _, role, path_for = runnable[name]
+        picked = rng.choice(pools[role])
+        if role == "event_owner":
+            uid, eid = picked
+            path = path_for(rng, {"event": eid})
+        else:
+            uid = picked
+            path = path_for(rng, pools)
+        headers = {"Authorization": f"Bearer {tokens[uid]}"}
+
+        counter.count = 0
+        started = time.perf_counter()
+        response = client.get(path, headers=headers)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if i < warmup:
+            continue
+        row = samples[name]
+        row["latency"].append(elapsed_ms)
+        row["queries"].append(counter.count)
+        row["statuses"][str(response.status_code)] = row["statuses"].get(str(response.status_code), 0) + 1
+        if response.status_code >= 400:
+            row["errors"] += 1
+
+    results = {}
+    for name, row in samples.items():
+        latency = sorted(row["latency"])
+        if not latency:
+            continue
+        queries = row["queries"]
+        results[name] = {
+            "requests": len(latency),
+            "errors": row["errors"],
+            "statuses": row["statuses"],
+            "mean_ms": round(sum(latency) / len(latency), 3),
+            "p50_ms": round(_percentile(latency, 50), 3),
+            "p95_ms": round(_percentile(latency, 95), 3),
+            "p99_ms": round(_percentile(latency, 99), 3),
+            "max_ms": round(latency[-1], 3),
+            "queries_mean": round(sum(queries) / len(queries), 2),
+            "queries_max": max(queries),
+        }
+
+    return {
+        "git_commit": _git("rev-parse", "HEAD"),
+        "git_dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "dataset": summary,
+        "config": {"requests": requests, "warmup": warmup, "seed": seed, "only": sorted(only or [])},
+        "scenarios": results,
+    }
+
+
+def compare(current, baseline, max_regression):
+    """Print p95 deltas against ``baseline``; returns the scenarios that regressed."""
+    regressed = []
+    print(f"\n{'scenario':28} {'base p95':>10} {'now p95':>10} {'delta':>8}  queries")
+    for name, now in sorted(current["scenarios"].items()):
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            print(f"{name:28} {'-':>10} {now['p95_ms']:>10.2f} {'new':>8}  {now['queries_mean']}")
+            continue
+        delta = (now["p95_ms"] - before["p95_ms"]) / before["p95_ms"] if before["p95_ms"] else 0.0
+        flag = " !" if delta > max_regression else ""
+        print(
+            f"{name:28} {before['p95_ms']:>10.2f} {now['p95_ms']:>10.2f} {delta:>+8.0%}  "
+            f"{before['queries_mean']} -> {now['queries_mean']}{flag}"
+        )
+        if delta > max_regression:
+            regressed.append(name)
+    return regressed
+
+
+def print_table(doc):
+    print(f"\n{'scenario':28} {'n':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'queries':>8} {'errors':>7}")
+    for name, row in sorted(doc["scenarios"].items()):
+        print(
+            f"{name:28} {row['requests']:>6} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} "
+            f"{row['p99_ms']:>9.2f} {row['queries_mean']:>8} {row['errors']:>7}"
+        )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", help="comma-separated scenario names or prefixes, e.g. list_events,admin_users")
+    parser.add_argument("--out", help="results file (default benchmarks/results/<git-sha>.json)")
+    parser.add_argument("--baseline", help="earlier results file to compare p95 against")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    only = {s.strip() for s in (args.only or "").split(",") if s.strip()}
+    doc = run_benchmark(create_app(), args.requests, args.warmup, args.seed, only)
+    print_table(doc)
+
+    out = args.out or os.path.join(RESULTS_DIR, f"{(doc['git_commit'] or 'unknown')[:12]}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as fh:
+        json.dump(doc, fh, indent=2, sort_keys=True)
+    print(f"\nWrote {out}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            regressed = compare(doc, json.load(fh), args.max_regression)
+        if regressed:
+            print(f"p95 regressed by more than {args.max_regression:.0%}: {', '.join(regressed)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
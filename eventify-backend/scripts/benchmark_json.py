@@ -0,0 +1,150 @@
+"""
+Serialization time and bytes on the wire for the largest JSON endpoints.
+
+For each endpoint the response is fetched once in identity encoding, and its
+payload is serialized repeatedly with two encoders:
+- the stdlib encoder, called the way Flask's default provider calls it
+  (sorted keys, compact separators)
+- the orjson provider now installed on the app
+
+The body is then gzip- and, when the ``brotli`` package is installed,
+brotli-compressed at the configured levels. Seed a database first
+(scripts/seed_synthetic.py), then from eventify-backend:
+    DATABASE_URL=sqlite:///bench.db python scripts/benchmark_json.py
+    DATABASE_URL=sqlite:///bench.db python scripts/benchmark_json.py --iterations 50 --out /tmp/json.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+_BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, _BACKEND_ROOT)
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import orjson
+from flask_jwt_extended import create_access_token
+from sqlalchemy import func
+
+from app import create_app
+from app.compression import available_encodings, compress
+from app.extensions import db
+from app.models import ChatMessage, User
+
+# name -> (role whose token is used, path builder(ids))
+ENDPOINTS = {
+    "get_vendors": ("organizer", lambda ids: "/api/vendors"),
+    "admin_users": ("admin", lambda ids: "/api/admin/users?per_page=100"),
+    "admin_events": ("admin", lambda ids: "/api/admin/events?per_page=100"),
+    "admin_payments": ("admin", lambda ids: "/api/admin/payments?per_page=100"),
+    "admin_chat_messages": ("admin", lambda ids: "/api/admin/chat-messages?per_page=100"),
+    "chat_full_conversation": ("chat_sender", lambda ids: f"/api/chat/full-conversation/{ids['chat_receiver']}"),
+    "profile": ("user", lambda ids: "/api/auth/profile"),
+}
+
+
+def _stdlib_dumps(payload):
+    return json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def _time_us(fn, payload, iterations):
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn(payload)
+        samples.append((time.perf_counter() - started) * 1e6)
+    return statistics.median(samples)
+
+
+def pick_identities():
+    """One identity per role, plus the busiest chat pair; call inside an app context."""
+    ids = {}
+    for role in ("user", "organizer", "admin"):
+        ids[role] = db.session.query(func.min(User.id)).filter_by(role=role, is_active=True).scalar()
+    pair = (
+        db.session.query(ChatMessage.sender_id, ChatMessage.receiver_id)
+        .group_by(ChatMessage.sender_id, ChatMessage.receiver_id)
+        .order_by(func.count(ChatMessage.id).desc())
+        .first()
+    )
+    if pair:
+        ids["chat_sender"], ids["chat_receiver"] = pair
+    return {k: v for k, v in ids.items() if v is not None}
+
+
+def run_benchmark(app, iterations=20, only=None):
+    """Returns {endpoint: {...}}; endpoints without an identity to call them as are skipped."""
+    with app.app_context():
+        ids = pick_identities()
+        tokens = {role: create_access_token(identity=str(uid)) for role, uid in ids.items()}
+        db.session.remove()
+
+    client = app.test_client()
+    results = {}
+    for name, (role, path_for) in ENDPOINTS.items():
+        if (only and name not in only) or role not in tokens:
+            continue
+        response = client.get(
+            path_for(ids), headers={"Authorization": f"Bearer {tokens[role]}", "Accept-Encoding": "identity"}
+        )
+        body = response.get_data()
+        if response.status_code != 200:
+            results[name] = {"status": response.status_code}
+            continue
+        payload = orjson.loads(body)
+        stdlib_us = _time_us(_stdlib_dumps, payload, iterations)
+        orjson_us = _time_us(app.json.dumps_bytes, payload, iterations)
+        row = {
+            "status": response.status_code,
+            "identity_bytes": len(body),
+            "stdlib_us": round(stdlib_us, 1),
+            "orjson_us": round(orjson_us, 1),
+            "speedup": round(stdlib_us / orjson_us, 2) if orjson_us else None,
+        }
+        for encoding in available_encodings():
+            level = app.config["COMPRESSION_BROTLI_QUALITY" if encoding == "br" else "COMPRESSION_GZIP_LEVEL"]
+            started = time.perf_counter()
+            size = len(compress(body, encoding, level))
+            row[f"{encoding}_bytes"] = size
+            row[f"{encoding}_us"] = round((time.perf_counter() - started) * 1e6, 1)
+        results[name] = row
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--only", help="comma-separated endpoint names")
+    parser.add_argument("--out", help="write the results as JSON")
+    args = parser.parse_args(argv)
+    only = {s.strip() for s in (args.only or "").split(",") if s.strip()}
+
+    results = run_benchmark(create_app(), args.iterations, only)
+    encodings = available_encodings()
+    header = f"{'endpoint':24} {'bytes':>10} {'stdlib us':>10} {'orjson us':>10} {'x':>6}"
+    print(header + "".join(f" {enc + ' bytes':>11} {'ratio':>6}" for enc in encodings))
+    for name, row in results.items():
+        if "identity_bytes" not in row:
+            print(f"{name:24} HTTP {row['status']}")
+            continue
+        line = (
+            f"{name:24} {row['identity_bytes']:>10} {row['stdlib_us']:>10} {row['orjson_us']:>10} "
+            f"{row['speedup']:>6}"
+        )
+        for enc in encodings:
+            line += f" {row[enc + '_bytes']:>11} {row[enc + '_bytes'] / row['identity_bytes']:>6.0%}"
+        print(line)
+    if "br" not in encodings:
+        print("\nbrotli is not installed; only gzip was measured")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump({"iterations": args.iterations, "endpoints": results}, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
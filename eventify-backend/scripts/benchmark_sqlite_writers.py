@@ -0,0 +1,160 @@
+"""
+Concurrent-writer throughput on SQLite: driver defaults vs. the ``sqlite`` engine profile.
+
+Each profile runs in its own process against a fresh database file. Writer
+threads repeat the send_message write path (insert a chat message and bump the
+unread counters, one commit each) while reader threads poll the badge total and
+an event thread. The report shows commits/s, "database is locked" failures and
+commit latency per profile.
+
+Run from eventify-backend:
+    python scripts/benchmark_sqlite_writers.py
+    python scripts/benchmark_sqlite_writers.py --writers 16 --readers 8 --seconds 10 --out /tmp/sqlite-writers.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+_BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, _BACKEND_ROOT)
+
+PROFILES = ("none", "sqlite")
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values), max(1, int(round(pct / 100.0 * len(sorted_values) + 0.5)))) - 1]
+
+
+def run_worker(writers, readers, seconds):
+    """Inside the child process: DATABASE_URL and DB_PROFILE are already in the environment."""
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    from sqlalchemy import func
+    from sqlalchemy.exc import OperationalError
+
+    from app import create_app
+    from app.badge_counters import chat_unread_total, record_chat_message
+    from app.extensions import db
+    from app.models import ChatMessage
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        journal_mode = db.session.execute(db.text("PRAGMA journal_mode")).scalar()
+        db.session.remove()
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    stats = {"commits": 0, "locked": 0, "reads": 0, "read_errors": 0, "latency": []}
+
+    def writer(n):
+        sender, receiver = 1000 + n, 2000 + n
+        with app.app_context():
+            while not stop.is_set():
+                started = time.perf_counter()
+                try:
+                    db.session.add(ChatMessage(sender_id=sender, receiver_id=receiver, event_id=n + 1, message="bench"))
+                    record_chat_message(receiver, n + 1)
+                    db.session.commit()
+                    elapsed = time.perf_counter() - started
+                    with lock:
+                        stats["commits"] += 1
+                        stats["latency"].append(elapsed * 1000)
+                except OperationalError:
+                    db.session.rollback()
+                    with lock:
+                        stats["locked"] += 1
+            db.session.remove()
+
+    def reader(n):
+        with app.app_context():
+            while not stop.is_set():
+                try:
+                    chat_unread_total(2000 + n % max(writers, 1))
+                    db.session.query(func.count(ChatMessage.id)).filter(ChatMessage.event_id == n % max(writers, 1) + 1).scalar()
+                    db.session.commit()
+                    with lock:
+                        stats["reads"] += 1
+                except OperationalError:
+                    db.session.rollback()
+                    with lock:
+                        stats["read_errors"] += 1
+            db.session.remove()
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    latency = sorted(stats["latency"])
+    print(json.dumps({
+        "journal_mode": journal_mode,
+        "commits": stats["commits"],
+        "commits_per_s": round(stats["commits"] / seconds, 1),
+        "locked_errors": stats["locked"],
+        "reads_per_s": round(stats["reads"] / seconds, 1),
+        "read_errors": stats["read_errors"],
+        "commit_p50_ms": round(_percentile(latency, 50) or 0, 2),
+        "commit_p95_ms": round(_percentile(latency, 95) or 0, 2),
+        "commit_p99_ms": round(_percentile(latency, 99) or 0, 2),
+    }))
+
+
+def run_profile(profile, args):
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    os.unlink(path)
+    env = dict(os.environ, DATABASE_URL="sqlite:///" + path.replace("\\", "/"), DB_PROFILE=profile, LOG_LEVEL="WARNING")
+    try:
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker",
+             "--writers", str(args.writers), "--readers", str(args.readers), "--seconds", str(args.seconds)],
+            cwd=_BACKEND_ROOT, env=env, capture_output=True, text=True, check=True,
+        )
+    finally:
+        for suffix in ("", "-wal", "-shm", "-journal"):
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--out", help="write the results as JSON")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        run_worker(args.writers, args.readers, args.seconds)
+        return 0
+
+    results = {profile: run_profile(profile, args) for profile in PROFILES}
+    print(f"{args.writers} writers, {args.readers} readers, {args.seconds:g}s per profile\n")
+    print(f"{'profile':8} {'journal':8} {'commits/s':>10} {'locked':>7} {'reads/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for profile, row in results.items():
+        print(
+            f"{profile:8} {row['journal_mode']:8} {row['commits_per_s']:>10} {row['locked_errors']:>7} "
+            f"{row['reads_per_s']:>9} {row['commit_p50_ms']:>8} {row['commit_p95_ms']:>8} {row['commit_p99_ms']:>8}"
+        )
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump({"writers": args.writers, "readers": args.readers, "seconds": args.seconds, "profiles": results}, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
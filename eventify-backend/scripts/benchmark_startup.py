@@ -0,0 +1,98 @@
+"""
+Cold-start cost of create_app(): wall time, peak RSS and heavy modules loaded.
+
+Each boot runs in a fresh interpreter. "lazy" is the default: providers are
+built on first use. "eager" sets PROVIDER_WARMUP to every provider, which costs
+what importing openai/stripe/requests at module level used to. A dummy
+OPENAI_API_KEY is set so the OpenAI client is really built in eager mode; no
+network calls are made.
+
+Run from eventify-backend:
+    python scripts/benchmark_startup.py
+    python scripts/benchmark_startup.py --runs 10 --out /tmp/startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+_BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("openai", "httpx", "pydantic", "stripe", "requests")
+MODES = {"lazy": "", "eager": "openai,chat_ai,stripe,http"}
+
+_CHILD = """
+import json, resource, sys, time
+started = time.perf_counter()
+from app import create_app
+create_app()
+elapsed = time.perf_counter() - started
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({
+    "seconds": elapsed,
+    "max_rss_mb": rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024,
+    "modules": len(sys.modules),
+    "heavy": [m for m in %r if m in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def boot(mode, db_url):
+    env = dict(
+        os.environ,
+        DATABASE_URL=db_url,
+        PROVIDER_WARMUP=MODES[mode],
+        OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY") or "sk-startup-benchmark",
+        LOG_LEVEL="WARNING",
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", _CHILD], cwd=_BACKEND_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--out", help="write the results as JSON")
+    args = parser.parse_args(argv)
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    db_url = "sqlite:///" + path.replace("\\", "/")
+    results = {}
+    try:
+        boot("lazy", db_url)  # first boot applies schema patches; keep it out of the numbers
+        for mode in MODES:
+            runs = [boot(mode, db_url) for _ in range(args.runs)]
+            results[mode] = {
+                "median_s": round(statistics.median(r["seconds"] for r in runs), 3),
+                "min_s": round(min(r["seconds"] for r in runs), 3),
+                "max_rss_mb": round(statistics.median(r["max_rss_mb"] for r in runs), 1),
+                "modules": runs[-1]["modules"],
+                "heavy_modules": runs[-1]["heavy"],
+            }
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.unlink(path + suffix)
+
+    print(f"{'mode':6} {'median s':>9} {'min s':>7} {'RSS MB':>7} {'modules':>8}  heavy imports")
+    for mode, row in results.items():
+        print(
+            f"{mode:6} {row['median_s']:>9} {row['min_s']:>7} {row['max_rss_mb']:>7} {row['modules']:>8}  "
+            f"{', '.join(row['heavy_modules']) or '-'}"
+        )
+    lazy, eager = results["lazy"], results["eager"]
+    print(f"\nlazy saves {eager['median_s'] - lazy['median_s']:.3f}s and {eager['max_rss_mb'] - lazy['max_rss_mb']:.1f} MB per worker")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump({"runs": args.runs, "modes": results}, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""
+EXPLAIN the hot ORM queries behind the top endpoints and fail on full table scans.
+
+Run from eventify-backend against any database with the current schema
+(an empty one is fine: the planner still picks indexes):
+    python scripts/check_query_plans.py
+    DATABASE_URL=postgresql://... python scripts/check_query_plans.py --verbose
+
+SQLite uses EXPLAIN QUERY PLAN; a ``SCAN <table>`` step without an index is a
+full scan. Postgres uses EXPLAIN (FORMAT JSON) with enable_seqscan off, so a
+``Seq Scan`` node means no usable index exists. Queries marked ``ordered`` also
+fail when the plan sorts rows instead of reading them in index order. Exit status
+is 1 when any query regresses.
+"""
+import argparse
+import json
+import os
+import sys
+
+_BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, _BACKEND_ROOT)
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from sqlalchemy import and_, or_, select, text
+
+from app import create_app
+from app.api.events import ordered_events
+from app.api.reviews import rating_summary_query
+from app.extensions import db
+from app.models import (
+    ChatMessage,
+    ChatUnreadCounter,
+    Event,
+    EventApplication,
+    Payment,
+    PaymentRequest,
+    vendor_events,
+)
+from app.open_events_feed import open_events_query
+from app.payment_ledger import budget_payments_query
+
+
+def hot_queries():
+    """
+    name -> (endpoint, select statement, ordered). Parameters are representative literals.
+    Where the endpoint builds its query in a helper, the statement comes from that helper.
+    """
+    return {
+        "events_by_owner": (
+            "events.list_events",
+            ordered_events(Event.query.filter(Event.user_id == 1)).limit(20).statement,
+            True,
+        ),
+        "events_by_organizer": (
+            "events.list_events",
+            ordered_events(Event.query.filter(Event.organizer_id == 1)).limit(20).statement,
+            True,
+        ),
+        "open_events_feed": ("events.list_open_events", open_events_query(1).statement, False),
+        "budget_completed_payments": ("events.get_budget_summary", budget_payments_query([1]).statement, False),
+        "vendor_payments": (
+            "admin.admin_user_summary",
+            select(Payment).where(Payment.vendor_id == 1, Payment.status == "completed"),
+            False,
+        ),
+        "chat_unread_for_receiver": (
+            "chat.mark_messages_read",
+            select(ChatMessage.id).where(
+                ChatMessage.event_id == 1, ChatMessage.receiver_id == 1, ChatMessage.is_read.is_(False)
+            ),
+            False,
+        ),
+        "chat_unread_total": (
+            "badges.get_badges",
+            select(ChatMessage.id).where(ChatMessage.receiver_id == 1, ChatMessage.is_read.is_(False)),
+            False,
+        ),
+        "chat_last_message_for_event": (
+            "chat.get_vendor_conversations",
+            select(ChatMessage).where(ChatMessage.event_id == 1).order_by(ChatMessage.created_at.desc()).limit(1),
+            True,
+        ),
+        "chat_direct_conversation": (
+            "chat.get_full_conversation",
+            select(ChatMessage).where(
+                or_(
+                    and_(ChatMessage.sender_id == 1, ChatMessage.receiver_id == 2),
+                    and_(ChatMessage.sender_id == 2, ChatMessage.receiver_id == 1),
+                )
+            ),
+            False,
+        ),
+        "chat_unread_counters": (
+            "chat.get_user_conversations",
+            select(ChatUnreadCounter).where(ChatUnreadCounter.user_id == 1),
+            False,
+        ),
+        "event_partners_by_status": (
+            "vendors.get_vendors",
+            select(vendor_events.c.vendor_id).where(
+                vendor_events.c.event_id == 1, vendor_events.c.partnership_status == "accepted"
+            ),
+            False,
+        ),
+        "vendor_assignments": (
+            "chat.get_vendor_conversations",
+            select(vendor_events.c.event_id).where(vendor_events.c.vendor_id == 1),
+            False,
+        ),
+        "organizer_applications": (
+            "events.list_open_events",
+            select(EventApplication).where(EventApplication.organizer_id == 1, EventApplication.status == "pending"),
+            False,
+        ),
+        "event_applications": (
+            "events.list_event_applications",
+            select(EventApplication).where(EventApplication.event_id == 1),
+            False,
+        ),
+        "payment_requests_for_vendor": (
+            "payments.request_payment",
+            select(PaymentRequest).where(PaymentRequest.event_id == 1, PaymentRequest.vendor_id == 1),
+            False,
+        ),
+        "rating_summary": ("reviews.rating_summaries", rating_summary_query([1, 2, 3]).statement, False),
+    }
+
+
+def _compile(stmt):
+    return str(stmt.compile(dialect=db.engine.dialect, compile_kwargs={"literal_binds": True}))
+
+
+def _sqlite_plan(conn, sql):
+    """(plan lines, full scans, sorts) from EXPLAIN QUERY PLAN."""
+    rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql).fetchall()
+    lines = [row[-1] for row in rows]
+    scans = [
+        line for line in lines
+        if line.startswith("SCAN ") and " USING " not in line and not line.startswith("SCAN CONSTANT")
+    ]
+    sorts = [line for line in lines if line.startswith("USE TEMP B-TREE FOR ORDER BY")]
+    return lines, scans, sorts
+
+
+def _postgres_plan(conn, sql):
+    """(plan lines, full scans, sorts) from EXPLAIN (FORMAT JSON) with seq scans discouraged."""
+    conn.execute(text("SET LOCAL enable_seqscan = off"))
+    doc = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + sql).scalar()
+    if isinstance(doc, str):
+        doc = json.loads(doc)
+    lines, scans, sorts = [], [], []
+
+    def walk(node, depth=0):
+        label = node["Node Type"] + (f" on {node['Relation Name']}" if "Relation Name" in node else "")
+        if "Index Name" in node:
+            label += f" using {node['Index Name']}"
+        lines.append("  " * depth + label)
+        if node["Node Type"] == "Seq Scan":
+            scans.append(label)
+        if node["Node Type"] in ("Sort", "Incremental Sort"):
+            sorts.append(label)
+        for child in node.get("Plans", ()):
+            walk(child, depth + 1)
+
+    walk(doc[0]["Plan"])
+    return lines, scans, sorts
+
+
+def check_plans(names=None):
+    """Returns [{name, endpoint, ok, problems, plan}]; call inside an app context."""
+    dialect = db.engine.dialect.name
+    if dialect == "sqlite":
+        explain = _sqlite_plan
+    elif dialect == "postgresql":
+        explain = _postgres_plan
+    else:
+        raise SystemExit(f"Unsupported dialect for plan checks: {dialect}")
+
+    results = []
+    for name, (endpoint, stmt, ordered) in hot_queries().items():
+        if names and name not in names:
+            continue
+        with db.engine.connect() as conn:
+            with conn.begin():
+                plan, scans, sorts = explain(conn, _compile(stmt))
+        problems = [f"full scan: {s}" for s in scans]
+        if ordered:
+            problems += [f"sort instead of index order: {s}" for s in sorts]
+        results.append({"name": name, "endpoint": endpoint, "ok": not problems, "problems": problems, "plan": plan})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", help="comma-separated query names")
+    parser.add_argument("--verbose", action="store_true", help="print every plan, not only failures")
+    parser.add_argument("--json", action="store_true", help="machine-readable output")
+    args = parser.parse_args(argv)
+    names = {n.strip() for n in (args.only or "").split(",") if n.strip()}
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        results = check_plans(names)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for row in results:
+            print(f"{'ok  ' if row['ok'] else 'FAIL'} {row['name']:30} {row['endpoint']}")
+            for problem in row["problems"]:
+                print(f"       {problem}")
+            if args.verbose or not row["ok"]:
+                for line in row["plan"]:
+                    print(f"       | {line}")
+    failed = [row["name"] for row in results if not row["ok"]]
+    if failed and not args.json:
+        print(f"\n{len(failed)} of {len(results)} queries regressed: {', '.join(failed)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,361 @@
+"""
+Bulk-load a synthetic, production-sized dataset for load testing and benchmarks.
+
+Run from the eventify-backend directory against a throwaway database:
+    DATABASE_URL=sqlite:///bench.db python scripts/seed_synthetic.py
+    DATABASE_URL=sqlite:///bench.db python scripts/seed_synthetic.py --users 2000 --events 20000 --messages 100000
+
+Defaults: 100k users, 1M events, 10M chat messages, 1M payments, 200k reviews.
+Rows are generated deterministically (--seed) and written with Core INSERT
+executemany batches (--batch rows per statement), one commit per batch. Every
+user shares one password (SEED_USER_PASSWORD, hashed once) and is verified, so
+the benchmark harness and manual logins both work. Emails are
+``synthetic.<id>@bench.eventify.test``; --reset deletes previously seeded
+synthetic rows first.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from array import array
+from datetime import datetime, timedelta
+
+_BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _BACKEND_ROOT not in sys.path:
+    sys.path.insert(0, _BACKEND_ROOT)
+
+from passlib.hash import bcrypt
+from sqlalchemy import event as sa_event
+from sqlalchemy import func, insert
+
+from app import create_app
+from app.badge_counters import rebuild_chat_counters
+from app.extensions import db
+from app.models import ChatMessage, Event, EventApplication, Payment, Review, User, vendor_events
+
+DEFAULT_SEED_PASSWORD = "Eventify#Test1"
+PASSWORD = os.environ.get("SEED_USER_PASSWORD", DEFAULT_SEED_PASSWORD).strip() or DEFAULT_SEED_PASSWORD
+EMAIL_DOMAIN = "bench.eventify.test"
+
+CITIES = ["Karachi", "Lahore", "Islamabad", "Rawalpindi", "Faisalabad", "Multan", "Peshawar", "Quetta"]
+CATEGORIES = ["Catering", "Photography", "Decoration", "Venue", "Music", "Lighting", "Transport", "Makeup"]
+EVENT_KINDS = ["Wedding", "Birthday", "Conference", "Mehndi", "Walima", "Corporate Dinner", "Concert", "Reunion"]
+# (status, organizer_status, weight): most events are live, a tail is finished
+EVENT_STATES = [
+    ("created", "pending", 30),
+    ("in_progress", "accepted", 35),
+    ("completed", "accepted", 25),
+    ("canceled", "rejected", 10),
+]
+CHAT_LINES = [
+    "Is the venue confirmed?", "Sharing the updated menu now.", "Can we move the setup to 4pm?",
+    "Advance payment sent.", "Please confirm the guest count.", "Photos will be ready next week.",
+    "Thanks, looks great!", "Can you send the invoice?",
+]
+ROLE_WEIGHTS = (("user", 70), ("organizer", 15), ("vendor", 15))
+
+
+def _weighted(rng, choices):
+    """Pick from ``(value..., weight)`` tuples; returns the value part as a tuple."""
+    return rng.choices([c[:-1] for c in choices], weights=[c[-1] for c in choices])[0]
+
+
+def _timestamp(rng, now, days=730):
+    return now - timedelta(seconds=rng.randrange(days * 86400))
+
+
+def _next_id(model):
+    return (db.session.query(func.max(model.id)).scalar() or 0) + 1
+
+
+def _insert_batches(table, rows, batch, label):
+    """Drain the ``rows`` generator into executemany INSERTs of ``batch`` rows."""
+    started = time.perf_counter()
+    total = 0
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= batch:
+            db.session.execute(insert(table), chunk)
+            db.session.commit()
+            total += len(chunk)
+            chunk = []
+            print(f"  {label}: {total:,}", end="\r", flush=True)
+    if chunk:
+        db.session.execute(insert(table), chunk)
+        db.session.commit()
+        total += len(chunk)
+    elapsed = time.perf_counter() - started
+    print(f"\r  {label}: {total:,} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f}/s)")
+    return total
+
+
+def _fast_sqlite_writes(engine):
+    """Relax durability for the load; the dataset is disposable."""
+    if engine.dialect.name != "sqlite":
+        return
+
+    @sa_event.listens_for(engine, "connect")
+    def _pragmas(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=OFF")
+        cur.execute("PRAGMA temp_store=MEMORY")
+        cur.close()
+
+    engine.dispose()
+
+
+def reset_synthetic():
+    synthetic_users = db.session.query(User.id).filter(User.email.like(f"%@{EMAIL_DOMAIN}"))
+    removed = synthetic_users.count()
+    if not removed:
+        return
+    event_ids = db.session.query(Event.id).filter(Event.user_id.in_(synthetic_users))
+    for model in (ChatMessage, Payment, Review, EventApplication):
+        db.session.query(model).filter(model.event_id.in_(event_ids)).delete(synchronize_session=False)
+    db.session.execute(vendor_events.delete().where(vendor_events.c.event_id.in_(event_ids)))
+    db.session.query(Event).filter(Event.id.in_(event_ids)).delete(synchronize_session=False)
+    # counters reference users; recompute them without the deleted messages first
+    rebuild_chat_counters()
+    db.session.query(User).filter(User.email.like(f"%@{EMAIL_DOMAIN}")).delete(synchronize_session=False)
+    db.session.commit()
+    print(f"Removed {removed:,} synthetic users and their data")
+
+
+def seed(args):
+    rng = random.Random(args.seed)
+    now = datetime.utcnow()
+    password_hash = bcrypt.hash(PASSWORD)
+
+    # --- users: ids assigned here so every later table can reference them without reads
+    first_user = _next_id(User)
+    roles = {"user": array("i"), "organizer": array("i"), "vendor": array("i")}
+    admin_id = first_user
+
+    def users():
+        yield {
+            "id": admin_id, "name": "Synthetic Admin", "email": f"synthetic.{admin_id}@{EMAIL_DOMAIN}",
+            "password_hash": password_hash, "role": "admin", "is_verified": True, "is_active": True,
+            "created_at": now,
+        }
+        for uid in range(first_user + 1, first_user + args.users):
+            (role,) = _weighted(rng, ROLE_WEIGHTS)
+            roles[role].append(uid)
+            yield {
+                "id": uid,
+                "name": f"{role.title()} {uid}",
+                "email": f"synthetic.{uid}@{EMAIL_DOMAIN}",
+                "password_hash": password_hash,
+                "role": role,
+                "city": rng.choice(CITIES),
+                "phone": f"+92 300 {uid % 10_000_000:07d}",
+                "category": rng.choice(CATEGORIES) if role == "vendor" else None,
+                "organizer_availability": rng.choice(["available", "limited", "unavailable"]) if role == "organizer" else None,
+                "is_verified": True,
+                "is_active": rng.random() > 0.02,
+                "created_at": _timestamp(rng, now),
+            }
+
+    _insert_batches(User.__table__, users(), args.batch, "users")
+    if not roles["user"] or not roles["organizer"] or not roles["vendor"]:
+        raise SystemExit("--users is too small to produce users, organizers and vendors")
+
+    # --- events: keep owner / organizer / status per event for the dependent tables
+    first_event = _next_id(Event)
+    owners = array("i")
+    organizers = array("i")  # 0 = unassigned
+    completed = bytearray()
+
+    def events():
+        for n in range(args.events):
+            eid = first_event + n
+            status, organizer_status = _weighted(rng, EVENT_STATES)
+            organizer = rng.choice(roles["organizer"]) if status != "created" or rng.random() < 0.3 else 0
+            if not organizer:
+                organizer_status = "pending"
+            owner = rng.choice(roles["user"])
+            owners.append(owner)
+            organizers.append(organizer)
+            completed.append(status == "completed")
+            budget = float(rng.randrange(50_000, 5_000_000, 5_000))
+            spent = round(budget * rng.random() * 0.9, 2) if status != "created" else 0.0
+            created = _timestamp(rng, now)
+            yield {
+                "id": eid,
+                "name": f"{rng.choice(EVENT_KINDS)} #{eid}",
+                "date": (created + timedelta(days=rng.randrange(7, 180))).strftime("%Y-%m-%d"),
+                "venue": f"{rng.choice(CITIES)} Hall {rng.randrange(1, 400)}",
+                "budget": budget,
+                "total_spent": spent,
+                "remaining_budget": budget - spent,
+                "vendor_category": rng.choice(CATEGORIES),
+                "progress": 100 if status == "completed" else rng.randrange(0, 90),
+                "status": status,
+                "organizer_advance_paid": status in ("in_progress", "completed"),
+                "organizer_final_requested": status == "completed",
+                "organizer_final_paid": status == "completed",
+                "user_id": owner,
+                "organizer_id": organizer or None,
+                "organizer_status": organizer_status,
+                "created_at": created,
+                "updated_at": created,
+            }
+
+    _insert_batches(Event.__table__, events(), args.batch, "events")
+
+    def pick_event():
+        i = rng.randrange(len(owners))
+        return first_event + i, owners[i], organizers[i], completed[i]
+
+    # --- vendor assignments: 0-3 vendors on events with an organizer
+    assigned = {}  # event_id -> tuple(vendor ids), sampled lazily for chat/payments
+
+    def assignments():
+        for i in range(len(owners)):
+            if not organizers[i]:
+                continue
+            picked = tuple(set(rng.sample(roles["vendor"], min(len(roles["vendor"]), rng.randrange(0, 4)))))
+            if not picked:
+                continue
+            eid = first_event + i
+            assigned[eid] = picked
+            for vid in picked:
+                yield {
+                    "vendor_id": vid,
+                    "event_id": eid,
+                    "assigned_at": now,
+                    "partnership_status": "accepted" if completed[i] or rng.random() < 0.7 else "pending",
+                }
+
+    _insert_batches(vendor_events, assignments(), args.batch, "vendor_events")
+
+    # --- organizer applications on open events
+    def applications():
+        seen = set()
+        for _ in range(args.applications):
+            i = rng.randrange(len(owners))
+            if organizers[i]:
+                continue
+            org = rng.choice(roles["organizer"])
+            if (i, org) in seen:
+                continue
+            seen.add((i, org))
+            yield {
+                "event_id": first_event + i,
+                "organizer_id": org,
+                "message": "We would love to organize this event.",
+                "status": "pending",
+                "created_at": _timestamp(rng, now, days=60),
+            }
+
+    _insert_batches(EventApplication.__table__, applications(), args.batch, "event_applications")
+
+    # --- chat: owner <-> organizer, organizer <-> vendor
+    def messages():
+        for _ in range(args.messages):
+            eid, owner, organizer, _done = pick_event()
+            if not organizer:
+                continue
+            vendors_here = assigned.get(eid)
+            if vendors_here and rng.random() < 0.5:
+                a, b = organizer, rng.choice(vendors_here)
+            else:
+                a, b = owner, organizer
+            if rng.random() < 0.5:
+                a, b = b, a
+            yield {
+                "sender_id": a,
+                "receiver_id": b,
+                "event_id": eid,
+                "message": rng.choice(CHAT_LINES),
+                "is_read": rng.random() < 0.85,
+                "created_at": _timestamp(rng, now, days=365),
+            }
+
+    _insert_batches(ChatMessage.__table__, messages(), args.batch, "chat_messages")
+
+    # --- payments: organizer advance/final plus vendor settlements
+    def payments():
+        for n in range(args.payments):
+            eid, _owner, organizer, done = pick_event()
+            if not organizer:
+                continue
+            vendors_here = assigned.get(eid)
+            if vendors_here and rng.random() < 0.5:
+                vendor, kind = rng.choice(vendors_here), rng.choice(["advance", "final"])
+            else:
+                vendor, kind = None, rng.choice(["advance", "final"])
+            yield {
+                "event_id": eid,
+                "vendor_id": vendor,
+                "payment_type": kind,
+                "amount": float(rng.randrange(5_000, 500_000, 500)),
+                "currency": "PKR",
+                "status": "completed" if done or rng.random() < 0.6 else rng.choice(["pending", "failed"]),
+                "payment_method": rng.choice(["card", "bank_transfer"]),
+                "transaction_id": f"syn_{args.seed}_{n}",
+                "payment_date": _timestamp(rng, now, days=365),
+                "created_at": _timestamp(rng, now, days=365),
+            }
+
+    _insert_batches(Payment.__table__, payments(), args.batch, "payments")
+
+    # --- reviews on completed events; (event, author, type) is unique
+    def reviews():
+        done_idx = [i for i in range(len(owners)) if completed[i] and organizers[i]]
+        rng.shuffle(done_idx)
+        for i in done_idx[: args.reviews]:
+            eid = first_event + i
+            yield {
+                "event_id": eid, "author_id": owners[i], "subject_id": organizers[i],
+                "review_type": "user_to_organizer", "rating": rng.choices([1, 2, 3, 4, 5], [2, 3, 10, 35, 50])[0],
+                "comment": None, "status": "published", "created_at": _timestamp(rng, now, days=365),
+            }
+            vendors_here = assigned.get(eid)
+            if vendors_here:
+                yield {
+                    "event_id": eid, "author_id": organizers[i], "subject_id": rng.choice(vendors_here),
+                    "review_type": "organizer_to_vendor", "rating": rng.choices([1, 2, 3, 4, 5], [2, 3, 10, 35, 50])[0],
+                    "comment": None, "status": "published", "created_at": _timestamp(rng, now, days=365),
+                }
+
+    _insert_batches(Review.__table__, reviews(), args.batch, "reviews")
+
+    started = time.perf_counter()
+    rebuild_chat_counters()
+    db.session.commit()
+    print(f"  badge counters rebuilt in {time.perf_counter() - started:.1f}s")
+    print(f"Admin login: synthetic.{admin_id}@{EMAIL_DOMAIN} / SEED_USER_PASSWORD")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--messages", type=int, default=10_000_000)
+    parser.add_argument("--payments", type=int, default=1_000_000)
+    parser.add_argument("--reviews", type=int, default=200_000, help="completed events to review")
+    parser.add_argument("--applications", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, default=10_000, help="rows per executemany")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="delete earlier synthetic data first")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    app = create_app()
+    with app.app_context():
+        _fast_sqlite_writes(db.engine)
+        db.create_all()
+        if args.reset:
+            reset_synthetic()
+        started = time.perf_counter()
+        seed(args)
+        print(f"Done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+API tests for admin access checks, the cached JWT identity and the SQL report.
+Run from eventify-backend: python tests/test_admin_api.py
+"""
+import os
+import tempfile
+import unittest
+
+_db_file = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
+_db_file.close()
+os.environ["DATABASE_URL"] = "sqlite:///" + _db_file.name.replace("\\", "/")
+
+from app import create_app  # noqa: E402
+from app.current_user import invalidate_identity  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import User  # noqa: E402
+from app.sql_instrumentation import fingerprint, init_sql_instrumentation  # noqa: E402
+from flask_jwt_extended import create_access_token  # noqa: E402
+
+
+class AdminAPITests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app.config["TESTING"] = True
+        cls.app.config["CURRENT_USER_CACHE_TTL"] = 300
+        cls.client = cls.app.test_client()
+
+    def setUp(self):
+        with self.app.app_context():
+            invalidate_identity()
+            db.drop_all()
+            db.create_all()
+            a = User(name="Admin", email="admin@test.com", role="admin")
+            a.set_password("Testpass1!")
+            b = User(name="Second Admin", email="admin2@test.com", role="admin")
+            b.set_password("Testpass1!")
+            u = User(name="Host", email="host@test.com", role="user")
+            u.set_password("Testpass1!")
+            db.session.add_all([a, b, u])
+            db.session.commit()
+            self.admin_id = a.id
+            self.admin2_id = b.id
+            self.user_id = u.id
+
+    def _headers(self, user_id: int):
+        with self.app.app_context():
+            token = create_access_token(identity=str(user_id))
+        return {"Authorization": f"Bearer {token}"}
+
+    def test_non_admin_is_rejected(self):
+        res = self.client.get("/api/admin/overview", headers=self._headers(self.user_id))
+        self.assertEqual(res.status_code, 403)
+
+    def test_disabling_admin_takes_effect_despite_identity_cache(self):
+        headers = self._headers(self.admin2_id)
+        self.assertEqual(self.client.get("/api/admin/overview", headers=headers).status_code, 200)
+
+        res = self.client.post(
+            "/api/admin/users/bulk-status",
+            json={"user_ids": [self.admin2_id], "is_active": False},
+            headers=self._headers(self.admin_id),
+        )
+        self.assertEqual(res.status_code, 200)
+
+        res = self.client.get("/api/admin/overview", headers=headers)
+        self.assertEqual(res.status_code, 403)
+        self.assertEqual(res.get_json()["error"], "Admin account is disabled")
+
+    def test_role_change_via_patch_invalidates_cache(self):
+        headers = self._headers(self.admin2_id)
+        self.assertEqual(self.client.get("/api/admin/overview", headers=headers).status_code, 200)
+
+        res = self.client.patch(
+            f"/api/admin/users/{self.admin2_id}",
+            json={"role": "user"},
+            headers=self._headers(self.admin_id),
+        )
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(self.client.get("/api/admin/overview", headers=headers).status_code, 403)
+
+    def test_sql_instrumentation_header_and_report(self):
+        headers = self._headers(self.admin_id)
+        self.assertEqual(self.client.get("/api/admin/sql-report", headers=headers).status_code, 404)
+
+        app = create_app()
+        app.config.update(TESTING=True, SQL_INSTRUMENTATION=True, SQL_N_PLUS_ONE_THRESHOLD=3)
+        init_sql_instrumentation(app)
+        client = app.test_client()
+
+        res = client.get("/api/admin/overview", headers=headers)
+        self.assertEqual(res.status_code, 200)
+        self.assertRegex(res.headers["Server-Timing"], r'^db;dur=[\d.]+;desc="\d+ queries", app;dur=[\d.]+$')
+
+        report = client.get("/api/admin/sql-report", query_string={"sort": "n_plus_one"}, headers=headers).get_json()
+        row = next(r for r in report["endpoints"] if r["endpoint"] == "admin.admin_overview")
+        self.assertEqual(row["requests"], 1)
+        # the per-role user counts share one statement shape
+        self.assertEqual(row["n_plus_one"], 1)
+        self.assertEqual(client.get("/api/admin/sql-report", query_string={"sort": "x"}, headers=headers).status_code, 400)
+
+    def test_fingerprint_collapses_literals_and_in_lists(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM event WHERE id IN (?, ?, ?) AND name = 'x'  LIMIT 10"),
+            "SELECT * FROM event WHERE id IN (?) AND name = ? LIMIT ?",
+        )
+
+
+def tearDownModule():
+    try:
+        os.unlink(_db_file.name)
+    except OSError:
+        pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+API tests for maintained chat / notification badge counters and the dashboard bootstrap.
+Run from eventify-backend: python tests/test_badges_api.py
+"""
+import os
+import tempfile
+import unittest
+
+_db_file = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
+_db_file.close()
+os.environ["DATABASE_URL"] = "sqlite:///" + _db_file.name.replace("\\", "/")
+
+from app import create_app  # noqa: E402
+from app.badge_counters import chat_unread_by_event, chat_unread_total, rebuild_chat_counters  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import User, Event  # noqa: E402
+from flask_jwt_extended import create_access_token  # noqa: E402
+
+
+class BadgesAPITests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app.config["TESTING"] = True
+        cls.client = cls.app.test_client()
+
+    def setUp(self):
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            u = User(name="Host", email="host@test.com", role="user")
+            u.set_password("Testpass1!")
+            v = User(name="Vendor", email="vendor@test.com", role="vendor")
+            v.set_password("Testpass1!")
+            db.session.add_all([u, v])
+            db.session.commit()
+            events = [
+                Event(name=f"Event {i}", date="2026-09-01", venue="Lahore", budget=100.0,
+                      vendor_category="Wedding", user_id=u.id, status="created")
+                for i in range(2)
+            ]
+            db.session.add_all(events)
+            db.session.commit()
+            self.host_id = u.id
+            self.vendor_id = v.id
+            self.event_ids = [e.id for e in events]
+
+    def _headers(self, user_id):
+        with self.app.app_context():
+            token = create_access_token(identity=str(user_id))
+        return {"Authorization": f"Bearer {token}"}
+
+    def _send(self, event_id, text="hello"):
+        res = self.client.post(
+            "/api/chat/send",
+            json={"event_id": event_id, "receiver_id": self.vendor_id, "message": text},
+            headers=self._headers(self.host_id),
+        )
+        self.assertEqual(res.status_code, 201)
+
+    def test_counters_follow_send_and_mark_read(self):
+        from app.api.payments import notification_unread_count
+
+        # The notification list is process-wide; other test modules may reuse this user id
+        notifications_before = notification_unread_count(self.vendor_id)
+        self._send(self.event_ids[0])
+        self._send(self.event_ids[0])
+        self._send(self.event_ids[1])
+        vendor = self._headers(self.vendor_id)
+
+        badges = self.client.get("/api/badges", query_string={"by_event": 1}, headers=vendor).get_json()
+        self.assertEqual(badges["chat_unread"], 3)
+        self.assertEqual(badges["notifications_unread"], notifications_before + 3)
+        self.assertEqual(badges["chat_by_event"], {str(self.event_ids[0]): 2, str(self.event_ids[1]): 1})
+        self.assertEqual(self.client.get("/api/chat/unread-count", headers=vendor).get_json()["unread_count"], 3)
+
+        res = self.client.put("/api/chat/mark-read", json={"event_id": self.event_ids[0]}, headers=vendor)
+        self.assertEqual(res.get_json()["marked_count"], 2)
+        res = self.client.put("/api/payments/notifications/clear-all", headers=vendor)
+        self.assertEqual(res.status_code, 200)
+
+        badges = self.client.get("/api/badges", headers=vendor).get_json()
+        self.assertEqual(badges["chat_unread"], 1)
+        self.assertEqual(badges["notifications_unread"], 0)
+        self.assertNotIn("chat_by_event", badges)
+
+        # Rebuilding from chat_message agrees with the maintained counters
+        with self.app.app_context():
+            rebuild_chat_counters()
+            db.session.commit()
+            self.assertEqual(chat_unread_total(self.vendor_id), 1)
+            self.assertEqual(chat_unread_by_event(self.vendor_id), {self.event_ids[1]: 1})
+
+    def test_bootstrap_returns_only_changed_sections(self):
+        host = self._headers(self.host_id)
+        body = self.client.get("/api/dashboard/bootstrap", headers=host).get_json()
+        self.assertEqual(set(body["changed"]), {"events", "notifications", "badges", "rating_summaries", "review_status"})
+        self.assertEqual(len(body["events"]["created"]), 2)
+        self.assertEqual(body["badges"]["chat_unread"], 0)
+        self.assertIn(str(self.host_id), body["rating_summaries"])
+
+        body = self.client.get("/api/dashboard/bootstrap", query_string={"since": body["since"]}, headers=host).get_json()
+        self.assertEqual(body["changed"], [])
+        self.assertNotIn("events", body)
+
+        # A message from the vendor changes the host's chat badge (and notifications), nothing else
+        res = self.client.post(
+            "/api/chat/send",
+            json={"event_id": self.event_ids[0], "receiver_id": self.host_id, "message": "hi"},
+            headers=self._headers(self.vendor_id),
+        )
+        self.assertEqual(res.status_code, 201)
+        body = self.client.get("/api/dashboard/bootstrap", query_string={"since": body["since"]}, headers=host).get_json()
+        self.assertEqual(body["changed"], ["notifications", "badges"])
+        self.assertEqual(body["badges"]["chat_unread"], 1)
+
+        res = self.client.get("/api/dashboard/bootstrap", query_string={"sections": "events,bogus"}, headers=host)
+        self.assertEqual(res.status_code, 400)
+
+
+def tearDownModule():
+    try:
+        os.unlink(_db_file.name)
+    except OSError:
+        pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Smoke test for the synthetic seeder and the endpoint benchmark harness at tiny volumes.
+Run from eventify-backend: python tests/test_benchmark_scripts.py
+"""
+import importlib.util
+import os
+import tempfile
+import unittest
+
+_db_file = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
+_db_file.close()
+os.environ["DATABASE_URL"] = "sqlite:///" + _db_file.name.replace("\\", "/")
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import ChatMessage, Event, User, UserBadgeCounter  # noqa: E402
+
+_SCRIPTS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+
+
+def _load(name):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(_SCRIPTS, f"{name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+seed_synthetic = _load("seed_synthetic")
+benchmark_endpoints = _load("benchmark_endpoints")
+
+
+class SyntheticBenchmarkTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app.config["TESTING"] = True
+        with cls.app.app_context():
+            db.drop_all()
+            db.create_all()
+            args = seed_synthetic.parse_args(
+                ["--users", "60", "--events", "120", "--messages", "600", "--payments", "100",
+                 "--reviews", "20", "--applications", "40", "--batch", "50"]
+            )
+            seed_synthetic.seed(args)
+
+    def test_seeded_volumes_and_counters(self):
+        with self.app.app_context():
+            self.assertEqual(User.query.count(), 60)
+            self.assertEqual(Event.query.count(), 120)
+            unread = ChatMessage.query.filter_by(is_read=False).count()
+            self.assertEqual(sum(c.chat_unread for c in UserBadgeCounter.query), unread)
+
+    def test_benchmark_reports_percentiles_and_queries(self):
+        doc = benchmark_endpoints.run_benchmark(self.app, requests=60, warmup=5, seed=1)
+        self.assertEqual(doc["dataset"]["events"], 120)
+        self.assertTrue(doc["scenarios"])
+        for name, row in doc["scenarios"].items():
+            self.assertEqual(row["errors"], 0, name)
+            self.assertLessEqual(row["p50_ms"], row["p95_ms"])
+            self.assertLessEqual(row["p95_ms"], row["p99_ms"])
+            self.assertGreater(row["queries_mean"], 0)
+
+    def test_percentile_is_nearest_rank(self):
+        values = list(range(1, 11))
+        # ranks 5, 10, 1, 10: whole-number ranks must not round up
+        self.assertEqual([benchmark_endpoints._percentile(values, p) for p in (50, 95, 10, 100)], [5, 10, 1, 10])
+        self.assertEqual(benchmark_endpoints._percentile(list(range(1, 21)), 50), 10)
+
+    def test_compare_flags_p95_regressions(self):
+        base = {"scenarios": {"a": {"p95_ms": 10.0, "queries_mean": 3}}}
+        now = {"scenarios": {"a": {"p95_ms": 13.0, "queries_mean": 3}}}
+        self.assertEqual(benchmark_endpoints.compare(now, base, 0.2), ["a"])
+        self.assertEqual(benchmark_endpoints.compare(now, base, 0.5), [])
+
+
+def tearDownModule():
+    try:
+        os.unlink(_db_file.name)
+    except OSError:
+        pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,221 @@
+"""
+Tests for the cache subsystem: backends, tags, invalidation on commit and stampede protection.
+Run from eventify-backend: python tests/test_cache.py
+"""
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+
+_db_file = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
+_db_file.close()
+os.environ["DATABASE_URL"] = "sqlite:///" + _db_file.name.replace("\\", "/")
+_cache_file = _db_file.name + ".cache"
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+from app import create_app  # noqa: E402
+from app.cache import MemoryBackend, RedisBackend, SQLiteBackend  # noqa: E402
+from app.extensions import cache, db  # noqa: E402
+from app.models import User  # noqa: E402
+
+
+class BackendContract:
+    def make_backend(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.backend = self.make_backend()
+        self.backend.clear()
+
+    def test_set_get_delete(self):
+        self.backend.set("a", {"n": 1})
+        self.assertEqual(self.backend.get_many(["a", "b"])[0], {"n": 1})
+        self.assertFalse(isinstance(self.backend.get_many(["a", "b"])[1], dict))
+        self.backend.delete(["a"])
+        self.assertNotEqual(self.backend.get_many(["a"])[0], {"n": 1})
+
+    def test_ttl_and_add(self):
+        self.assertTrue(self.backend.add("lock", "me", 0.05))
+        self.assertFalse(self.backend.add("lock", "you", 0.05))
+        time.sleep(0.1)
+        self.assertTrue(self.backend.add("lock", "you", 5))
+        self.assertEqual(self.backend.get_many(["lock"])[0], "you")
+
+    def test_versions_are_stable_until_bumped(self):
+        first = self.backend.versions(["t:1", "t:2"])
+        self.assertEqual(self.backend.versions(["t:1", "t:2"]), first)
+        self.backend.bump(["t:1", "t:3"])
+        second = self.backend.versions(["t:1", "t:2"])
+        self.assertEqual(second, [first[0] + 1, first[1]])
+
+    def test_clear_only_touches_the_prefix(self):
+        self.backend.set("app1:k", 1)
+        self.backend.set("app2:k", 2)
+        self.backend.clear("app1:")
+        self.assertEqual(self.backend.get_many(["app2:k"])[0], 2)
+        self.assertNotEqual(self.backend.get_many(["app1:k"])[0], 1)
+
+
+class MemoryBackendTests(BackendContract, unittest.TestCase):
+    def make_backend(self):
+        return MemoryBackend(max_entries=100)
+
+    def test_lru_is_bounded(self):
+        backend = MemoryBackend(max_entries=2)
+        for key in "abc":
+            backend.set(key, key)
+        self.assertEqual(backend.get_many(["b", "c"]), ["b", "c"])
+        self.assertNotEqual(backend.get_many(["a"])[0], "a")
+
+
+class SQLiteBackendTests(BackendContract, unittest.TestCase):
+    def make_backend(self):
+        return SQLiteBackend(_cache_file)
+
+    def test_known_tags_are_read_while_another_worker_writes(self):
+        self.backend.versions(["t:1"])
+        backend = SQLiteBackend(_cache_file, timeout=0.1)
+        writer = sqlite3.connect(_cache_file, isolation_level=None)
+        writer.execute("BEGIN IMMEDIATE")
+        try:
+            self.assertEqual(backend.versions(["t:1"]), self.backend.versions(["t:1"]))
+            with self.assertRaises(sqlite3.OperationalError):
+                backend.versions(["t:new"])  # creating a tag still needs the write lock
+        finally:
+            writer.execute("ROLLBACK")
+            writer.close()
+        self.assertEqual(len(backend.versions(["t:new", "t:new"])), 2)
+
+
+@unittest.skipIf(fakeredis is None, "fakeredis is not installed")
+class RedisBackendTests(BackendContract, unittest.TestCase):
+    def make_backend(self):
+        return RedisBackend(fakeredis.FakeRedis())
+
+
+class CacheTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app.config["TESTING"] = True
+
+    def setUp(self):
+        with self.app.app_context():
+            cache.clear()
+            db.drop_all()
+            db.create_all()
+            user = User(name="Host", email="host@test.com", role="user")
+            db.session.add(user)
+            db.session.commit()
+            self.user_id = user.id
+
+    def test_tags_invalidate_only_their_entries(self):
+        with self.app.app_context():
+            cache.set("event-card", "card", tags=("event:42",))
+            cache.set("profile", "profile", tags=("user:7",))
+            cache.invalidate_tags("event:42")
+            self.assertIsNone(cache.get("event-card"))
+            self.assertEqual(cache.get("profile"), "profile")
+
+    def test_commits_invalidate_rows_and_tables(self):
+        with self.app.app_context():
+            cache.set("row", 1, tags=(f"user:{self.user_id}",))
+            cache.set("table", 1, tags=("user",))
+            cache.set("other-row", 1, tags=(f"user:{self.user_id + 1}",))
+            db.session.add(User(name="New", email="new@test.com", role="user"))
+            db.session.commit()
+            self.assertEqual(cache.get("row"), 1)  # inserts only bump the table tag
+            self.assertIsNone(cache.get("table"))
+
+            db.session.get(User, self.user_id).role = "organizer"
+            db.session.rollback()
+            self.assertEqual(cache.get("row"), 1)
+
+            db.session.get(User, self.user_id).role = "organizer"
+            db.session.commit()
+            self.assertIsNone(cache.get("row"))
+            self.assertEqual(cache.get("other-row"), 1)
+
+    def test_get_or_set_computes_once_under_concurrency(self):
+        calls = []
+
+        def producer():
+            calls.append(1)
+            time.sleep(0.05)
+            return "value"
+
+        results = []
+
+        def worker():
+            with self.app.app_context():
+                results.append(cache.get_or_set("slow", producer, ttl=60))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, ["value"] * 8)
+        self.assertEqual(len(calls), 1)
+
+
+class SharedCacheTests(unittest.TestCase):
+    """Two apps on one SQLite cache file stand in for two workers."""
+
+    @classmethod
+    def setUpClass(cls):
+        config = {"CACHE_BACKEND": "sqlite", "CACHE_SQLITE_PATH": _cache_file, "CACHE_LOCK_TIMEOUT": 2}
+        cls.worker_a = create_app(config)
+        cls.worker_b = create_app(config)
+
+    def setUp(self):
+        with self.worker_a.app_context():
+            cache.clear()
+            db.drop_all()
+            db.create_all()
+            user = User(name="Host", email="host@test.com", role="user")
+            db.session.add(user)
+            db.session.commit()
+            self.user_id = user.id
+
+    def test_write_in_one_worker_invalidates_the_other(self):
+        with self.worker_b.app_context():
+            cache.set("identity", "user", tags=(f"user:{self.user_id}",))
+        with self.worker_a.app_context():
+            self.assertEqual(cache.get("identity"), "user")
+            db.session.get(User, self.user_id).role = "organizer"
+            db.session.commit()
+        with self.worker_b.app_context():
+            self.assertIsNone(cache.get("identity"))
+
+    def test_waits_for_the_worker_holding_the_lock(self):
+        with self.worker_a.app_context():
+            state = self.worker_a.extensions["cache"]
+            self.assertTrue(state.backend.add(f"{state.prefix}lock:report", "worker-a", 2))
+
+        def finish():
+            with self.worker_a.app_context():
+                cache.set("report", "from a")
+
+        threading.Timer(0.2, finish).start()
+        with self.worker_b.app_context():
+            self.assertEqual(cache.get_or_set("report", lambda: "from b"), "from a")
+
+
+def tearDownModule():
+    for name in (_db_file.name, _cache_file):
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.unlink(name + suffix)
+            except OSError:
+                pass
+
+
+if __name__ == "__main__":
+    unittest.main()
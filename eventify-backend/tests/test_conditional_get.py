@@ -0,0 +1,153 @@
+"""
+Tests for conditional GET: resource version counters, ETag / 304 and Last-Modified.
+Run from eventify-backend: python tests/test_conditional_get.py
+"""
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+_db_file = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
+_db_file.close()
+os.environ["DATABASE_URL"] = "sqlite:///" + _db_file.name.replace("\\", "/")
+
+from flask import jsonify  # noqa: E402
+from flask_jwt_extended import create_access_token, jwt_required  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.api.payments import create_notification  # noqa: E402
+from app.conditional import conditional, resource_versions  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import Event, ResourceVersion, User  # noqa: E402
+from app.utils.bulk import bulk_update  # noqa: E402
+
+
+class ConditionalGetTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app.config["TESTING"] = True
+        cls.calls = 0
+
+        @cls.app.route("/_test/events")
+        @jwt_required()
+        @conditional("event")
+        def counted():
+            cls.calls += 1
+            return jsonify(count=Event.query.count())
+
+        cls.client = cls.app.test_client()
+
+    def setUp(self):
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            u = User(name="Host", email="host@test.com", role="user")
+            u.set_password("Testpass1!")
+            v = User(name="Vendor", email="vendor@test.com", role="vendor")
+            v.set_password("Testpass1!")
+            db.session.add_all([u, v])
+            db.session.commit()
+            self.user_id, self.vendor_id = u.id, v.id
+            self.headers = {"Authorization": f"Bearer {create_access_token(identity=str(u.id))}"}
+
+    def _add_event(self, name="Gala"):
+        with self.app.app_context():
+            ev = Event(name=name, date="2026-05-01", venue="Lahore", budget=1000.0, vendor_category="Wedding", user_id=self.user_id)
+            db.session.add(ev)
+            db.session.commit()
+            return ev.id
+
+    def _versions(self, *names):
+        with self.app.app_context():
+            return {name: version for name, (version, _) in resource_versions(names).items()}
+
+    def test_unchanged_poll_is_304_without_calling_the_view(self):
+        first = self.client.get("/api/events", headers=self.headers)
+        self.assertEqual(first.status_code, 200)
+        etag = first.headers["ETag"]
+        self.assertEqual(first.headers["Cache-Control"], "private, no-cache")
+
+        again = self.client.get("/api/events", headers={**self.headers, "If-None-Match": etag})
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.get_data(), b"")
+        self.assertEqual(again.headers["ETag"], etag)
+
+        type(self).calls = 0
+        etag = self.client.get("/_test/events", headers=self.headers).headers["ETag"]
+        self.client.get("/_test/events", headers={**self.headers, "If-None-Match": etag})
+        self.assertEqual(self.calls, 1)
+
+    def test_write_changes_the_etag(self):
+        etag = self.client.get("/api/events", headers=self.headers).headers["ETag"]
+        self._add_event()
+        res = self.client.get("/api/events", headers={**self.headers, "If-None-Match": etag})
+        self.assertEqual(res.status_code, 200)
+        self.assertNotEqual(res.headers["ETag"], etag)
+        self.assertEqual(len(res.get_json()["created"]), 1)
+
+    def test_etag_is_per_user_and_query(self):
+        with self.app.app_context():
+            vendor = {"Authorization": f"Bearer {create_access_token(identity=str(self.vendor_id))}"}
+        mine = self.client.get("/api/events", headers=self.headers).headers["ETag"]
+        theirs = self.client.get("/api/events", headers=vendor).headers["ETag"]
+        paged = self.client.get("/api/events?limit=5", headers=self.headers).headers["ETag"]
+        self.assertEqual(len({mine, theirs, paged}), 3)
+
+    def test_counters_follow_flushes_bulk_updates_and_collections(self):
+        event_id = self._add_event()
+        before = self._versions("event", "vendor_events")
+        with self.app.app_context():
+            bulk_update(Event, {Event.status: "completed"}, Event.id == event_id)
+            db.session.commit()
+        self.assertEqual(self._versions("event")["event"], before["event"] + 1)
+        with self.app.app_context():
+            vendor = db.session.get(User, self.vendor_id)
+            vendor.assigned_events.append(db.session.get(Event, event_id))
+            db.session.commit()
+        self.assertEqual(self._versions("vendor_events")["vendor_events"], before["vendor_events"] + 1)
+
+    def test_rollback_does_not_bump(self):
+        before = self._versions("event")["event"]
+        with self.app.app_context():
+            db.session.add(Event(name="Draft", date="2026-05-01", venue="X", budget=1.0, vendor_category="Y", user_id=self.user_id))
+            db.session.flush()
+            db.session.rollback()
+            db.session.commit()
+        self.assertEqual(self._versions("event")["event"], before)
+
+    def test_notifications_token_tracks_in_memory_list(self):
+        etag = self.client.get("/api/payments/notifications", headers=self.headers).headers["ETag"]
+        res = self.client.get("/api/payments/notifications", headers={**self.headers, "If-None-Match": etag})
+        self.assertEqual(res.status_code, 304)
+        create_notification(self.user_id, "Hi", "New message")
+        res = self.client.get("/api/payments/notifications", headers={**self.headers, "If-None-Match": etag})
+        self.assertEqual(res.status_code, 200)
+        self.assertNotIn("Last-Modified", res.headers)
+
+    def test_if_modified_since_once_the_write_second_has_passed(self):
+        self._add_event()
+        with self.app.app_context():
+            row = db.session.get(ResourceVersion, "event")
+            row.updated_at = datetime.utcnow() - timedelta(minutes=5)
+            db.session.commit()  # touches resource_version only, which is not counted
+        res = self.client.get("/_test/events", headers=self.headers)
+        last_modified = res.headers["Last-Modified"]
+        res = self.client.get("/_test/events", headers={**self.headers, "If-Modified-Since": last_modified})
+        self.assertEqual(res.status_code, 304)
+        self._add_event("Second")
+        res = self.client.get("/_test/events", headers={**self.headers, "If-Modified-Since": last_modified})
+        self.assertEqual(res.status_code, 200)
+        self.assertNotIn("Last-Modified", res.headers)
+
+
+def tearDownModule():
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.unlink(_db_file.name + suffix)
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    unittest.main()
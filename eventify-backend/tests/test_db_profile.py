@@ -0,0 +1,69 @@
+"""
+Tests for the engine profiles (SQLite pragmas, server pool options).
+Run from eventify-backend: python tests/test_db_profile.py
+"""
+import os
+import tempfile
+import unittest
+
+_db_file = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
+_db_file.close()
+os.environ["DATABASE_URL"] = "sqlite:///" + _db_file.name.replace("\\", "/")
+
+from sqlalchemy import text  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.config import db_profile, engine_options  # noqa: E402
+from app.extensions import db  # noqa: E402
+
+
+class EngineOptionsTests(unittest.TestCase):
+    def test_auto_profile_follows_url_scheme(self):
+        self.assertEqual(db_profile({"SQLALCHEMY_DATABASE_URI": "sqlite:///x.db"}), "sqlite")
+        self.assertEqual(db_profile({"SQLALCHEMY_DATABASE_URI": "postgresql://h/db"}), "server")
+        self.assertEqual(db_profile({"DB_PROFILE": "none", "SQLALCHEMY_DATABASE_URI": "sqlite://"}), "none")
+
+    def test_server_profile_keeps_json_options_and_adds_pooling(self):
+        base = {"json_serializer": str}
+        options = engine_options({
+            "SQLALCHEMY_DATABASE_URI": "postgresql://h/db",
+            "SQLALCHEMY_ENGINE_OPTIONS": base,
+            "DB_POOL_SIZE": 7,
+            "DB_STATEMENT_TIMEOUT_MS": 2500,
+        })
+        self.assertIs(options["json_serializer"], str)
+        self.assertEqual(options["pool_size"], 7)
+        self.assertTrue(options["pool_pre_ping"])
+        self.assertEqual(options["connect_args"], {"options": "-c statement_timeout=2500"})
+        self.assertNotIn("pool_size", base)
+
+    def test_mysql_statement_timeout(self):
+        options = engine_options({"SQLALCHEMY_DATABASE_URI": "mysql+pymysql://h/db", "DB_STATEMENT_TIMEOUT_MS": 1000})
+        self.assertEqual(options["connect_args"]["init_command"], "SET SESSION max_execution_time=1000")
+
+    def test_none_profile_leaves_driver_defaults(self):
+        options = engine_options({"SQLALCHEMY_DATABASE_URI": "postgresql://h/db", "DB_PROFILE": "none"})
+        self.assertEqual(options, {})
+
+
+class SqlitePragmaTests(unittest.TestCase):
+    def test_connections_get_wal_and_pragmas(self):
+        app = create_app()
+        with app.app_context():
+            with db.engine.connect() as conn:
+                self.assertEqual(conn.execute(text("PRAGMA journal_mode")).scalar(), "wal")
+                self.assertEqual(conn.execute(text("PRAGMA synchronous")).scalar(), 1)  # NORMAL
+                self.assertEqual(conn.execute(text("PRAGMA busy_timeout")).scalar(), app.config["SQLITE_BUSY_TIMEOUT_MS"])
+                self.assertEqual(conn.execute(text("PRAGMA cache_size")).scalar(), -app.config["SQLITE_CACHE_SIZE_KB"])
+
+
+def tearDownModule():
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.unlink(_db_file.name + suffix)
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,277 @@
+"""
+API tests for event listing (recency order, keyset pagination, filters).
+Run from eventify-backend: python tests/test_events_api.py
+"""
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+_db_file = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
+_db_file.close()
+os.environ["DATABASE_URL"] = "sqlite:///" + _db_file.name.replace("\\", "/")
+
+from sqlalchemy import insert, update  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import User, Event, EventApplication, vendor_events  # noqa: E402
+from app.open_events_feed import invalidate_open_events  # noqa: E402
+from flask_jwt_extended import create_access_token  # noqa: E402
+
+
+class EventsListAPITests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app.config["TESTING"] = True
+        cls.client = cls.app.test_client()
+
+    def setUp(self):
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            u = User(name="Host", email="host@test.com", role="user")
+            u.set_password("Testpass1!")
+            o = User(name="Org", email="org@test.com", role="organizer")
+            o.set_password("Testpass1!")
+            v = User(name="Vendor", email="vendor@test.com", role="vendor")
+            v.set_password("Testpass1!")
+            db.session.add_all([u, o, v])
+            db.session.commit()
+
+            base = datetime(2026, 1, 1, 12, 0, 0)
+            self.expected_order = []
+            for i in range(5):
+                ev = Event(
+                    name=f"Event {i}",
+                    date=f"2026-0{i + 1}-15",
+                    venue="Lahore",
+                    budget=1000.0,
+                    vendor_category="Wedding",
+                    user_id=u.id,
+                    organizer_id=o.id if i % 2 == 0 else None,
+                    status="completed" if i == 4 else "created",
+                    created_at=base,
+                    # events 1 and 2 share a timestamp to exercise the id tie-break
+                    updated_at=base + timedelta(hours=(0, 1, 1, 3, 4)[i]),
+                )
+                db.session.add(ev)
+                db.session.flush()
+                self.expected_order.append(ev.id)
+            db.session.execute(
+                insert(vendor_events).values(vendor_id=v.id, event_id=self.expected_order[0], partnership_status="pending")
+            )
+            db.session.commit()
+            # newest activity first, ties broken by id desc
+            self.expected_order = [self.expected_order[i] for i in (4, 3, 2, 1, 0)]
+            self.host_id = u.id
+            self.org_id = o.id
+            self.vendor_id = v.id
+
+    def _get(self, user_id, **params):
+        with self.app.app_context():
+            token = create_access_token(identity=str(user_id))
+        return self.client.get("/api/events", query_string=params, headers={"Authorization": f"Bearer {token}"})
+
+    def _page_through(self):
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["created_cursor"] = cursor
+            body = self._get(self.host_id, **params).get_json()
+            seen.extend(e["id"] for e in body["created"])
+            cursor = body["next_cursors"]["created"]
+            if not cursor:
+                break
+        return seen
+
+    def test_unpaginated_list_is_sorted_by_recency(self):
+        res = self._get(self.host_id)
+        self.assertEqual(res.status_code, 200)
+        body = res.get_json()
+        self.assertEqual([e["id"] for e in body["created"]], self.expected_order)
+        self.assertNotIn("next_cursors", body)
+        by_id = {e["id"]: e for e in body["created"]}
+        self.assertEqual(by_id[self.expected_order[-1]]["reserving_vendor_id"], self.vendor_id)
+
+    def test_keyset_pages_cover_every_event_once(self):
+        self.assertEqual(self._page_through(), self.expected_order)
+
+    def test_events_without_timestamps_page_last(self):
+        with self.app.app_context():
+            db.session.execute(
+                update(Event).where(Event.id == self.expected_order[1]).values(created_at=None, updated_at=None)
+            )
+            db.session.commit()
+        expected = [i for i in self.expected_order if i != self.expected_order[1]] + [self.expected_order[1]]
+        self.assertEqual([e["id"] for e in self._get(self.host_id).get_json()["created"]], expected)
+        self.assertEqual(self._page_through(), expected)
+
+    def test_status_and_date_filters(self):
+        body = self._get(self.host_id, status="completed").get_json()
+        self.assertEqual([e["name"] for e in body["created"]], ["Event 4"])
+
+        body = self._get(self.org_id, date_from="2026-02-01", date_to="2026-04-30").get_json()
+        self.assertEqual([e["name"] for e in body["assigned"]], ["Event 2"])
+
+        self.assertEqual(self._get(self.host_id, date_from="soon").status_code, 400)
+        self.assertEqual(self._get(self.host_id, limit=2, created_cursor="junk").status_code, 400)
+
+
+
+class OpenEventsFeedAPITests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app.config["TESTING"] = True
+        cls.app.config["OPEN_EVENTS_COUNT_TTL"] = 300
+        cls.client = cls.app.test_client()
+
+    def setUp(self):
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            u = User(name="Host", email="host@test.com", role="user")
+            u.set_password("Testpass1!")
+            o = User(name="Org", email="org@test.com", role="organizer")
+            o.set_password("Testpass1!")
+            db.session.add_all([u, o])
+            db.session.commit()
+            self.open_ids = []
+            for i, (venue, budget, category) in enumerate(
+                [("Lahore", 500.0, "Wedding"), ("Karachi", 1500.0, "Wedding"), ("Lahore", 2500.0, "Birthday")]
+            ):
+                ev = Event(name=f"Open {i}", date="2026-09-01", venue=venue, budget=budget,
+                           vendor_category=category, user_id=u.id, status="created")
+                db.session.add(ev)
+                db.session.flush()
+                self.open_ids.append(ev.id)
+            db.session.add(Event(name="Taken", date="2026-09-01", venue="Lahore", budget=100.0,
+                                 vendor_category="Wedding", user_id=u.id, organizer_id=o.id,
+                                 status="awaiting_organizer_confirmation"))
+            db.session.add(EventApplication(event_id=self.open_ids[0], organizer_id=o.id, status="pending"))
+            db.session.commit()
+            self.host_id = u.id
+            self.org_id = o.id
+            invalidate_open_events()
+
+    def _headers(self, user_id):
+        with self.app.app_context():
+            token = create_access_token(identity=str(user_id))
+        return {"Authorization": f"Bearer {token}"}
+
+    def test_feed_excludes_pending_applications_and_paginates(self):
+        headers = self._headers(self.org_id)
+        legacy = self.client.get("/api/events/open", headers=headers).get_json()
+        self.assertEqual([e["id"] for e in legacy], [self.open_ids[2], self.open_ids[1]])
+
+        page = self.client.get("/api/events/open", query_string={"limit": 1}, headers=headers).get_json()
+        self.assertEqual([e["id"] for e in page["events"]], [self.open_ids[2]])
+        page = self.client.get(
+            "/api/events/open", query_string={"limit": 1, "cursor": page["next_cursor"]}, headers=headers
+        ).get_json()
+        self.assertEqual([e["id"] for e in page["events"]], [self.open_ids[1]])
+        self.assertIsNone(page["next_cursor"])
+
+        filtered = self.client.get(
+            "/api/events/open", query_string={"city": "lahore", "min_budget": 1000}, headers=headers
+        ).get_json()
+        self.assertEqual([e["name"] for e in filtered], ["Open 2"])
+
+    def test_badge_count_is_cached_and_invalidated_on_apply(self):
+        headers = self._headers(self.org_id)
+        self.assertEqual(self.client.get("/api/events/open/count", headers=headers).get_json()["count"], 2)
+
+        # Committing any event write drops the cached count, even outside the API
+        with self.app.app_context():
+            db.session.add(Event(name="Sneaky", date="2026-09-01", venue="Lahore", budget=10.0,
+                                 vendor_category="Wedding", user_id=self.host_id, status="created"))
+            db.session.commit()
+        self.assertEqual(self.client.get("/api/events/open/count", headers=headers).get_json()["count"], 3)
+
+        for event_id in self.open_ids[1:]:
+            res = self.client.post(f"/api/events/{event_id}/apply", json={}, headers=headers)
+            self.assertEqual(res.status_code, 201)
+        # 3 open (including "Sneaky") minus 2 freshly applied
+        self.assertEqual(self.client.get("/api/events/open/count", headers=headers).get_json()["count"], 1)
+
+
+class EventWritePathTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app.config["TESTING"] = True
+        cls.client = cls.app.test_client()
+
+    def setUp(self):
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            u = User(name="Host", email="host@test.com", role="user")
+            u.set_password("Testpass1!")
+            orgs = [User(name=f"Org {i}", email=f"org{i}@test.com", role="organizer") for i in range(3)]
+            vendors = [User(name=f"Vendor {i}", email=f"vendor{i}@test.com", role="vendor") for i in range(2)]
+            for person in orgs + vendors:
+                person.set_password("Testpass1!")
+            db.session.add_all([u] + orgs + vendors)
+            db.session.commit()
+            ev = Event(name="Gala", date="2026-09-01", venue="Lahore", budget=1000.0,
+                       vendor_category="Wedding", user_id=u.id, status="created")
+            db.session.add(ev)
+            db.session.flush()
+            for o in orgs:
+                db.session.add(EventApplication(event_id=ev.id, organizer_id=o.id, status="pending"))
+            for v in vendors:
+                db.session.execute(insert(vendor_events).values(vendor_id=v.id, event_id=ev.id, partnership_status="pending"))
+            db.session.commit()
+            self.host_id = u.id
+            self.org_ids = [o.id for o in orgs]
+            self.vendor_ids = [v.id for v in vendors]
+            self.event_id = ev.id
+
+    def _headers(self, user_id):
+        with self.app.app_context():
+            token = create_access_token(identity=str(user_id))
+        return {"Authorization": f"Bearer {token}"}
+
+    def test_assigning_organizer_rejects_other_applications(self):
+        res = self.client.post(
+            f"/api/events/{self.event_id}/assign-organizer",
+            json={"organizer_id": self.org_ids[1]},
+            headers=self._headers(self.host_id),
+        )
+        self.assertEqual(res.status_code, 200)
+        with self.app.app_context():
+            statuses = {a.organizer_id: a.status for a in EventApplication.query.filter_by(event_id=self.event_id)}
+        self.assertEqual(statuses, {self.org_ids[0]: "rejected", self.org_ids[1]: "accepted", self.org_ids[2]: "rejected"})
+
+    def test_delete_unlinks_and_notifies_every_vendor(self):
+        from app.api.payments import demo_notifications
+
+        before = len(demo_notifications)
+        res = self.client.delete(f"/api/events/{self.event_id}", headers=self._headers(self.host_id))
+        self.assertEqual(res.status_code, 200)
+        with self.app.app_context():
+            self.assertEqual(db.session.query(vendor_events).count(), 0)
+            self.assertEqual(db.session.get(Event, self.event_id).status, "canceled")
+        notified = sorted(n["user_id"] for n in demo_notifications[before:])
+        self.assertEqual(notified, sorted(self.vendor_ids))
+
+        # A second delete on the canceled event removes it for good
+        res = self.client.delete(f"/api/events/{self.event_id}", headers=self._headers(self.host_id))
+        self.assertEqual(res.status_code, 200)
+        with self.app.app_context():
+            self.assertIsNone(db.session.get(Event, self.event_id))
+
+
+def tearDownModule():
+    try:
+        os.unlink(_db_file.name)
+    except OSError:
+        pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+"""
+Tests for the serialized-fragment cache: row_version bumps and cached Event / User dicts.
+Run from eventify-backend: python tests/test_fragment_cache.py
+"""
+import os
+import tempfile
+import unittest
+
+_db_file = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
+_db_file.close()
+os.environ["DATABASE_URL"] = "sqlite:///" + _db_file.name.replace("\\", "/")
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+from sqlalchemy import event as sa_event  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.fragment_cache import FragmentCache, lookup_fragment  # noqa: E402
+from app.models import Event, User, vendor_events  # noqa: E402
+from app.utils.bulk import bulk_update  # noqa: E402
+
+
+class DictStore:
+    """The slice of the app cache API the fragment cache uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ttl=None):
+        self.data[key] = value
+
+
+class FragmentCacheTests(unittest.TestCase):
+    def test_lru_is_bounded(self):
+        cache = FragmentCache(2)
+        cache.put("a", {"v": 1})
+        cache.put("b", {"v": 2})
+        cache.get("a")
+        cache.put("c", {"v": 3})
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), {"v": 1})
+
+    def test_shared_store_fills_other_workers(self):
+        store = DictStore()
+        FragmentCache(10, shared=store, shared_ttl=60).put("k", {"name": "Gala"})
+        other = FragmentCache(10, shared=store, shared_ttl=60)
+        self.assertEqual(other.get("k"), {"name": "Gala"})
+        self.assertEqual((other.hits, len(other)), (1, 1))
+
+
+class RowVersionTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app.config["TESTING"] = True
+        cls.client = cls.app.test_client()
+
+    def setUp(self):
+        self.app.extensions["fragment_cache"].clear()
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            host = User(name="Host", email="host@test.com", role="user")
+            organizer = User(name="Organizer", email="org@test.com", role="organizer")
+            vendor = User(name="Vendor", email="vendor@test.com", role="vendor")
+            db.session.add_all([host, organizer, vendor])
+            db.session.flush()
+            ev = Event(
+                name="Gala", date="2026-05-01", venue="Lahore", budget=1000.0, vendor_category="Catering",
+                user_id=host.id, organizer_id=organizer.id, organizer_status="accepted",
+                status="advance_payment_completed",
+            )
+            db.session.add(ev)
+            db.session.flush()
+            db.session.execute(
+                insert(vendor_events), [{"vendor_id": vendor.id, "event_id": ev.id, "partnership_status": "pending"}]
+            )
+            db.session.commit()
+            self.host_id, self.vendor_id, self.event_id = host.id, vendor.id, ev.id
+
+    def _render(self):
+        with self.app.app_context():
+            return db.session.get(Event, self.event_id).to_dict()
+
+    def _statements(self):
+        seen = []
+
+        def record(conn, cursor, statement, *args):
+            seen.append(statement)
+
+        engine = db.engine
+        sa_event.listen(engine, "before_cursor_execute", record)
+        self.addCleanup(sa_event.remove, engine, "before_cursor_execute", record)
+        return seen
+
+    def test_unchanged_event_is_a_cache_hit(self):
+        first = self._render()
+        with self.app.app_context():
+            ev = db.session.get(Event, self.event_id)
+            seen = self._statements()
+            self.assertEqual(ev.to_dict(), first)
+            self.assertEqual(seen, [])
+
+    def test_hits_are_copies(self):
+        self._render()["name"] = "Changed"
+        self.assertEqual(self._render()["name"], "Gala")
+
+    def test_orm_edits_and_bulk_updates_bump_the_version(self):
+        self._render()
+        with self.app.app_context():
+            ev = db.session.get(Event, self.event_id)
+            before = ev.row_version
+            ev.name = "Renamed"
+            self.assertEqual(ev.to_dict()["name"], "Renamed")  # unflushed edits skip the cache
+            db.session.commit()
+            self.assertEqual(ev.row_version, before + 1)
+        self.assertEqual(self._render()["name"], "Renamed")
+        with self.app.app_context():
+            bulk_update(Event, {Event.status: "completed"}, Event.id == self.event_id)
+            db.session.commit()
+        self.assertEqual(self._render()["status"], "completed")
+
+    def test_partnership_decline_refreshes_vendor_fields(self):
+        self.assertEqual(self._render()["partnership_pending_count"], 1)
+        with self.app.app_context():
+            token = create_access_token(identity=str(self.vendor_id))
+        res = self.client.post(
+            "/api/vendors/partnership/decline",
+            json={"event_id": self.event_id},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(self._render()["partnership_pending_count"], 0)
+
+    def test_collection_changes_and_renames_reach_event_dicts(self):
+        with self.app.app_context():
+            vendor = db.session.get(User, self.vendor_id)
+            ev = db.session.get(Event, self.event_id)
+            vendor.completed_events.append(ev)
+            db.session.commit()
+        self.assertEqual(self._render()["completed_vendors"], [{"id": self.vendor_id, "name": "Vendor"}])
+        with self.app.app_context():
+            db.session.get(User, self.vendor_id).name = "Vendor Co"
+            db.session.commit()
+        self.assertEqual(self._render()["completed_vendors"], [{"id": self.vendor_id, "name": "Vendor Co"}])
+
+    def test_user_fragments_leave_out_the_profile_image(self):
+        with self.app.app_context():
+            db.session.get(User, self.host_id).profile_image = "data:image/png;base64,AAAA"
+            db.session.commit()
+            user = db.session.get(User, self.host_id)
+            self.assertEqual(user.to_dict(include=())["profile_image"], "data:image/png;base64,AAAA")
+            _key, cached = lookup_fragment(user)
+            self.assertEqual(set(cached), set(User.SUMMARY_FIELDS))
+            self.assertEqual(user.to_dict(include=())["profile_image"], "data:image/png;base64,AAAA")
+
+    def test_rolled_back_writes_are_not_cached(self):
+        with self.app.app_context():
+            ev = db.session.get(Event, self.event_id)
+            ev.name = "Draft"
+            db.session.flush()
+            self.assertEqual(ev.to_dict()["name"], "Draft")
+            db.session.rollback()
+        self.assertEqual(self._render()["name"], "Gala")
+
+
+def tearDownModule():
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.unlink(_db_file.name + suffix)
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    unittest.main()
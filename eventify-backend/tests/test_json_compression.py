@@ -0,0 +1,130 @@
+"""
+Tests for the orjson JSON provider and Accept-Encoding response compression.
+Run from eventify-backend: python tests/test_json_compression.py
+"""
+import gzip
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from decimal import Decimal
+
+_db_file = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
+_db_file.close()
+os.environ["DATABASE_URL"] = "sqlite:///" + _db_file.name.replace("\\", "/")
+
+from flask import Response, jsonify, request  # noqa: E402
+from flask_jwt_extended import create_access_token  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import User  # noqa: E402
+
+
+class JSONProviderTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+
+    def test_datetimes_are_utc_z_and_decimals_strings(self):
+        payload = {
+            "naive": datetime(2025, 4, 27, 10, 0, 0),
+            "aware": datetime(2025, 4, 27, 10, 0, 0, tzinfo=timezone.utc),
+            "amount": Decimal("12.50"),
+        }
+        out = self.app.json.loads(self.app.json.dumps(payload))
+        self.assertEqual(out["naive"], "2025-04-27T10:00:00Z")
+        self.assertEqual(out["aware"], "2025-04-27T10:00:00Z")
+        self.assertEqual(out["amount"], "12.50")
+
+    def test_keys_sorted_and_wide_ints_fall_back(self):
+        self.assertEqual(self.app.json.dumps({"b": 1, "a": 2}), '{"a":2,"b":1}')
+        self.assertEqual(self.app.json.loads(self.app.json.dumps({"n": 2**70}))["n"], 2**70)
+
+    def test_jsonify_and_get_json_round_trip(self):
+        with self.app.test_request_context("/", method="POST", json={"name": "Gala", "guests": 120}):
+            self.assertEqual(request.get_json(), {"name": "Gala", "guests": 120})
+            response = jsonify(when=None, ok=True)
+            self.assertEqual(response.mimetype, "application/json")
+            self.assertEqual(response.get_data(), b'{"ok":true,"when":null}\n')
+
+
+class CompressionTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app({"COMPRESSION_MIN_SIZE": 500})
+        cls.app.config["TESTING"] = True
+
+        @cls.app.route("/_test/big")
+        def big():
+            return jsonify(items=[{"id": i, "name": f"vendor {i}"} for i in range(200)])
+
+        @cls.app.route("/_test/small")
+        def small():
+            return jsonify(ok=True)
+
+        @cls.app.route("/_test/etag")
+        def etagged():
+            response = jsonify(items=["x" * 40] * 50)
+            response.set_etag("v1")
+            return response
+
+        @cls.app.route("/_test/png")
+        def png():
+            return Response(b"\x89PNG" + b"\0" * 4000, mimetype="image/png")
+
+        cls.client = cls.app.test_client()
+
+    def test_gzip_when_accepted(self):
+        identity = self.client.get("/_test/big", headers={"Accept-Encoding": "identity"})
+        res = self.client.get("/_test/big", headers={"Accept-Encoding": "gzip, deflate"})
+        self.assertEqual(res.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", res.headers["Vary"])
+        self.assertEqual(gzip.decompress(res.get_data()), identity.get_data())
+        self.assertLess(int(res.headers["Content-Length"]), len(identity.get_data()))
+        self.assertNotIn("Content-Encoding", identity.headers)
+
+    def test_refused_or_small_or_binary_bodies_are_untouched(self):
+        self.assertNotIn("Content-Encoding", self.client.get("/_test/big", headers={"Accept-Encoding": "gzip;q=0"}).headers)
+        self.assertNotIn("Content-Encoding", self.client.get("/_test/big").headers)
+        small = self.client.get("/_test/small", headers={"Accept-Encoding": "gzip"})
+        self.assertNotIn("Content-Encoding", small.headers)
+        self.assertIn("Accept-Encoding", small.headers["Vary"])
+        self.assertNotIn("Content-Encoding", self.client.get("/_test/png", headers={"Accept-Encoding": "gzip"}).headers)
+
+    def test_strong_etag_becomes_weak(self):
+        res = self.client.get("/_test/etag", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(res.headers["Content-Encoding"], "gzip")
+        self.assertEqual(res.headers["ETag"], 'W/"v1"')
+
+    def test_streamed_csv_export_is_compressed(self):
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            admin = User(name="Admin", email="admin@test.com", role="admin")
+            admin.set_password("Testpass1!")
+            db.session.add(admin)
+            db.session.add_all(User(name=f"User {i}", email=f"u{i}@test.com", role="user") for i in range(1500))
+            db.session.commit()
+            token = create_access_token(identity=str(admin.id))
+        res = self.client.get(
+            "/api/admin/users/export", headers={"Authorization": f"Bearer {token}", "Accept-Encoding": "gzip"}
+        )
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.headers["Content-Encoding"], "gzip")
+        self.assertNotIn("Content-Length", res.headers)
+        lines = gzip.decompress(res.get_data()).decode("utf-8").splitlines()
+        self.assertEqual(lines[0].split(",")[:3], ["id", "name", "email"])
+        self.assertEqual(len(lines), 1 + 1501)
+
+
+def tearDownModule():
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.unlink(_db_file.name + suffix)
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    unittest.main()
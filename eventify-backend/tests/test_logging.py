@@ -0,0 +1,70 @@
+"""
+Tests for the queued JSON logging setup and request-id correlation.
+Run from eventify-backend: python tests/test_logging.py
+"""
+import json
+import logging
+import os
+import queue
+import tempfile
+import unittest
+
+_db_file = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
+_db_file.close()
+os.environ["DATABASE_URL"] = "sqlite:///" + _db_file.name.replace("\\", "/")
+
+from flask import g  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.logging_setup import JsonFormatter, RequestIdFilter, _StructuredQueueHandler  # noqa: E402
+
+
+class LoggingTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app.config["TESTING"] = True
+        cls.client = cls.app.test_client()
+
+    def test_request_id_is_echoed_or_generated(self):
+        res = self.client.get("/", headers={"X-Request-ID": "abc-123"})
+        self.assertEqual(res.headers["X-Request-ID"], "abc-123")
+        generated = self.client.get("/").headers["X-Request-ID"]
+        self.assertRegex(generated, r"^[0-9a-f]{32}$")
+
+    def test_records_are_rendered_on_caller_and_formatted_as_json(self):
+        q = queue.SimpleQueue()
+        handler = _StructuredQueueHandler(q)
+        handler.addFilter(RequestIdFilter())
+        logger = logging.getLogger("app.tests.logging")
+        logger.addHandler(handler)
+        try:
+            with self.app.test_request_context("/"):
+                g.request_id = "req-1"
+                try:
+                    raise ValueError("boom")
+                except ValueError:
+                    logger.exception("payment %s failed", 42, extra={"payment_id": 42})
+        finally:
+            logger.removeHandler(handler)
+
+        record = q.get_nowait()
+        self.assertIsNone(record.args)
+        self.assertIsNone(record.exc_info)
+        line = json.loads(JsonFormatter().format(record))
+        self.assertEqual(line["msg"], "payment 42 failed")
+        self.assertEqual(line["level"], "ERROR")
+        self.assertEqual(line["request_id"], "req-1")
+        self.assertEqual(line["payment_id"], 42)
+        self.assertIn("ValueError: boom", line["exc"])
+
+
+def tearDownModule():
+    try:
+        os.unlink(_db_file.name)
+    except OSError:
+        pass
+
+
+if __name__ == "__main__":
+    unittest.main()
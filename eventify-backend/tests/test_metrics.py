@@ -0,0 +1,99 @@
+"""
+Tests for the /metrics endpoint and the sharded histograms behind it.
+Run from eventify-backend: python tests/test_metrics.py
+"""
+import os
+import tempfile
+import threading
+import unittest
+
+_db_file = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
+_db_file.close()
+os.environ["DATABASE_URL"] = "sqlite:///" + _db_file.name.replace("\\", "/")
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.metrics import Histogram, track_outbound  # noqa: E402
+
+
+class HistogramTests(unittest.TestCase):
+    def test_shards_from_many_threads_are_summed(self):
+        h = Histogram("t_seconds", "test", ("kind",), (0.1, 1.0))
+
+        def work():
+            for _ in range(1000):
+                h.observe(0.05, "a")
+                h.observe(0.5, "a")
+                h.observe(5.0, "a")
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        cumulative, total = h.collect()[("a",)]
+        self.assertEqual(cumulative, [4000, 8000, 12000])
+        self.assertAlmostEqual(total, 4000 * 5.55, places=3)
+        self.assertIn('t_seconds_bucket{kind="a",le="+Inf"} 12000', h.render())
+
+    def test_finished_threads_are_folded_into_the_totals(self):
+        h = Histogram("t_seconds", "test", ("kind",), (0.1, 1.0))
+        for i in range(300):
+            # one short-lived thread per observation, like thread-per-request serving;
+            # idents are reused, sometimes before a scrape has seen the old thread exit
+            t = threading.Thread(target=h.observe, args=(0.05, "a"))
+            t.start()
+            t.join()
+            if i == 150:
+                h.collect()
+        cumulative, _total = h.collect()[("a",)]
+        self.assertEqual(cumulative, [300, 300, 300])
+        self.assertEqual(len(h._shards), 0)
+
+
+class MetricsEndpointTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app.config["TESTING"] = True
+        cls.client = cls.app.test_client()
+        with cls.app.app_context():
+            db.create_all()
+
+    def test_exposes_request_outbound_and_gauge_metrics(self):
+        self.client.get("/api/services/catalog")
+        with self.assertRaises(RuntimeError):
+            with track_outbound("stripe"):
+                raise RuntimeError("declined")
+
+        res = self.client.get("/metrics")
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.mimetype.startswith("text/plain"))
+        body = res.get_data(as_text=True)
+        self.assertIn(
+            'http_request_duration_seconds_count{blueprint="services",endpoint="services.get_service_catalog",method="GET",status="200"}',
+            body,
+        )
+        self.assertIn('outbound_request_duration_seconds_count{service="stripe",outcome="error"}', body)
+        self.assertIn("db_pool_checked_out ", body)
+        self.assertIn("notification_fanout_pending_vendors 0", body)
+
+    def test_token_protects_scrapes(self):
+        self.app.config["METRICS_TOKEN"] = "s3cret"
+        try:
+            self.assertEqual(self.client.get("/metrics").status_code, 401)
+            res = self.client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+            self.assertEqual(res.status_code, 200)
+        finally:
+            self.app.config["METRICS_TOKEN"] = None
+
+
+def tearDownModule():
+    try:
+        os.unlink(_db_file.name)
+    except OSError:
+        pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+API tests for the vendor payment state machine and bulk settlement.
+Run from eventify-backend: python tests/test_payment_ledger.py
+"""
+import os
+import tempfile
+import unittest
+
+_db_file = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
+_db_file.close()
+os.environ["DATABASE_URL"] = "sqlite:///" + _db_file.name.replace("\\", "/")
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import User, Event, EventVendorAgreement, Payment  # noqa: E402
+from flask_jwt_extended import create_access_token  # noqa: E402
+
+
+class PaymentLedgerAPITests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app.config["TESTING"] = True
+        cls.client = cls.app.test_client()
+
+    def setUp(self):
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            u = User(name="Host", email="host@test.com", role="user")
+            u.set_password("Testpass1!")
+            o = User(name="Org", email="org@test.com", role="organizer")
+            o.set_password("Testpass1!")
+            v1 = User(name="Caterer", email="v1@test.com", role="vendor")
+            v1.set_password("Testpass1!")
+            v2 = User(name="Florist", email="v2@test.com", role="vendor")
+            v2.set_password("Testpass1!")
+            db.session.add_all([u, o, v1, v2])
+            db.session.commit()
+
+            ev = Event(
+                name="Party",
+                date="2026-01-01",
+                venue="Lahore",
+                budget=2000.0,
+                vendor_category="Wedding",
+                user_id=u.id,
+                organizer_id=o.id,
+                organizer_status="accepted",
+            )
+            db.session.add(ev)
+            db.session.commit()
+            db.session.add_all([
+                EventVendorAgreement(event_id=ev.id, vendor_id=v1.id, agreed_price=1000.0),
+                EventVendorAgreement(event_id=ev.id, vendor_id=v2.id, agreed_price=400.0),
+            ])
+            db.session.commit()
+
+            self.org_id = o.id
+            self.v1_id = v1.id
+            self.v2_id = v2.id
+            self.event_id = ev.id
+
+    def _headers(self, user_id: int):
+        with self.app.app_context():
+            token = create_access_token(identity=str(user_id))
+        return {"Authorization": f"Bearer {token}"}
+
+    def test_bulk_settles_advance_and_final_in_one_call(self):
+        res = self.client.post(
+            "/api/payments/register/bulk",
+            json={
+                "event_id": self.event_id,
+                "payments": [
+                    {"vendor_id": self.v1_id, "payment_type": "advance", "amount": 250},
+                    {"vendor_id": self.v1_id, "payment_type": "final", "amount": 750},
+                    {"vendor_id": self.v2_id, "payment_type": "advance", "amount": 100},
+                ],
+            },
+            headers=self._headers(self.org_id),
+        )
+        self.assertEqual(res.status_code, 201, res.get_json())
+        body = res.get_json()
+        self.assertEqual(len(body["payments"]), 3)
+        self.assertEqual(body["ledger"]["total_spent"], 1100.0)
+        by_vendor = {a["vendor_id"]: a for a in body["ledger"]["vendor_agreements"]}
+        self.assertEqual(by_vendor[self.v1_id]["payment_status"], "completed")
+        self.assertEqual(by_vendor[self.v2_id]["advance_status"], "paid")
+        self.assertEqual(by_vendor[self.v2_id]["final_status"], "pending")
+
+    def test_bulk_is_all_or_nothing(self):
+        res = self.client.post(
+            "/api/payments/register/bulk",
+            json={
+                "event_id": self.event_id,
+                "payments": [
+                    {"vendor_id": self.v1_id, "payment_type": "advance", "amount": 250},
+                    {"vendor_id": self.v2_id, "payment_type": "final", "amount": 300},
+                ],
+            },
+            headers=self._headers(self.org_id),
+        )
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.get_json()["vendor_id"], self.v2_id)
+        with self.app.app_context():
+            self.assertEqual(Payment.query.count(), 0)
+            self.assertEqual(
+                EventVendorAgreement.query.filter_by(payment_status="pending").count(), 2
+            )
+
+    def test_single_register_rejects_duplicate_advance(self):
+        payload = {
+            "event_id": self.event_id,
+            "vendor_id": self.v2_id,
+            "payment_type": "advance",
+            "amount": 100,
+        }
+        first = self.client.post("/api/payments/register", json=payload, headers=self._headers(self.org_id))
+        self.assertEqual(first.status_code, 201)
+        again = self.client.post("/api/payments/register", json=payload, headers=self._headers(self.org_id))
+        self.assertEqual(again.status_code, 400)
+        self.assertIn("already paid", again.get_json()["error"])
+
+
+def tearDownModule():
+    try:
+        os.unlink(_db_file.name)
+    except OSError:
+        pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+Tests for the to_dict(fields=, include=) projections and the ?fields= / ?include= arguments.
+Run from eventify-backend: python tests/test_projections.py
+"""
+import os
+import tempfile
+import unittest
+
+_db_file = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
+_db_file.close()
+os.environ["DATABASE_URL"] = "sqlite:///" + _db_file.name.replace("\\", "/")
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+from sqlalchemy import event as sa_event  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import Event, User, vendor_events  # noqa: E402
+
+
+class ProjectionTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app.config["TESTING"] = True
+        cls.client = cls.app.test_client()
+
+    def setUp(self):
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            admin = User(name="Admin", email="admin@test.com", role="admin", is_verified=True)
+            admin.set_password("Testpass1!")
+            host = User(name="Host", email="host@test.com", role="user", is_verified=True, profile_image="data:image/png;base64,AAAA")
+            host.set_password("Testpass1!")
+            vendor = User(name="Vendor", email="vendor@test.com", role="vendor")
+            db.session.add_all([admin, host, vendor])
+            db.session.flush()
+            events = [
+                Event(name=f"Event {i}", date="2026-05-01", venue="Lahore", budget=1000.0, vendor_category="Catering", user_id=host.id)
+                for i in range(2)
+            ]
+            db.session.add_all(events)
+            db.session.flush()
+            db.session.execute(insert(vendor_events), [
+                {"vendor_id": vendor.id, "event_id": events[0].id, "partnership_status": "accepted"},
+                {"vendor_id": vendor.id, "event_id": events[1].id, "partnership_status": "pending"},
+            ])
+            db.session.commit()
+            self.admin_id, self.host_id, self.vendor_id = admin.id, host.id, vendor.id
+            self.event_ids = [e.id for e in events]
+
+    def _headers(self, user_id):
+        with self.app.app_context():
+            return {"Authorization": f"Bearer {create_access_token(identity=str(user_id))}"}
+
+    def _statements(self):
+        seen = []
+
+        def record(conn, cursor, statement, *args):
+            seen.append(statement)
+
+        engine = db.engine
+        sa_event.listen(engine, "before_cursor_execute", record)
+        self.addCleanup(sa_event.remove, engine, "before_cursor_execute", record)
+        return seen
+
+    def test_user_defaults_and_projections(self):
+        with self.app.app_context():
+            vendor = db.session.get(User, self.vendor_id)
+            full = vendor.to_dict()
+            self.assertEqual(set(full), set(User.DICT_FIELDS) | {"assigned_events"})
+            # vendors only see events whose partnership they accepted
+            self.assertEqual([e["id"] for e in full["assigned_events"]], [self.event_ids[0]])
+            self.assertEqual(full["assigned_events"][0]["assigned_vendor_ids"], [self.vendor_id])
+            self.assertEqual(set(vendor.to_dict(["id", "name"])), {"id", "name"})
+            self.assertNotIn("assigned_events", vendor.to_dict(include=()))
+            self.assertIn("assigned_events", vendor.to_dict(["id", "assigned_events"]))
+            with self.assertRaises(ValueError):
+                vendor.to_dict(["id", "password_hash"])
+
+    def test_event_fields_skip_vendor_lookups(self):
+        with self.app.app_context():
+            ev = db.session.get(Event, self.event_ids[0])
+            seen = self._statements()
+            self.assertEqual(ev.to_dict(fields=["id", "name", "budget"]), {"id": ev.id, "name": "Event 0", "budget": 1000.0})
+            self.assertEqual(seen, [])
+            self.assertEqual(ev.to_dict()["assigned_vendor_ids"], [self.vendor_id])
+
+    def test_load_options_select_only_rendered_columns(self):
+        with self.app.app_context():
+            seen = self._statements()
+            users = User.query.options(*User.dict_load_options(User.SUMMARY_FIELDS)).all()
+            [u.to_dict(User.SUMMARY_FIELDS) for u in users]
+            self.assertEqual(len(seen), 1)
+            self.assertNotIn("profile_image", seen[0])
+            self.assertNotIn("password_hash", seen[0])
+
+    def test_admin_list_is_light_and_honours_fields(self):
+        headers = self._headers(self.admin_id)
+        users = self.client.get("/api/admin/users", headers=headers).get_json()["users"]
+        self.assertTrue(users)
+        for u in users:
+            self.assertNotIn("profile_image", u)
+            self.assertNotIn("assigned_events", u)
+        users = self.client.get("/api/admin/users?fields=id,email", headers=headers).get_json()["users"]
+        self.assertEqual({frozenset(u) for u in users}, {frozenset(("id", "email"))})
+        res = self.client.get("/api/admin/users?fields=id,secret", headers=headers)
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("secret", res.get_json()["error"])
+        events = self.client.get("/api/admin/events?fields=id,name", headers=headers).get_json()["events"]
+        self.assertEqual({frozenset(e) for e in events}, {frozenset(("id", "name"))})
+
+    def test_login_and_profile(self):
+        res = self.client.post("/api/auth/login", json={"email": "host@test.com", "password": "Testpass1!"})
+        self.assertEqual(res.status_code, 200)
+        user = res.get_json()["user"]
+        self.assertNotIn("assigned_events", user)
+        self.assertEqual(user["profile_image"], "data:image/png;base64,AAAA")
+        me = self.client.get("/api/auth/me?fields=id,name", headers=self._headers(self.host_id)).get_json()
+        self.assertEqual(me, {"id": self.host_id, "name": "Host"})
+
+
+def tearDownModule():
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.unlink(_db_file.name + suffix)
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+Tests for the lazily built third-party clients in app.providers.
+Run from eventify-backend: python tests/test_providers.py
+"""
+import os
+import tempfile
+import unittest
+
+_db_file = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
+_db_file.close()
+os.environ["DATABASE_URL"] = "sqlite:///" + _db_file.name.replace("\\", "/")
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app import providers  # noqa: E402
+
+
+def _reset_all():
+    for name in list(providers._registry):
+        providers._registry[name].reset()
+
+
+class LazyProviderTests(unittest.TestCase):
+    def setUp(self):
+        _reset_all()
+        self.calls = []
+        self.provider = providers.LazyProvider("probe", lambda config: self.calls.append(1) or object())
+
+    def tearDown(self):
+        _reset_all()
+
+    def test_builds_once_on_first_get(self):
+        self.assertFalse(self.provider.loaded)
+        first = self.provider.get()
+        self.assertIs(self.provider.get(), first)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_reset_rebuilds(self):
+        first = self.provider.get()
+        self.provider.reset()
+        self.assertIsNot(self.provider.get(), first)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_fork_hook_drops_built_providers(self):
+        providers.get("http")
+        self.assertIn("http", providers.loaded())
+        providers._reset_after_fork()
+        self.assertEqual(providers.loaded(), [])
+
+
+class AppProviderTests(unittest.TestCase):
+    def setUp(self):
+        _reset_all()
+
+    def tearDown(self):
+        _reset_all()
+
+    def test_create_app_builds_nothing_by_default(self):
+        create_app({"PROVIDER_WARMUP": ""})
+        self.assertEqual(providers.loaded(), [])
+
+    def test_warmup_setting_builds_named_providers(self):
+        create_app({"PROVIDER_WARMUP": "http, stripe"})
+        self.assertEqual(providers.loaded(), ["http", "stripe"])
+
+    def test_stripe_key_comes_from_app_config(self):
+        app = create_app({"STRIPE_SECRET_KEY": "sk_test_providers"})
+        with app.app_context():
+            self.assertEqual(providers.stripe_sdk().api_key, "sk_test_providers")
+
+    def test_chat_ai_absent_without_keys(self):
+        app = create_app({"OPENAI_API_KEY": None, "GROQ_API_KEY": None})
+        with app.app_context():
+            self.assertIsNone(providers.chat_ai())
+            self.assertIsNone(providers.openai_client())
+
+    def test_ask_route_reports_missing_keys(self):
+        app = create_app({"OPENAI_API_KEY": None, "GROQ_API_KEY": None})
+        with app.app_context():
+            token = create_access_token(identity="1")
+        res = app.test_client().post(
+            "/api/chat/ask", json={"message": "Ideas for a garden party?"}, headers={"Authorization": f"Bearer {token}"}
+        )
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("AI is not configured", res.get_json()["reply"])
+
+    def test_chat_ai_prefers_groq(self):
+        app = create_app({"OPENAI_API_KEY": "sk-openai", "GROQ_API_KEY": "gsk-groq"})
+        with app.app_context():
+            client, model, service = providers.chat_ai()
+        self.assertEqual(service, "groq")
+        self.assertIn("groq.com", str(client.base_url))
+        self.assertNotIn("openai", providers.loaded())
+
+
+def tearDownModule():
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.unlink(_db_file.name + suffix)
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    unittest.main()
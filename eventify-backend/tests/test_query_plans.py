@@ -0,0 +1,81 @@
+"""
+Plan regression check: the hot queries must use indexes (scripts/check_query_plans.py).
+Run from eventify-backend: python tests/test_query_plans.py
+"""
+import importlib.util
+import os
+import tempfile
+import unittest
+
+_db_file = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
+_db_file.close()
+os.environ["DATABASE_URL"] = "sqlite:///" + _db_file.name.replace("\\", "/")
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.dialects import postgresql  # noqa: E402
+from sqlalchemy.schema import CreateIndex  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.api.events import ordered_events  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import Event  # noqa: E402
+from app.schema_patches import ensure_hot_path_indexes  # noqa: E402
+
+_spec = importlib.util.spec_from_file_location(
+    "check_query_plans",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts", "check_query_plans.py"),
+)
+check_query_plans = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(check_query_plans)
+
+
+class QueryPlanTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app.config["TESTING"] = True
+
+    def setUp(self):
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+
+    def test_hot_queries_use_indexes(self):
+        with self.app.app_context():
+            results = check_query_plans.check_plans()
+        failed = {r["name"]: r["problems"] for r in results if not r["ok"]}
+        self.assertEqual(failed, {})
+        self.assertGreaterEqual(len(results), 10)
+
+    def test_missing_index_is_reported_and_patched_back(self):
+        with self.app.app_context():
+            with db.engine.begin() as conn:
+                conn.execute(text("DROP INDEX ix_payment_vendor_status"))
+            (row,) = check_query_plans.check_plans({"vendor_payments"})
+            self.assertFalse(row["ok"])
+            self.assertTrue(row["problems"][0].startswith("full scan"))
+
+        ensure_hot_path_indexes(self.app)
+        with self.app.app_context():
+            (row,) = check_query_plans.check_plans({"vendor_payments"})
+        self.assertTrue(row["ok"], row["plan"])
+
+    def test_recency_order_matches_its_index_on_postgres(self):
+        # Postgres builds plain DESC as NULLS FIRST; the list order and the index must agree
+        pg = postgresql.dialect()
+        with self.app.app_context():
+            sql = str(ordered_events(Event.query.filter(Event.user_id == 1)).statement.compile(dialect=pg))
+        self.assertIn("ORDER BY coalesce(event.updated_at, event.created_at) DESC NULLS LAST, event.id DESC", sql)
+        (index,) = [ix for ix in Event.__table__.indexes if ix.name == "ix_event_user_recency"]
+        self.assertIn("coalesce(updated_at, created_at) DESC NULLS LAST, id DESC", str(CreateIndex(index).compile(dialect=pg)))
+
+
+def tearDownModule():
+    try:
+        os.unlink(_db_file.name)
+    except OSError:
+        pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+Tests for read-replica routing with two SQLite files standing in for primary and replica.
+Run from eventify-backend: python tests/test_read_replica.py
+"""
+import os
+import tempfile
+import unittest
+
+_files = []
+for _ in range(2):
+    _f = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
+    _f.close()
+    _files.append(_f.name)
+_PRIMARY, _REPLICA = ("sqlite:///" + name.replace("\\", "/") for name in _files)
+os.environ["DATABASE_URL"] = _PRIMARY
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.db_routing import replica_reads  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import User  # noqa: E402
+
+
+class ReadReplicaRoutingTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app({
+            "SQLALCHEMY_DATABASE_URI": _PRIMARY,
+            "SQLALCHEMY_BINDS": {"replica": _REPLICA},
+            "CURRENT_USER_CACHE_TTL": 0,
+        })
+        cls.app.config["TESTING"] = True
+        cls.client = cls.app.test_client()
+
+    @classmethod
+    def tearDownClass(cls):
+        # init_app registered a metadata for the bind on the shared db; later apps have no such bind
+        db.metadatas.pop("replica", None)
+
+    def setUp(self):
+        with self.app.app_context():
+            replica = db.engines["replica"]
+            db.drop_all()
+            db.metadata.drop_all(replica)
+            db.create_all()
+            db.metadata.create_all(replica)
+            # Same ids on both sides; names tell which database answered
+            for bind, label in ((db.engine, "primary"), (replica, "replica")):
+                with bind.begin() as conn:
+                    conn.execute(User.__table__.insert(), [
+                        {"id": 1, "name": f"Alice {label}", "email": "alice@test.com", "role": "user", "is_active": True},
+                        {"id": 2, "name": f"Bob {label}", "email": "bob@test.com", "role": "user", "is_active": True},
+                    ])
+            self.alice = create_access_token(identity="1")
+            self.bob = create_access_token(identity="2")
+            db.session.remove()
+
+    def _name(self, token):
+        r = self.client.get("/api/auth/profile", headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(r.status_code, 200, r.get_data(as_text=True))
+        return r.get_json()["user"]["name"]
+
+    def test_get_reads_replica_and_writer_sticks_to_primary(self):
+        self.assertEqual(self._name(self.alice), "Alice replica")
+
+        r = self.client.put(
+            "/api/auth/profile/update", json={"name": "Alice updated"}, headers={"Authorization": f"Bearer {self.alice}"}
+        )
+        self.assertEqual(r.status_code, 200, r.get_data(as_text=True))
+
+        # Alice sees her own write; Bob, who did not write, still reads the replica
+        self.assertEqual(self._name(self.alice), "Alice updated")
+        self.assertEqual(self._name(self.bob), "Bob replica")
+
+    def test_sticky_window_expires(self):
+        self.app.config["REPLICA_STICKY_SECONDS"] = 0
+        try:
+            self.client.put(
+                "/api/auth/profile/update", json={"name": "Alice updated"}, headers={"Authorization": f"Bearer {self.alice}"}
+            )
+            self.assertEqual(self._name(self.alice), "Alice replica")
+        finally:
+            self.app.config["REPLICA_STICKY_SECONDS"] = 5
+
+    def test_explicit_replica_block_outside_requests(self):
+        with self.app.app_context():
+            self.assertEqual(db.session.get(User, 1).name, "Alice primary")
+            db.session.expunge_all()
+            with replica_reads():
+                self.assertEqual(User.query.filter_by(id=1).one().name, "Alice replica")
+            db.session.remove()
+
+    def test_writes_never_go_to_replica(self):
+        with self.app.app_context():
+            with replica_reads():
+                db.session.add(User(id=3, name="Carol", email="carol@test.com", role="user"))
+                db.session.commit()
+                # after the session wrote, its reads come from the primary again
+                self.assertEqual(User.query.filter_by(id=1).one().name, "Alice primary")
+            db.session.remove()
+            with db.engines["replica"].connect() as conn:
+                self.assertIsNone(conn.execute(User.__table__.select().where(User.id == 3)).first())
+
+
+def tearDownModule():
+    for name in _files:
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.unlink(name + suffix)
+            except OSError:
+                pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -181,6 +181,36 @@ class ReviewsAPITests(unittest.TestCase):
         )
         self.assertEqual(res.status_code, 201, res.get_json())
 
+    def test_batch_review_status_matches_single_endpoint(self):
+        with self.app.app_context():
+            other = Event(name="Other", date="2026-02-01", venue="Lahore", budget=500.0,
+                          vendor_category="Wedding", user_id=self.host_id, organizer_id=self.org_id,
+                          organizer_status="accepted", status="created")
+            db.session.add(other)
+            db.session.commit()
+            other_id = other.id
+        headers = {"Authorization": f"Bearer {self._token(self.org_id)}"}
+        self.client.post(
+            f"/api/events/{self.event_id}/reviews",
+            json={"review_type": "organizer_to_vendor", "subject_id": self.vendor_id, "rating": 5},
+            headers=headers,
+        )
+
+        res = self.client.post(
+            "/api/events/review-status", json={"event_ids": [self.event_id, other_id, 99999]}, headers=headers
+        )
+        self.assertEqual(res.status_code, 200)
+        body = res.get_json()
+        self.assertEqual(body["not_found"], [99999])
+        single = self.client.get(f"/api/events/{self.event_id}/review-status", headers=headers).get_json()
+        self.assertEqual(body["statuses"][str(self.event_id)], single)
+        self.assertEqual(single["can_review_vendor_ids"], [self.vendor_id])
+        self.assertIn(str(self.vendor_id), single["my_organizer_to_vendor"])
+        self.assertEqual(body["statuses"][str(other_id)]["can_review_vendor_ids"], [])
+
+        res = self.client.post("/api/events/review-status", json={"event_ids": list(range(301))}, headers=headers)
+        self.assertEqual(res.status_code, 400)
+
 
 def tearDownModule():
     try:
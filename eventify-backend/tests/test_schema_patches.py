@@ -0,0 +1,132 @@
+"""
+Tests for the one-shot schema patch registry.
+Run from eventify-backend: python tests/test_schema_patches.py
+"""
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+
+_db_file = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
+_db_file.close()
+os.environ["DATABASE_URL"] = "sqlite:///" + _db_file.name.replace("\\", "/")
+
+from sqlalchemy import delete, event, insert, inspect, select  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app import schema_patches  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.schema_patches import registered_patches, run_schema_patches, schema_patch_version  # noqa: E402
+
+
+class SchemaPatchRegistryTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app.config["TESTING"] = True
+
+    def setUp(self):
+        with self.app.app_context():
+            db.drop_all()
+            schema_patch_version.drop(bind=db.engine, checkfirst=True)
+
+    def _recorded(self):
+        with self.app.app_context(), db.engine.connect() as conn:
+            return {name for (name,) in conn.execute(select(schema_patch_version.c.name))}
+
+    def test_first_boot_applies_all_and_creates_tables(self):
+        applied = run_schema_patches(self.app)
+        self.assertEqual(applied, registered_patches())
+        self.assertEqual(self._recorded(), set(registered_patches()))
+        with self.app.app_context():
+            self.assertIn("event", inspect(db.engine).get_table_names())
+
+    def test_later_boots_take_the_fast_path(self):
+        run_schema_patches(self.app)
+        statements = []
+        with self.app.app_context():
+            engine = db.engine
+
+        def count(*_args):
+            statements.append(1)
+
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            self.assertEqual(run_schema_patches(self.app), [])
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        self.assertEqual(len(statements), 1)
+
+    def test_new_tables_reach_databases_with_every_older_patch(self):
+        run_schema_patches(self.app)
+        with self.app.app_context(), db.engine.begin() as conn:
+            conn.exec_driver_sql("DROP TABLE resource_version")
+            conn.execute(delete(schema_patch_version).where(schema_patch_version.c.name == "resource_version_table"))
+        self.assertEqual(run_schema_patches(self.app), ["resource_version_table"])
+        with self.app.app_context():
+            self.assertIn("resource_version", inspect(db.engine).get_table_names())
+
+    def test_failed_patch_is_retried_next_boot(self):
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+
+        schema_patches._PATCHES.append(("test_flaky", flaky))
+        try:
+            self.assertNotIn("test_flaky", run_schema_patches(self.app))
+            self.assertNotIn("test_flaky", self._recorded())
+            self.assertEqual(run_schema_patches(self.app), ["test_flaky"])
+            self.assertEqual(len(calls), 2)
+        finally:
+            schema_patches._PATCHES.remove(("test_flaky", flaky))
+
+    def test_waits_for_lease_then_finds_nothing_to_do(self):
+        run_schema_patches(self.app)
+        ran = []
+        schema_patches._PATCHES.append(("test_once", lambda: ran.append(1)))
+        try:
+            with self.app.app_context():
+                with db.engine.begin() as conn:
+                    conn.execute(insert(schema_patch_version).values(name="__lock__", applied_at=datetime.utcnow()))
+
+            def release():
+                # another worker holds the lease, applies the patch, then releases
+                time.sleep(0.5)
+                with self.app.app_context(), db.engine.begin() as conn:
+                    conn.execute(insert(schema_patch_version).values(name="test_once", applied_at=datetime.utcnow()))
+                    conn.execute(delete(schema_patch_version).where(schema_patch_version.c.name == "__lock__"))
+
+            threading.Thread(target=release).start()
+            started = time.monotonic()
+            self.assertEqual(run_schema_patches(self.app), [])
+        finally:
+            schema_patches._PATCHES.pop()
+        self.assertGreaterEqual(time.monotonic() - started, 0.4)
+        self.assertEqual(ran, [])
+
+    def test_stale_lease_is_taken_over(self):
+        with self.app.app_context():
+            schema_patch_version.create(bind=db.engine)
+            with db.engine.begin() as conn:
+                conn.execute(insert(schema_patch_version).values(
+                    name="__lock__", applied_at=datetime.utcnow() - timedelta(hours=1)
+                ))
+        self.assertEqual(run_schema_patches(self.app), registered_patches())
+        self.assertNotIn("__lock__", self._recorded())
+
+
+def tearDownModule():
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.unlink(_db_file.name + suffix)
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+"""
+API tests for vendor services (JSON columns, legacy row backfill).
+Run from eventify-backend: python tests/test_services_api.py
+"""
+import os
+import tempfile
+import unittest
+
+_db_file = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
+_db_file.close()
+os.environ["DATABASE_URL"] = "sqlite:///" + _db_file.name.replace("\\", "/")
+
+from sqlalchemy import event, insert, text  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app import notification_fanout  # noqa: E402
+from app.api.payments import demo_notifications  # noqa: E402
+from app.models import User, Event, Service, ServicePackage, vendor_events  # noqa: E402
+from app.schema_patches import ensure_service_json_columns  # noqa: E402
+from app.utils.pagination import encode_cursor  # noqa: E402
+
+
+class ServicesAPITests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = create_app()
+        cls.app.config["TESTING"] = True
+        cls.client = cls.app.test_client()
+
+    def setUp(self):
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            v = User(name="Vendor", email="vendor@test.com", role="vendor", city="Lahore")
+            v.set_password("Testpass1!")
+            db.session.add(v)
+            db.session.commit()
+            self.vendor_id = v.id
+
+    def test_create_service_round_trips_lists(self):
+        res = self.client.post(
+            "/api/vendor/services",
+            json={
+                "vendor_id": self.vendor_id,
+                "name": "Catering",
+                "category": "Food",
+                "eventType": "Wedding",
+                "basePrice": 5000,
+                "availability": ["2026-05-01", "2026-05-02"],
+                "portfolioImages": ["/uploads/a.png"],
+                "packages": [{"packageName": "Gold", "price": 9000, "features": ["Dessert", "It's fresh"]}],
+            },
+        )
+        self.assertEqual(res.status_code, 201, res.get_json())
+        service = res.get_json()["service"]
+        self.assertEqual(service["availability"], ["2026-05-01", "2026-05-02"])
+        self.assertEqual(service["packages"][0]["features"], ["Dessert", "It's fresh"])
+
+        with self.app.app_context():
+            raw = db.session.execute(text("SELECT availability FROM service")).scalar()
+            self.assertEqual(raw, '["2026-05-01","2026-05-02"]')
+
+    def test_legacy_python_literal_rows_are_backfilled(self):
+        with self.app.app_context():
+            db.session.execute(
+                text(
+                    "INSERT INTO service (vendor_id, name, category, event_type, base_price, availability, portfolio_images, is_active) "
+                    "VALUES (:v, 'Old', 'Decor', 'Birthday', 100, :a, :p, 1)"
+                ),
+                {"v": self.vendor_id, "a": "['2026-01-01']", "p": "[]"},
+            )
+            db.session.commit()
+
+        ensure_service_json_columns(self.app)
+
+        with self.app.app_context():
+            raw = db.session.execute(text("SELECT availability FROM service")).scalar()
+            self.assertEqual(raw, '["2026-01-01"]')
+            self.assertEqual(Service.query.one().to_dict()["availability"], ["2026-01-01"])
+
+    def _seed_catalog(self):
+        with self.app.app_context():
+            other = User(name="Karachi Vendor", email="kv@test.com", role="vendor", city="Karachi")
+            other.set_password("Testpass1!")
+            db.session.add(other)
+            db.session.flush()
+            for i, price in enumerate([100, 200, 200, 300, 400]):
+                svc = Service(
+                    vendor_id=self.vendor_id,
+                    name=f"Decor {i}",
+                    category="Decor",
+                    event_type="Wedding",
+                    base_price=price,
+                    availability=[],
+                    portfolio_images=[],
+                )
+                svc.packages.append(ServicePackage(package_name="Basic", price=price, features=["a"]))
+                db.session.add(svc)
+            db.session.add(Service(vendor_id=other.id, name="Cake", category="Food", event_type="Birthday", base_price=150))
+            db.session.add(
+                Service(vendor_id=self.vendor_id, name="Hidden", category="Decor", event_type="Wedding", base_price=50, is_active=False)
+            )
+            db.session.commit()
+
+    def test_catalog_keyset_pages_with_filters(self):
+        self._seed_catalog()
+        seen = []
+        cursor = None
+        while True:
+            params = {"category": "Decor", "city": "lahore", "limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            res = self.client.get("/api/services/catalog", query_string=params)
+            self.assertEqual(res.status_code, 200, res.get_json())
+            body = res.get_json()
+            seen.extend(s["basePrice"] for s in body["services"])
+            cursor = body["next_cursor"]
+            if not cursor:
+                break
+        self.assertEqual(seen, [100, 200, 200, 300, 400])
+
+        res = self.client.get("/api/services/catalog", query_string={"min_price": 120, "max_price": 250})
+        names = [s["name"] for s in res.get_json()["services"]]
+        self.assertEqual(names, ["Cake", "Decor 1", "Decor 2"])
+        self.assertEqual(res.get_json()["services"][0]["vendor"]["city"], "Karachi")
+
+    def test_catalog_page_uses_two_queries(self):
+        self._seed_catalog()
+        statements = []
+
+        def _count(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        with self.app.app_context():
+            engine = db.engine
+        event.listen(engine, "before_cursor_execute", _count)
+        try:
+            res = self.client.get("/api/services/catalog", query_string={"limit": 10})
+        finally:
+            event.remove(engine, "before_cursor_execute", _count)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(res.get_json()["services"]), 6)
+        self.assertEqual(len(statements), 2, statements)
+
+    def test_catalog_rejects_bad_cursor(self):
+        res = self.client.get("/api/services/catalog", query_string={"cursor": "not-a-cursor"})
+        self.assertEqual(res.status_code, 400)
+        # well-formed cursors whose values are not (price, id)
+        for values in (["x", 1], [None, None], [1.5, "y"]):
+            res = self.client.get("/api/services/catalog", query_string={"cursor": encode_cursor(values)})
+            self.assertEqual(res.status_code, 400, values)
+
+    def test_rapid_service_edits_coalesce_into_one_notification(self):
+        with self.app.app_context():
+            host = User(name="Host", email="host@test.com", role="user")
+            host.set_password("Testpass1!")
+            db.session.add(host)
+            db.session.flush()
+            events = [
+                Event(name=f"Party {i}", date="2026-06-01", venue="Lahore", budget=1000.0, vendor_category="Wedding", user_id=host.id)
+                for i in range(2)
+            ]
+            db.session.add_all(events)
+            db.session.flush()
+            for ev in events:
+                db.session.execute(insert(vendor_events).values(vendor_id=self.vendor_id, event_id=ev.id))
+            db.session.commit()
+            host_id = host.id
+
+        self.app.config["NOTIFICATION_COALESCE_SECONDS"] = 60
+        del demo_notifications[:]
+        payload = {"vendor_id": self.vendor_id, "category": "Decor", "eventType": "Wedding", "basePrice": 10}
+        ids = []
+        for name in ("Lights", "Stage"):
+            res = self.client.post("/api/vendor/services", json=dict(payload, name=name))
+            self.assertEqual(res.status_code, 201)
+            ids.append(res.get_json()["service"]["id"])
+        res = self.client.put(f"/api/vendor/services/{ids[0]}", json={"name": "Lights v2"})
+        self.assertEqual(res.status_code, 200)
+
+        self.assertEqual(demo_notifications, [])
+        notification_fanout.flush()
+
+        self.assertEqual(len(demo_notifications), 1)
+        n = demo_notifications[0]
+        self.assertEqual(n["user_id"], host_id)
+        self.assertEqual(n["title"], "🆕 New Services Added")
+        self.assertIn("Lights v2", n["message"])
+        self.assertEqual(n["extra_data"]["service_ids"], ids)
+
+
+def tearDownModule():
+    try:
+        os.unlink(_db_file.name)
+    except OSError:
+        pass
+
+
+if __name__ == "__main__":
+    unittest.main()